@@ -0,0 +1,106 @@
+"""
+Cricket Database Management System - authentication
+"""
+
+import hashlib
+
+import streamlit as st
+
+from cricketdb import metrics
+from cricketdb.throttle import LoginThrottle, forwarded_client
+from db import execute_prepared
+
+
+def hash_password(password):
+    """Hash password using SHA256"""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+# Process-wide limits (see cricketdb.throttle.LoginThrottle)
+THROTTLE_SETTINGS = {
+    "user_burst": 5,
+    "user_per_minute": 1.0,
+    "client_burst": 30,
+    "client_per_minute": 10.0,
+    "negative_ttl": 30.0,
+    "max_entries": 10000
+}
+
+
+@st.cache_resource
+def get_login_throttle():
+    """Throttle shared by every session in this server process"""
+    return LoginThrottle(**THROTTLE_SETTINGS)
+
+
+def trusted_proxy_hops():
+    """
+    Number of reverse proxies in front of the app ([login] trusted_proxy_hops
+    in the secrets).  Forwarding headers are only believed when set: without
+    a proxy a client can put anything in them.
+    """
+    return int(st.secrets.get("login", {}).get("trusted_proxy_hops", 0))
+
+
+def request_headers():
+    """HTTP headers of this session's connection"""
+    if hasattr(st, "context"):
+        return st.context.headers
+    try:
+        from streamlit.web.server.websocket_headers import _get_websocket_headers
+        return _get_websocket_headers() or {}
+    except ImportError:
+        return {}
+
+
+def peer_address():
+    """Address this session's websocket connects from, or None if unavailable"""
+    try:
+        from streamlit import runtime
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        return runtime.get_instance().get_client(get_script_run_ctx().session_id).request.remote_ip
+    except Exception:
+        return None
+
+
+def client_address():
+    """Client address for throttling, or None when it cannot be told"""
+    hops = trusted_proxy_hops()
+    if hops > 0:
+        return forwarded_client(request_headers(), hops) or peer_address()
+    return peer_address()
+
+
+def authenticate_user(username, password):
+    """
+    Authenticate user.
+
+    Returns (user, retry_after).  Attempts over the per-user/per-client
+    limit, or repeating a pair that just failed, are rejected with
+    retry_after > 0 without touching the database.
+    """
+    if not username or not password:
+        return None, 0
+
+    hashed_pw = hash_password(password)
+    credential = hashlib.sha256(f"{username}\0{hashed_pw}".encode()).digest()
+
+    throttle = get_login_throttle()
+    allowed, retry_after = throttle.check(username, client_address(), credential)
+    if not allowed:
+        metrics.LOGINS.inc(outcome="throttled")
+        return None, max(1, int(retry_after + 0.999))
+
+    rows = execute_prepared("user_login", (username, hashed_pw))
+    if rows is None:
+        metrics.LOGINS.inc(outcome="error")
+        return None, 0
+
+    user = rows[0] if rows else None
+    if user:
+        metrics.LOGINS.inc(outcome="success")
+        throttle.record_success(username)
+    else:
+        metrics.LOGINS.inc(outcome="failure")
+        throttle.record_failure(credential)
+    return user, 0
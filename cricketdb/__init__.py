@@ -0,0 +1,7 @@
+"""
+Cricket Database Management System - engine modules
+
+Pure-Python/NumPy building blocks used by the Streamlit frontend.
+Nothing in this package imports Streamlit, so it can be reused from
+scripts and tests without a running app.
+"""
@@ -0,0 +1,427 @@
+"""
+Bulk bootstrap of a CricketDB database.
+
+The setup is split into three scripts under ``sql/``:
+
+  schema.sql     tables with primary keys only
+  seed.sql       the demo data as plain multi-row INSERTs
+  post_load.sql  indexes and unique keys, foreign keys, derived columns,
+                 triggers, procedures, events and functions
+
+Loading into bare tables is much faster than maintaining every secondary
+index, checking every foreign key and firing the triggers row by row.
+This tool creates the schema, loads the data, and only then applies the
+post-load script:
+
+1. Tables are loaded level by level in foreign-key order (parents first),
+   with all tables of a level, and chunks of large tables, loaded in
+   parallel on separate connections with unique/foreign-key checks off.
+2. Each table's indexes are built in a single ALTER, tables in parallel.
+3. Every foreign key is checked with an anti-join (unless --trust-keys);
+   orphans abort the bootstrap.  The keys are then added without a
+   second validation pass.
+4. The rest of post_load.sql (derived ages, bookkeeping rows, triggers,
+   routines and the catch-up promotion) runs in order.
+
+Command line (reads connection settings from .streamlit/secrets.toml and
+replaces the database named there):
+
+    python -m cricketdb.bootstrap --replace
+    python -m cricketdb.bootstrap --replace --synthetic --players 20000 --matches 100000
+"""
+
+import argparse
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from cricketdb.snapshots import load_mysql_config
+from cricketdb.versions import written_table
+
+
+SQL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sql")
+SCHEMA = os.path.join(SQL_DIR, "schema.sql")
+SEED = os.path.join(SQL_DIR, "seed.sql")
+POST_LOAD = os.path.join(SQL_DIR, "post_load.sql")
+
+CHUNK_ROWS = 10000
+
+# Seed tables a synthetic dataset keeps (logins and the fixed roles)
+REFERENCE_TABLES = ("users", "role")
+
+_DATABASE_RE = re.compile(r"^\s*(?:(?:DROP|CREATE)\s+DATABASE|USE)\b", re.IGNORECASE)
+_ALTER_RE = re.compile(r"^\s*ALTER\s+TABLE\s+`?(\w+)`?", re.IGNORECASE)
+_INDEX_RE = re.compile(r"\bADD\s+(?:UNIQUE\s+)?(?:INDEX|KEY)\b", re.IGNORECASE)
+_FOREIGN_KEY_RE = re.compile(
+    r"FOREIGN\s+KEY\s*\(\s*`?(\w+)`?\s*\)\s*REFERENCES\s+`?(\w+)`?\s*\(\s*`?(\w+)`?\s*\)", re.IGNORECASE)
+
+
+def split_statements(text):
+    """Statements of a mysql client script, honouring DELIMITER and skipping comment lines"""
+    statements, buffer, delimiter = [], [], ";"
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.upper().startswith("DELIMITER "):
+            delimiter = stripped.split(None, 1)[1]
+            continue
+        if stripped.startswith("--") or (not buffer and not stripped):
+            continue
+        buffer.append(line)
+        if stripped.endswith(delimiter):
+            statement = "\n".join(buffer).strip()[:-len(delimiter)].strip()
+            buffer = []
+            # Routine bodies keep their own trailing ';' (END;)
+            statement = statement.rstrip(";").strip()
+            if statement:
+                statements.append(statement)
+    return statements
+
+
+def read_statements(path):
+    with open(path, encoding="utf-8") as f:
+        return split_statements(f.read())
+
+
+def classify_post_load(statements):
+    """Split post_load.sql into (index ALTERs, foreign-key ALTERs, everything else in order)"""
+    indexes, keys, rest = [], [], []
+    for statement in statements:
+        table = _ALTER_RE.match(statement)
+        if table and _FOREIGN_KEY_RE.search(statement):
+            keys.append((table.group(1), statement, _FOREIGN_KEY_RE.findall(statement)))
+        elif table and _INDEX_RE.search(statement):
+            indexes.append((table.group(1), statement))
+        else:
+            rest.append(statement)
+    return indexes, keys, rest
+
+
+def load_levels(tables, keys):
+    """Group tables so every table comes after the tables it references"""
+    parents = {table: set() for table in tables}
+    for table, _, references in keys:
+        if table in parents:
+            parents[table].update(parent for _, parent, _ in references if parent in parents and parent != table)
+
+    levels, done = [], set()
+    while len(done) < len(parents):
+        level = sorted(table for table in parents if table not in done and parents[table] <= done)
+        if not level:
+            raise ValueError(f"Foreign-key cycle among {sorted(set(parents) - done)}")
+        levels.append(level)
+        done.update(level)
+    return levels
+
+
+# DATASETS: {table: [task, ...]}; a task is an INSERT statement or (columns, rows)
+def seed_dataset(path=SEED, tables=None):
+    """The INSERT statements of seed.sql grouped by table"""
+    dataset = {}
+    for statement in read_statements(path):
+        table = written_table(statement)
+        if table and (tables is None or table in tables):
+            dataset.setdefault(table, []).append(statement)
+    return dataset
+
+
+FIRST_NAMES = ["Arjun", "Ben", "Chris", "Dinesh", "Eoin", "Faf", "Glenn", "Hashim", "Imran", "Jos",
+               "Kane", "Liam", "Marnus", "Nathan", "Ollie", "Pat", "Quinton", "Rashid", "Shaheen", "Tim",
+               "Usman", "Virat", "Wanindu", "Yasir", "Zak"]
+LAST_NAMES = ["Ahmed", "Brook", "Chahal", "de Kock", "Elgar", "Finch", "Gill", "Head", "Iyer", "Jadeja",
+              "Khan", "Latham", "Mendis", "Nortje", "Ojha", "Pope", "Rabada", "Smith", "Taylor", "Umesh",
+              "Vettori", "Warner", "Yadav", "Zampa"]
+COUNTRIES = ["India", "Australia", "England", "South Africa", "New Zealand", "Pakistan", "Sri Lanka",
+             "West Indies", "Bangladesh", "Afghanistan", "Ireland", "Zimbabwe"]
+VENUES = ["Mumbai", "Delhi", "Chennai", "Kolkata", "Melbourne", "Sydney", "Lord's", "The Oval",
+          "Cape Town", "Auckland", "Lahore", "Colombo", "Bridgetown", "Dhaka"]
+TOURNAMENTS = ["World Cup", "Champions Trophy", "Asia Cup", "Tri-Series", "Premier League", "Test Series"]
+SPECIALIZATIONS = ["Head Coach", "Batting Coach", "Bowling Coach", "Fielding Coach"]
+FORMATS = ["One Day", "Test", "T20"]
+
+
+def _pick(rng, names, size):
+    return np.asarray(names, dtype=object)[rng.integers(0, len(names), size)]
+
+
+def synthetic_dataset(teams=12, players=3000, tournaments=40, matches=20000, batting=11, seed=7):
+    """
+    Realistically shaped random data with explicit keys: rosters spread over
+    the teams, matches in date order, `batting` performances per side per
+    match, one award per match and both played_in rows.
+    """
+    rng = np.random.default_rng(seed)
+    dataset = seed_dataset(tables=REFERENCE_TABLES)
+
+    team_ids = np.arange(1, teams + 1)
+    team_names = [COUNTRIES[i % len(COUNTRIES)] + (f" {i // len(COUNTRIES) + 1}" if i >= len(COUNTRIES) else "")
+                  for i in range(teams)]
+    dataset["team"] = (("team_id", "team_name", "country"),
+                       list(zip(team_ids.tolist(), team_names, [COUNTRIES[i % len(COUNTRIES)] for i in range(teams)])))
+
+    tournament_ids = np.arange(1, tournaments + 1)
+    years = 1990 + (tournament_ids - 1) // len(TOURNAMENTS)
+    dataset["tournament"] = (("tournament_id", "tournament_name", "year"), [
+        (int(t), f"{TOURNAMENTS[(t - 1) % len(TOURNAMENTS)]} {y}", int(y)) for t, y in zip(tournament_ids, years)])
+
+    # Player i plays for team (i - 1) % teams + 1, so a team's roster is a stride of ids
+    player_ids = np.arange(1, players + 1)
+    player_teams = (player_ids - 1) % teams + 1
+    dob = np.datetime64("1970-01-01") + rng.integers(0, 365 * 36, players).astype("timedelta64[D]")
+    roles = rng.choice([1, 2, 3, 4], size=players, p=[0.4, 0.35, 0.15, 0.1])
+    dataset["player"] = (("player_id", "f_name", "l_name", "dob", "age", "team_id", "role_id"), list(zip(
+        player_ids.tolist(), _pick(rng, FIRST_NAMES, players).tolist(), _pick(rng, LAST_NAMES, players).tolist(),
+        dob.tolist(), [None] * players, player_teams.tolist(), roles.tolist())))
+
+    dataset["trainer"] = (("trainer_id", "name", "specialization", "experience", "team_id"), [
+        (t * len(SPECIALIZATIONS) + i + 1, f"{FIRST_NAMES[(t + i) % len(FIRST_NAMES)]} {LAST_NAMES[t % len(LAST_NAMES)]}",
+         specialization, int(rng.integers(1, 25)), t + 1)
+        for t in range(teams) for i, specialization in enumerate(SPECIALIZATIONS)])
+
+    # Matches in date order over the last 30 years
+    match_ids = np.arange(1, matches + 1)
+    dates = np.sort(np.datetime64("today", "D") - rng.integers(0, 365 * 30, matches).astype("timedelta64[D]"))
+    winners = rng.integers(1, teams + 1, matches)
+    losers = (winners - 1 + rng.integers(1, teams, matches)) % teams + 1
+    formats = _pick(rng, FORMATS, matches)
+    dataset["matches"] = (("match_id", "winning_team_id", "losing_team_id", "date_of_match", "location", "tournament_id"),
+                          list(zip(match_ids.tolist(), winners.tolist(), losers.tolist(), dates.tolist(),
+                                   _pick(rng, VENUES, matches).tolist(),
+                                   rng.integers(1, tournaments + 1, matches).tolist())))
+    dataset["played_in"] = (("match_id", "team_id"),
+                            list(zip(match_ids.tolist(), winners.tolist())) + list(zip(match_ids.tolist(), losers.tolist())))
+
+    # `batting` consecutive roster places from a random start: distinct players per side
+    roster_sizes = np.array([(players - t + teams - 1) // teams for t in range(teams)])
+    batting = min(batting, int(roster_sizes.min()))
+
+    def lineup(sides):
+        size = roster_sizes[sides - 1][:, None]
+        start = rng.integers(0, np.maximum(size[:, 0], 1))[:, None]
+        slots = (start + np.arange(batting)[None, :]) % size
+        return sides[:, None] + teams * slots
+
+    side_players = np.hstack([lineup(winners), lineup(losers)])
+    count = side_players.size
+    runs = np.minimum(rng.geometric(1 / 25, count) - 1, 250)
+    wickets = rng.choice(7, size=count, p=[0.55, 0.18, 0.11, 0.07, 0.05, 0.03, 0.01])
+    dataset["player_performance"] = (
+        ("performance_id", "player_id", "match_id", "runs_scored", "wickets_taken", "format", "avg"),
+        list(zip(range(1, count + 1), side_players.ravel().tolist(), np.repeat(match_ids, 2 * batting).tolist(),
+                 runs.tolist(), wickets.tolist(), np.repeat(formats, 2 * batting).tolist(),
+                 np.round(rng.uniform(10, 55, count), 2).tolist())))
+
+    # Man of the match: top scorer of the winning side
+    best = side_players[np.arange(matches), runs.reshape(matches, -1)[:, :batting].argmax(axis=1)]
+    dataset["award"] = (("award_id", "award_name", "player_id", "match_id", "award_date", "description"),
+                        list(zip(match_ids.tolist(), ["Man of the Match"] * matches, best.tolist(),
+                                 match_ids.tolist(), dates.tolist(), ["Top scorer"] * matches)))
+    return dataset
+
+
+def _tasks(data):
+    """Split a table's data into independent load tasks"""
+    if isinstance(data, list):
+        return data
+    columns, rows = data
+    return [(columns, rows[i:i + CHUNK_ROWS]) for i in range(0, len(rows), CHUNK_ROWS)]
+
+
+class Loader:
+    """One connection per worker thread, all with checks switched off for loading"""
+
+    def __init__(self, config):
+        import mysql.connector
+
+        self.connect = lambda: mysql.connector.connect(**config)
+        self.local = threading.local()
+        self.connections = []
+        self.lock = threading.Lock()
+
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = self.local.conn = self.connect()
+            cursor = conn.cursor()
+            cursor.execute("SET SESSION unique_checks = 0, foreign_key_checks = 0")
+            cursor.close()
+            with self.lock:
+                self.connections.append(conn)
+        return conn
+
+    def run(self, table, task):
+        """Insert one task; returns (table, rows, seconds)"""
+        conn = self.connection()
+        cursor = conn.cursor()
+        start = time.perf_counter()
+        try:
+            if isinstance(task, str):
+                cursor.execute(task)
+                rows = cursor.rowcount
+            else:
+                columns, chunk = task
+                cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) "
+                                   f"VALUES ({', '.join(['%s'] * len(columns))})", chunk)
+                rows = len(chunk)
+            conn.commit()
+        finally:
+            cursor.close()
+        return table, rows, time.perf_counter() - start
+
+    def execute(self, statement):
+        conn = self.connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(statement)
+            result = cursor.fetchall() if cursor.with_rows else None
+            conn.commit()
+            return result
+        finally:
+            cursor.close()
+
+    def close(self):
+        for conn in self.connections:
+            conn.close()
+
+
+def bootstrap(config, dataset, workers=4, trust_keys=False, log=print):
+    """Create the schema in config['database'], load `dataset`, apply post_load.sql; returns the report"""
+    import mysql.connector
+
+    database = config["database"]
+    server = {k: v for k, v in config.items() if k != "database"}
+    stages, tables = {}, {}
+    total_start = time.perf_counter()
+
+    start = time.perf_counter()
+    conn = mysql.connector.connect(**server)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"DROP DATABASE IF EXISTS `{database}`")
+        cursor.execute(f"CREATE DATABASE `{database}`")
+        cursor.execute(f"USE `{database}`")
+        for statement in read_statements(SCHEMA):
+            if not _DATABASE_RE.match(statement):
+                cursor.execute(statement)
+        cursor.close()
+    finally:
+        conn.close()
+    stages["schema"] = time.perf_counter() - start
+
+    indexes, keys, rest = classify_post_load(read_statements(POST_LOAD))
+    loader = Loader(config)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            start = time.perf_counter()
+            for level in load_levels(list(dataset), keys):
+                log(f"loading {', '.join(level)}")
+                jobs = [pool.submit(loader.run, table, task)
+                        for table in level for task in _tasks(dataset[table])]
+                for job in jobs:
+                    table, rows, seconds = job.result()
+                    loaded = tables.setdefault(table, [0, 0.0])
+                    loaded[0] += rows
+                    loaded[1] += seconds
+            stages["load"] = time.perf_counter() - start
+
+            log("building indexes")
+            start = time.perf_counter()
+            for job in [pool.submit(loader.execute, statement) for _, statement in indexes]:
+                job.result()
+            stages["indexes"] = time.perf_counter() - start
+
+            if not trust_keys:
+                log("checking foreign keys")
+                start = time.perf_counter()
+                checks = [(table, column, parent, pool.submit(loader.execute, (
+                    f"SELECT COUNT(*) FROM {table} c LEFT JOIN {parent} p ON c.{column} = p.{parent_column} "
+                    f"WHERE c.{column} IS NOT NULL AND p.{parent_column} IS NULL")))
+                    for table, _, references in keys for column, parent, parent_column in references]
+                orphans = [(table, column, parent, job.result()[0][0]) for table, column, parent, job in checks]
+                orphans = [o for o in orphans if o[3]]
+                if orphans:
+                    raise SystemExit("Rows without a parent: " + ", ".join(
+                        f"{table}.{column} -> {parent}: {count}" for table, column, parent, count in orphans))
+                stages["key checks"] = time.perf_counter() - start
+
+        # Already validated: add the constraints without another scan (checks are off on this session)
+        start = time.perf_counter()
+        for _, statement, _ in keys:
+            loader.execute(statement)
+        stages["foreign keys"] = time.perf_counter() - start
+    finally:
+        loader.close()
+
+    log("creating triggers and routines")
+    start = time.perf_counter()
+    conn = mysql.connector.connect(**config)
+    try:
+        cursor = conn.cursor()
+        for statement in rest:
+            cursor.execute(statement)
+            if cursor.with_rows:
+                cursor.fetchall()
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+    stages["post-load"] = time.perf_counter() - start
+
+    stages["total"] = time.perf_counter() - total_start
+    return {"stages": stages, "tables": tables}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create CricketDB and bulk-load seed or synthetic data")
+    parser.add_argument("--replace", action="store_true",
+                        help="Drop and recreate the database named in the secrets file")
+    parser.add_argument("--synthetic", action="store_true", help="Load generated data instead of seed.sql")
+    parser.add_argument("--teams", type=int, default=12)
+    parser.add_argument("--players", type=int, default=3000)
+    parser.add_argument("--tournaments", type=int, default=40)
+    parser.add_argument("--matches", type=int, default=20000)
+    parser.add_argument("--batting", type=int, default=11, help="Performances per side per match")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--workers", type=int, default=4, help="Parallel loading connections")
+    parser.add_argument("--trust-keys", action="store_true", help="Skip the orphan checks before adding foreign keys")
+    parser.add_argument("--secrets", default=".streamlit/secrets.toml",
+                        help="Streamlit secrets file with a [mysql] section")
+    args = parser.parse_args()
+
+    if not args.replace:
+        parser.error("--replace is required: the database named in the secrets file is dropped and recreated")
+    if args.synthetic and args.teams < 2:
+        parser.error("--teams must be at least 2")
+
+    config = dict(load_mysql_config(args.secrets))
+    start = time.perf_counter()
+    if args.synthetic:
+        dataset = synthetic_dataset(args.teams, args.players, args.tournaments, args.matches, args.batting, args.seed)
+    else:
+        dataset = seed_dataset()
+    generated = time.perf_counter() - start
+
+    report = bootstrap(config, dataset, workers=args.workers, trust_keys=args.trust_keys)
+
+    print()
+    print(f"{'table':<22} {'rows':>10} {'busy s':>8} {'rows/s':>12}")
+    for table, (rows, seconds) in sorted(report["tables"].items()):
+        print(f"{table:<22} {rows:>10,} {seconds:>8.2f} {rows / seconds if seconds else 0:>12,.0f}")
+
+    total_rows = sum(rows for rows, _ in report["tables"].values())
+    stages = report["stages"]
+    print()
+    print(f"{'stage':<22} {'seconds':>8}")
+    if args.synthetic:
+        print(f"{'generate':<22} {generated:>8.2f}")
+    for stage, seconds in stages.items():
+        print(f"{stage:<22} {seconds:>8.2f}")
+    print(f"\n{total_rows:,} rows loaded at {total_rows / stages['load']:,.0f} rows/s "
+          f"({total_rows / stages['total']:,.0f} rows/s including schema and post-load)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Server-side downsampling and cached plotly figure specs for long
+time series (player careers, team results, rating histories).
+
+A chart is at most a few thousand pixels wide, so sending more points
+than that only slows the browser down.  Two reducers pick which points
+to keep:
+
+- ``lttb_indices``: Largest-Triangle-Three-Buckets keeps the visual shape
+  of smooth series (cumulative totals, ratings, rolling averages).
+- ``minmax_indices``: per x-range bucket (one per pixel column pair) keeps
+  the lowest and highest point, so spikes such as a century survive in
+  noisy per-match series.
+
+Both return sorted row indices, so callers can take any column (labels,
+hover data) at the same rows.  Built figure specs are kept in a
+``FigureCache`` keyed by dataset, data version and resolution.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.graph_objects as go
+
+
+# Points per trace: roughly the pixel width of a full-width chart
+VIEWPORT_POINTS = 1200
+
+
+def _as_float(values):
+    """Numbers or dates -> float64 (dates as nanoseconds) for the reducers"""
+    values = np.asarray(values)
+    if values.dtype.kind == "O":
+        try:
+            return values.astype(np.float64)
+        except (TypeError, ValueError):
+            values = values.astype("datetime64[ns]")
+    if values.dtype.kind == "M":
+        return values.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    return values.astype(np.float64)
+
+
+def lttb_indices(x, y, threshold):
+    """Indices of the `threshold` points LTTB keeps (all of them if there are fewer)"""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x, y = _as_float(x), _as_float(y)
+
+    # First and last points are always kept; the rest is split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo = edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[next_lo:next_hi].mean(), y[next_lo:next_hi].mean()
+        # Twice the triangle area between the last kept point, each candidate and the next bucket's mean
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(x, y, buckets):
+    """Indices of the min and max of y in each of `buckets` equal x ranges (plus both ends)"""
+    n = len(y)
+    if n <= 2 * buckets or buckets < 1:
+        return np.arange(n)
+    x, y = _as_float(x), _as_float(y)
+
+    span = x[-1] - x[0]
+    if span > 0:
+        bucket = ((x - x[0]) / span * buckets).astype(np.int64)
+    else:
+        bucket = np.arange(n) * buckets // n
+    bucket = np.clip(bucket, 0, buckets - 1)
+
+    # Sorted by bucket, then y: the first and last row of each bucket are its min and max
+    order = np.lexsort((y, bucket))
+    ordered = bucket[order]
+    starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    return np.unique(np.concatenate(([0, n - 1], order[starts], order[ends])))
+
+
+def downsample(x, y, points=VIEWPORT_POINTS, method="lttb"):
+    """Row indices to plot for a series at `points` resolution"""
+    if method == "minmax":
+        return minmax_indices(x, y, max(1, points // 2))
+    return lttb_indices(x, y, points)
+
+
+def timeline_figure(traces, x_title=None, y_title=None, height=420):
+    """
+    Plotly figure spec (a dict) for already-downsampled traces.
+
+    traces: [{"name", "x", "y", optional "mode"}]
+    """
+    fig = go.Figure()
+    for trace in traces:
+        fig.add_trace(go.Scatter(x=trace["x"], y=trace["y"], name=trace["name"],
+                                 mode=trace.get("mode", "lines")))
+    fig.update_layout(height=height, hovermode="x unified", xaxis_title=x_title, yaxis_title=y_title,
+                      margin=dict(l=10, r=10, t=30, b=10),
+                      legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0))
+    return fig.to_dict()
+
+
+class FigureCache:
+    """Process-wide LRU of figure specs keyed by (dataset, inputs, data version, points)"""
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """Cached value for key, else build() (a None result is not cached)"""
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+            self.misses += 1
+
+        # Built outside the lock: two sessions may build the same spec once each
+        value = build()
+        if value is None:
+            return None
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return value
@@ -0,0 +1,183 @@
+"""
+Duplicate-player detection.
+
+Comparing every pair of players is quadratic, so candidates are only
+drawn from blocks of players sharing a cheap key:
+
+- ``sound``:  Soundex of the last name plus the first initial
+              (Smith/Smyth, Steve/Steven)
+- ``tokens``: the sorted name tokens (first and last name swapped)
+- ``born``:   date of birth plus the Soundex of the last name (a changed
+              or misspelt first name)
+
+Each candidate pair is then scored on name similarity, date of birth and
+team; pairs at or above the threshold are reported, best first.  Blocks
+larger than ``MAX_BLOCK`` (a very common surname on a huge roster) are
+skipped for that key rather than compared in full.
+
+Command line (reads connection settings from .streamlit/secrets.toml):
+
+    python -m cricketdb.dedup --threshold 0.8
+"""
+
+import argparse
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+
+
+PLAYERS_QUERY = "SELECT player_id, f_name, l_name, dob, team_id FROM player"
+
+MAX_BLOCK = 200
+THRESHOLD = 0.8
+
+# Weights of the three signals in the score (they sum to 1)
+NAME_WEIGHT = 0.6
+DOB_WEIGHT = 0.25
+TEAM_WEIGHT = 0.15
+
+_SOUNDEX_CODES = {**dict.fromkeys("bfpv", "1"), **dict.fromkeys("cgjkqsxz", "2"),
+                  **dict.fromkeys("dt", "3"), "l": "4", **dict.fromkeys("mn", "5"), "r": "6"}
+_TOKEN_RE = re.compile(r"[a-z]+")
+
+
+def soundex(name):
+    """American Soundex code of a name ('' for a name without letters)"""
+    letters = [c for c in name.lower() if c.isalpha()]
+    if not letters:
+        return ""
+    code, last = letters[0].upper(), _SOUNDEX_CODES.get(letters[0], "")
+    for c in letters[1:]:
+        digit = _SOUNDEX_CODES.get(c, "")
+        if digit and digit != last:
+            code += digit
+            if len(code) == 4:
+                break
+        # h and w do not separate equal codes; vowels do
+        if c not in "hw":
+            last = digit
+    return code.ljust(4, "0")
+
+
+def name_tokens(*parts):
+    """Lower-case alphabetic tokens of a name"""
+    return _TOKEN_RE.findall(" ".join(parts).lower())
+
+
+def blocking_keys(player):
+    """The blocks a player is filed under"""
+    first, last = player['f_name'] or "", player['l_name'] or ""
+    keys = [("tokens", " ".join(sorted(name_tokens(first, last))))]
+    last_code = soundex(last)
+    if last_code:
+        keys.append(("sound", last_code, first[:1].lower()))
+        if player.get('dob') is not None:
+            keys.append(("born", player['dob'], last_code))
+    return keys
+
+
+def candidate_pairs(players, max_block=MAX_BLOCK):
+    """Unordered id pairs sharing at least one block"""
+    blocks = defaultdict(list)
+    for player in players:
+        for key in blocking_keys(player):
+            blocks[key].append(player['player_id'])
+
+    pairs = set()
+    for ids in blocks.values():
+        if 1 < len(ids) <= max_block:
+            pairs.update(combinations(sorted(ids), 2))
+    return pairs
+
+
+def _first_names_match(a, b):
+    """Equal, or one a prefix of the other (Steve/Steven, Rob/Robert)"""
+    return a == b or (min(len(a), len(b)) >= 3 and (a.startswith(b) or b.startswith(a)))
+
+
+def name_similarity(a, b, floor=0.0):
+    """
+    0..1 similarity of two players' names.  When even the cheap upper bound
+    is below `floor` that bound is returned instead of the exact ratio (the
+    pair cannot qualify either way).
+    """
+    tokens_a, tokens_b = name_tokens(a['f_name'], a['l_name']), name_tokens(b['f_name'], b['l_name'])
+    if sorted(tokens_a) == sorted(tokens_b):
+        return 1.0
+    last_a, last_b = " ".join(name_tokens(a['l_name'])), " ".join(name_tokens(b['l_name']))
+    first_a, first_b = " ".join(name_tokens(a['f_name'])), " ".join(name_tokens(b['f_name']))
+    boost = 0.95 if last_a == last_b and _first_names_match(first_a, first_b) else 0.0
+    matcher = SequenceMatcher(None, " ".join(tokens_a), " ".join(tokens_b))
+    bound = max(boost, matcher.quick_ratio())
+    if bound < floor:
+        return bound
+    return max(boost, matcher.ratio())
+
+
+def score(a, b, threshold=0.0):
+    """(score, reasons) for one candidate pair"""
+    same_dob = a.get('dob') is not None and a.get('dob') == b.get('dob')
+    same_team = a.get('team_id') is not None and a.get('team_id') == b.get('team_id')
+    # Name similarity the pair needs to reach the threshold at all
+    needed = (threshold - DOB_WEIGHT * same_dob - TEAM_WEIGHT * same_team) / NAME_WEIGHT
+    similarity = name_similarity(a, b, floor=needed)
+    reasons = [f"name {similarity:.0%}"]
+    if same_dob:
+        reasons.append("same date of birth")
+    if same_team:
+        reasons.append("same team")
+    total = NAME_WEIGHT * similarity + DOB_WEIGHT * same_dob + TEAM_WEIGHT * same_team
+    return round(total, 3), reasons
+
+
+def find_duplicates(players, threshold=THRESHOLD, max_block=MAX_BLOCK):
+    """
+    Likely duplicates among player dicts (player_id, f_name, l_name, dob,
+    team_id): [{'keep_id', 'duplicate_id', 'score', 'reasons'}], best first.
+    The lower id is proposed as the record to keep.
+    """
+    by_id = {player['player_id']: player for player in players}
+    found = []
+    for a_id, b_id in candidate_pairs(players, max_block):
+        a, b = by_id[a_id], by_id[b_id]
+        # Without a shared dob or team even identical names may fall short:
+        # skip the string comparison entirely
+        same_dob = a.get('dob') is not None and a.get('dob') == b.get('dob')
+        same_team = a.get('team_id') is not None and a.get('team_id') == b.get('team_id')
+        if NAME_WEIGHT + DOB_WEIGHT * same_dob + TEAM_WEIGHT * same_team < threshold:
+            continue
+        total, reasons = score(a, b, threshold)
+        if total >= threshold:
+            found.append({'keep_id': a_id, 'duplicate_id': b_id, 'score': total, 'reasons': ", ".join(reasons)})
+    found.sort(key=lambda pair: (-pair['score'], pair['keep_id'], pair['duplicate_id']))
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List likely duplicate players")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--secrets", default=".streamlit/secrets.toml",
+                        help="Streamlit secrets file with a [mysql] section")
+    args = parser.parse_args()
+
+    import mysql.connector
+    from cricketdb.snapshots import load_mysql_config
+
+    conn = mysql.connector.connect(**load_mysql_config(args.secrets))
+    try:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(PLAYERS_QUERY)
+        players = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+
+    names = {p['player_id']: f"{p['f_name']} {p['l_name']}" for p in players}
+    for pair in find_duplicates(players, args.threshold):
+        print(f"{pair['score']:.3f}  {pair['keep_id']:>6} {names[pair['keep_id']]:<28} "
+              f"{pair['duplicate_id']:>6} {names[pair['duplicate_id']]:<28} {pair['reasons']}")
+
+
+if __name__ == "__main__":
+    main()
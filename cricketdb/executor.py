@@ -0,0 +1,233 @@
+"""
+Resilient statement execution: time budgets, retries, a circuit breaker
+and cancellable long-running reads.
+
+- Every SELECT gets a ``MAX_EXECUTION_TIME`` optimizer hint from its query
+  class, so a runaway read is stopped by the server instead of holding a
+  connection indefinitely.
+- Reads are idempotent and are retried on connection-level errors with
+  full-jitter exponential backoff.  Writes are never retried.
+- A circuit breaker counts consecutive connection failures; once open it
+  fails fast for a cool-down period, then lets one probe through.
+- ``run_cancellable`` runs a read on a worker thread (``run_cancellable_many``
+  on one per shard) while the caller polls; if the caller is interrupted (a
+  Streamlit rerun, a Cancel click) the statement is stopped with ``KILL QUERY``.
+"""
+
+import random
+import re
+import threading
+import time
+
+from mysql.connector import errorcode
+from mysql.connector.errors import Error
+
+
+# Query class -> MAX_EXECUTION_TIME in milliseconds (None: no budget)
+TIME_BUDGETS = {
+    "interactive": 10000,
+    "report": 120000,
+    "bulk": None,
+}
+
+# Connection-level failures: safe to retry a read, and they count towards
+# opening the circuit
+TRANSIENT_ERRORS = {
+    errorcode.CR_CONNECTION_ERROR,
+    errorcode.CR_CONN_HOST_ERROR,
+    errorcode.CR_SERVER_GONE_ERROR,
+    errorcode.CR_SERVER_LOST,
+    errorcode.ER_CON_COUNT_ERROR,
+}
+
+QUERY_TIMEOUT = errorcode.ER_QUERY_TIMEOUT
+QUERY_INTERRUPTED = errorcode.ER_QUERY_INTERRUPTED
+
+_SELECT_RE = re.compile(r"^(\s*)SELECT\b", re.IGNORECASE)
+
+
+class CircuitOpenError(Error):
+    """Raised without touching MySQL while the circuit breaker is open"""
+
+    def __init__(self, retry_after):
+        super().__init__(msg=f"Database unavailable, retrying in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class QueryCancelled(Error):
+    """A cancellable statement was stopped with KILL QUERY"""
+
+
+def with_time_budget(query, milliseconds):
+    """Add a MAX_EXECUTION_TIME hint to a SELECT (other statements are unchanged)"""
+    if not milliseconds or "MAX_EXECUTION_TIME" in query.upper():
+        return query
+    return _SELECT_RE.sub(rf"\1SELECT /*+ MAX_EXECUTION_TIME({int(milliseconds)}) */", query, count=1)
+
+
+def is_transient(error):
+    """True for connection-level errors (lost/refused connections)"""
+    return getattr(error, "errno", None) in TRANSIENT_ERRORS
+
+
+class CircuitBreaker:
+    """Closed -> open after `threshold` consecutive failures -> half-open after `cooldown`"""
+
+    def __init__(self, threshold=5, cooldown=15.0, clock=time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self.lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half-open" if self.clock() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self):
+        """Raise CircuitOpenError unless a call may go to MySQL"""
+        with self.lock:
+            if self.opened_at is None:
+                return
+            waited = self.clock() - self.opened_at
+            if waited < self.cooldown or self.probing:
+                raise CircuitOpenError(max(self.cooldown - waited, 0.0))
+            # Half-open: exactly one probe at a time
+            self.probing = True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def release(self):
+        """End a probe that never reached a verdict (the caller gave up or broke)"""
+        with self.lock:
+            self.probing = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.threshold:
+                self.opened_at = self.clock()
+            self.probing = False
+
+
+class Executor:
+    """Applies budgets, retries and the breaker around one statement at a time"""
+
+    def __init__(self, budgets=None, attempts=3, backoff_base=0.1, backoff_cap=1.0,
+                 breaker=None, sleep=time.sleep):
+        self.budgets = dict(TIME_BUDGETS if budgets is None else budgets)
+        self.attempts = attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.breaker = breaker or CircuitBreaker()
+        self.sleep = sleep
+        self.retries = 0
+
+    def backoff(self, attempt):
+        """Full jitter: uniform in [0, min(cap, base * 2^attempt)]"""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def prepare(self, query, query_class="interactive"):
+        return with_time_budget(query, self.budgets.get(query_class))
+
+    def run(self, operation, retry):
+        """
+        Call operation() under the breaker.
+
+        With retry=True (idempotent reads) transient errors are retried with
+        backoff.  Every failed attempt counts towards opening the breaker,
+        and an open breaker stops the remaining attempts.
+        """
+        attempts = self.attempts if retry else 1
+        for attempt in range(attempts):
+            self.breaker.allow()
+            try:
+                result = operation()
+            except Error as e:
+                if not is_transient(e):
+                    # The server answered: MySQL itself is healthy
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt + 1 == attempts:
+                    raise
+                self.retries += 1
+                self.sleep(self.backoff(attempt))
+            except BaseException:
+                # Not a database outcome (a Streamlit rerun or stop raised
+                # from a poll, a bug in the caller): says nothing about MySQL,
+                # but a half-open probe must not stay claimed forever
+                self.breaker.release()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+
+
+def run_cancellable(conn, query, params, kill, poll, interval=0.2):
+    """
+    Run a read on a worker thread; returns (column names, rows).
+
+    poll(elapsed_seconds) is called from the calling thread every
+    `interval` seconds and may raise to abandon the query (Streamlit raises
+    from widget/element calls when the user reruns or navigates away).  In
+    that case kill(connection_id) is called to stop the statement on the
+    server before the exception propagates.
+    """
+    return run_cancellable_many([conn], query, params, kill, poll, interval)[0]
+
+
+def run_cancellable_many(conns, query, params, kill, poll, interval=0.2):
+    """
+    run_cancellable for the same read on several connections at once (one
+    per shard); returns one (column names, rows) per connection.  Abandoning
+    it kills the statement on every connection still running it.
+    """
+    outcomes = [{} for _ in conns]
+
+    def work(conn, outcome):
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, params or ())
+            outcome["rows"] = cursor.fetchall()
+            outcome["names"] = cursor.column_names
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            cursor.close()
+
+    workers = [threading.Thread(target=work, args=(conn, outcome), name="cricketdb-report", daemon=True)
+               for conn, outcome in zip(conns, outcomes)]
+    started = time.monotonic()
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            while worker.is_alive():
+                worker.join(interval)
+                if worker.is_alive():
+                    poll(time.monotonic() - started)
+    except BaseException:
+        for conn, worker in zip(conns, workers):
+            if worker.is_alive():
+                kill(conn.connection_id)
+        for worker in workers:
+            worker.join()
+        raise
+
+    for outcome in outcomes:
+        error = outcome.get("error")
+        if error is not None:
+            if getattr(error, "errno", None) == QUERY_INTERRUPTED:
+                raise QueryCancelled(msg="Query cancelled") from error
+            raise error
+    return [(outcome["names"], outcome["rows"]) for outcome in outcomes]
@@ -0,0 +1,102 @@
+"""
+Player form engine: rolling-window and exponentially weighted runs and
+wickets per player per format, in match-date order.
+
+The whole performance history is processed with one grouped
+``rolling``/``ewm`` pass.  New and edited performances are applied
+incrementally: only the (player, format) groups that gained, lost or
+changed rows are recomputed, the rest of the cached frame is kept as is.
+"""
+
+import threading
+
+import pandas as pd
+
+
+GROUP_KEYS = ["player_id", "format"]
+ORDER_KEYS = GROUP_KEYS + ["date_of_match", "match_id", "performance_id"]
+METRICS = ["runs_scored", "wickets_taken"]
+
+# Column order of the rows passed to rebuild()/append()
+COLUMNS = ["performance_id", "player_id", "match_id", "format", "date_of_match"] + METRICS
+
+
+def compute_form(df, window, halflife):
+    """Add <metric>_rolling and <metric>_ewma columns to a performance frame"""
+    df = df.sort_values(ORDER_KEYS, kind="stable").reset_index(drop=True)
+    if df.empty:
+        for metric in METRICS:
+            df[f"{metric}_rolling"] = pd.Series(dtype=float)
+            df[f"{metric}_ewma"] = pd.Series(dtype=float)
+        return df
+
+    grouped = df.groupby(GROUP_KEYS, sort=False)[METRICS]
+    rolling = grouped.rolling(window, min_periods=1).mean().reset_index(level=GROUP_KEYS, drop=True)
+    ewma = grouped.ewm(halflife=halflife).mean().reset_index(level=GROUP_KEYS, drop=True)
+
+    for metric in METRICS:
+        df[f"{metric}_rolling"] = rolling[metric].round(2)
+        df[f"{metric}_ewma"] = ewma[metric].round(2)
+    return df
+
+
+class FormIndex:
+    """Cached, incrementally appended form table (thread-safe)"""
+
+    def __init__(self, window=5, halflife=3.0):
+        self.window = window
+        self.halflife = halflife
+        self.frame = compute_form(pd.DataFrame(columns=COLUMNS), window, halflife)
+        self.high_water = 0
+        # Opaque marker set by whoever keeps the index in sync with the database
+        self.synced = None
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.frame)
+
+    def rebuild(self, rows):
+        """Replace everything with a full performance history (rows or column dict)"""
+        with self.lock:
+            df = pd.DataFrame(rows, columns=COLUMNS)
+            self.frame = compute_form(df, self.window, self.halflife)
+            self.high_water = int(df["performance_id"].max()) if len(df) else 0
+
+    def append(self, rows):
+        """Add new performances, recomputing only the groups they belong to"""
+        self._apply(rows)
+
+    def replace(self, rows):
+        """Swap in edited performances (same ids), recomputing only the groups they leave or join"""
+        self._apply(rows, replace=True)
+
+    def _apply(self, rows, replace=False):
+        new = pd.DataFrame(rows, columns=COLUMNS)
+        if new.empty:
+            return
+        with self.lock:
+            if replace:
+                edited = self.frame["performance_id"].isin(new["performance_id"])
+                groups = pd.concat([self.frame.loc[edited, GROUP_KEYS], new[GROUP_KEYS]])
+            else:
+                edited = pd.Series(False, index=self.frame.index)
+                groups = new[GROUP_KEYS]
+            touched = pd.MultiIndex.from_frame(groups.drop_duplicates())
+            affected = pd.MultiIndex.from_frame(self.frame[GROUP_KEYS]).isin(touched)
+
+            recomputed = compute_form(
+                pd.concat([self.frame.loc[affected & ~edited, COLUMNS], new], ignore_index=True),
+                self.window, self.halflife
+            )
+            self.frame = pd.concat([self.frame.loc[~affected], recomputed], ignore_index=True)
+            self.high_water = max(self.high_water, int(new["performance_id"].max()))
+
+    def player_history(self, player_id):
+        """Form rows for one player, newest first"""
+        rows = self.frame[self.frame["player_id"] == player_id]
+        return rows.sort_values(["date_of_match", "match_id"], ascending=False)
+
+    def latest(self, player_id):
+        """Most recent form per format for one player"""
+        rows = self.frame[self.frame["player_id"] == player_id]
+        return rows.sort_values(["date_of_match", "match_id"]).groupby("format").tail(1)
@@ -0,0 +1,70 @@
+"""
+Indexed in-memory frames for filter/sort views.
+
+A view that filters a cached frame by a few low-cardinality columns and
+offers a fixed set of sort orders can do all of the work up front:
+
+- the key columns are stored as categoricals (integer codes, one copy of
+  each distinct string);
+- each key column gets a {value: row positions} index;
+- each sort option gets a presorted row permutation.
+
+A filter is then a union of position arrays per key and an intersection
+across keys (a boolean mask), and sorting is taking the permutation
+through that mask.  No string comparisons and no intermediate copies; only
+the rows finally shown are materialized.
+"""
+
+import numpy as np
+
+
+class IndexedFrame:
+    """Immutable frame plus per-value row indexes and presorted permutations"""
+
+    def __init__(self, df, keys, sorts):
+        """
+        keys:  columns that can be filtered on
+        sorts: {label: (column, ascending)} sort options
+        """
+        df = df.reset_index(drop=True)
+        self.frame = df.astype({key: "category" for key in keys})
+        self.positions = {
+            key: {value: rows for value, rows in self.frame.groupby(key, observed=True).indices.items()}
+            for key in keys
+        }
+        self.orders = {
+            label: self.frame.sort_values(column, ascending=ascending, kind="stable").index.to_numpy()
+            for label, (column, ascending) in sorts.items()
+        }
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def empty(self):
+        return self.frame.empty
+
+    def options(self, key):
+        """Distinct values of a key column that occur in the frame, sorted"""
+        return sorted(self.positions[key])
+
+    def mask(self, filters):
+        """Boolean row mask for {key: selected values}; empty selections don't filter"""
+        keep = np.ones(len(self.frame), dtype=bool)
+        for key, values in filters.items():
+            if not values:
+                continue
+            selected = np.zeros(len(self.frame), dtype=bool)
+            index = self.positions[key]
+            for value in values:
+                rows = index.get(value)
+                if rows is not None:
+                    selected[rows] = True
+            keep &= selected
+        return keep
+
+    def select(self, filters=None, sort=None):
+        """Rows matching the filters, in the order of a sort option (or original order)"""
+        keep = self.mask(filters or {})
+        order = self.orders[sort] if sort is not None else np.arange(len(self.frame))
+        return self.frame.take(order[keep[order]])
@@ -0,0 +1,139 @@
+"""
+Head-to-head and venue analytics engine.
+
+Matches are loaded once into flat NumPy arrays (dense team indices, day
+dates, venue codes, tournament codes).  Every question - the full
+team x team win/loss matrix, a pair's record, or its per-venue and
+per-tournament breakdown - is answered with boolean masks and
+``np.bincount`` over those arrays, never with a Python loop over matches.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class HeadToHead:
+    """Vectorized win/loss analytics over the matches table"""
+
+    def __init__(self, winning_team_ids, losing_team_ids, dates, venues, tournament_ids):
+        winners = np.asarray(winning_team_ids, dtype=np.int64)
+        losers = np.asarray(losing_team_ids, dtype=np.int64)
+
+        # Dense 0..n-1 team indices so the matrix is n x n, not max_id x max_id
+        self.team_ids = np.unique(np.concatenate([winners, losers]))
+        self.winner_idx = np.searchsorted(self.team_ids, winners)
+        self.loser_idx = np.searchsorted(self.team_ids, losers)
+
+        self.dates = np.asarray(dates, dtype="datetime64[D]")
+
+        venue_codes, venue_names = pd.factorize(np.asarray(venues, dtype=object), sort=True)
+        self.venue_codes = venue_codes.astype(np.int64)
+        self.venues = np.asarray(venue_names, dtype=object)
+
+        tournaments = np.asarray(tournament_ids, dtype=np.int64)
+        self.tournament_ids, self.tournament_codes = np.unique(tournaments, return_inverse=True)
+
+        n = len(self.team_ids)
+        self.wins = np.bincount(
+            self.winner_idx * n + self.loser_idx, minlength=n * n
+        ).reshape(n, n)
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Build from a column dict as returned by ``fetch_columns``"""
+        return cls(
+            columns.get("winning_team_id", ()),
+            columns.get("losing_team_id", ()),
+            columns.get("date_of_match", ()),
+            columns.get("location", ()),
+            columns.get("tournament_id", ())
+        )
+
+    def __len__(self):
+        return len(self.winner_idx)
+
+    def team_index(self, team_id):
+        """Dense index of a team id, or None if it never played"""
+        pos = np.searchsorted(self.team_ids, team_id)
+        if pos < len(self.team_ids) and self.team_ids[pos] == team_id:
+            return int(pos)
+        return None
+
+    def matrix(self):
+        """Return (team_ids, wins) where wins[i, j] = times team i beat team j"""
+        return self.team_ids, self.wins
+
+    def _mask(self, team_a, team_b=None, venue=None, tournament_id=None, start=None, end=None):
+        """Boolean mask of matches involving team_a (optionally vs team_b) and filters"""
+        a = self.team_index(team_a)
+        if a is None:
+            return None, None
+
+        if team_b is None:
+            mask = (self.winner_idx == a) | (self.loser_idx == a)
+        else:
+            b = self.team_index(team_b)
+            if b is None:
+                return None, None
+            mask = ((self.winner_idx == a) & (self.loser_idx == b)) | \
+                   ((self.winner_idx == b) & (self.loser_idx == a))
+
+        if venue is not None:
+            code = np.searchsorted(self.venues, venue)
+            if code >= len(self.venues) or self.venues[code] != venue:
+                return None, None
+            mask &= self.venue_codes == code
+
+        if tournament_id is not None:
+            code = np.searchsorted(self.tournament_ids, tournament_id)
+            if code >= len(self.tournament_ids) or self.tournament_ids[code] != tournament_id:
+                return None, None
+            mask &= self.tournament_codes == code
+
+        if start is not None:
+            mask &= self.dates >= np.datetime64(start, "D")
+        if end is not None:
+            mask &= self.dates <= np.datetime64(end, "D")
+
+        return a, mask
+
+    def record(self, team_a, team_b=None, venue=None, tournament_id=None, start=None, end=None):
+        """Played/won/lost for team_a against team_b (or everyone) under the filters"""
+        a, mask = self._mask(team_a, team_b, venue, tournament_id, start, end)
+        if mask is None:
+            return {"played": 0, "won": 0, "lost": 0}
+
+        played = int(np.count_nonzero(mask))
+        won = int(np.count_nonzero(mask & (self.winner_idx == a)))
+        return {"played": played, "won": won, "lost": played - won}
+
+    def breakdown(self, by, team_a, team_b=None, venue=None, tournament_id=None, start=None, end=None):
+        """
+        Per-venue or per-tournament record for team_a.
+
+        Returns a DataFrame with one row per venue/tournament that has at
+        least one match, columns: key, played, won, lost.
+        """
+        if by == "venue":
+            codes, labels, key = self.venue_codes, self.venues, "venue"
+        elif by == "tournament":
+            codes, labels, key = self.tournament_codes, self.tournament_ids, "tournament_id"
+        else:
+            raise ValueError(f"Unknown breakdown: {by}")
+
+        a, mask = self._mask(team_a, team_b, venue, tournament_id, start, end)
+        if mask is None:
+            return pd.DataFrame(columns=[key, "played", "won", "lost"])
+
+        selected = codes[mask]
+        won_flags = self.winner_idx[mask] == a
+        played = np.bincount(selected, minlength=len(labels))
+        won = np.bincount(selected, weights=won_flags, minlength=len(labels)).astype(np.int64)
+
+        present = np.flatnonzero(played)
+        return pd.DataFrame({
+            key: labels[present],
+            "played": played[present],
+            "won": won[present],
+            "lost": played[present] - won[present]
+        }).sort_values("played", ascending=False, kind="stable")
@@ -0,0 +1,219 @@
+"""
+Process-wide counters and histograms exported in the OpenMetrics text
+format.
+
+The metrics below are updated by the database helpers, the page router
+and the login flow.  ``serve()`` exposes them on a small background HTTP
+server for a local Prometheus-compatible scraper:
+
+    GET /metrics   OpenMetrics exposition
+    GET /traces    the most recent page traces as JSON (see tracing.py)
+
+Only the standard library is used, so importing this module stays cheap
+enough for the login page.
+"""
+
+import json
+import math
+import re
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+from cricketdb import tracing
+
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Seconds; covers a cached rerun (~1 ms) up to a report near its budget
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 120.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic count per label set (exposed as <name>_total)"""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self.values.get(tuple(str(labels[name]) for name in self.labels), 0)
+
+    def samples(self):
+        with self.lock:
+            items = sorted(self.values.items())
+        for key, value in items:
+            yield f"{self.name}_total{_format_labels(self.labels, key)} {_format_value(value)}"
+
+
+class Histogram:
+    """Cumulative buckets plus count and sum per label set"""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values -> [per-bucket counts, count, sum]
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labels)
+        with self.lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [[0] * len(self.buckets), 0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += 1
+            entry[2] += value
+
+    def count(self, **labels):
+        entry = self.values.get(tuple(str(labels[name]) for name in self.labels))
+        return entry[1] if entry else 0
+
+    def samples(self):
+        with self.lock:
+            items = sorted((key, (list(counts), count, total)) for key, (counts, count, total) in self.values.items())
+        for key, (counts, count, total) in items:
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, counts):
+                cumulative += bucket
+                le = (("le", _format_value(float(bound))),)
+                yield f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {count}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}"
+
+
+class Registry:
+    """A set of metric families rendered together"""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if metric.name.endswith("_seconds"):
+                lines.append(f"# UNIT {metric.name} seconds")
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.extend(metric.samples())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+QUERY_SECONDS = REGISTRY.register(Histogram(
+    "cricketdb_query_duration_seconds", "Statement execution and fetch time", ["statement", "outcome"]))
+ROWS_FETCHED = REGISTRY.register(Counter(
+    "cricketdb_rows_fetched", "Rows returned by reads", ["statement"]))
+CONNECTION_SECONDS = REGISTRY.register(Histogram(
+    "cricketdb_connection_acquire_seconds", "Time to get a connection", ["pool"]))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "cricketdb_cache_requests", "Session data cache lookups", ["cache", "result"]))
+PAGE_SECONDS = REGISTRY.register(Histogram(
+    "cricketdb_page_rerun_duration_seconds", "Time to render a page on a script rerun", ["page"]))
+LOGINS = REGISTRY.register(Counter(
+    "cricketdb_logins", "Login attempts by outcome", ["outcome"]))
+
+
+_VERB_RE = re.compile(r"^\s*(?:/\*.*?\*/\s*)*(\w+)", re.DOTALL)
+_TABLE_RE = re.compile(r"\b(?:FROM|INTO|UPDATE|CALL)\s+`?(\w+)`?", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def statement_name(query):
+    """Low-cardinality label for a statement: 'select:player', 'call:PromoteAllRounders'"""
+    verb = _VERB_RE.match(query)
+    table = _TABLE_RE.search(query)
+    name = verb.group(1).lower() if verb else "unknown"
+    return f"{name}:{table.group(1)}" if table else name
+
+
+@contextmanager
+def observe_statement(name):
+    """
+    Time one statement under `name` (histogram + trace span).  Reads set
+    ``record["rows"]`` on the yielded dict.
+    """
+    record = {"rows": None}
+    outcome = "error"
+    start = time.perf_counter()
+    with tracing.span("query", statement=name) as span:
+        try:
+            yield record
+            outcome = "ok"
+        finally:
+            QUERY_SECONDS.observe(time.perf_counter() - start, statement=name, outcome=outcome)
+            if record["rows"] is not None:
+                ROWS_FETCHED.inc(record["rows"], statement=name)
+                if span is not None:
+                    span.attributes["rows"] = record["rows"]
+
+
+def serve(port, host="127.0.0.1", registry=REGISTRY):
+    """Start the /metrics and /traces endpoint on a daemon thread; returns the server"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/metrics":
+                body, content_type = registry.render().encode(), CONTENT_TYPE
+            elif path == "/traces":
+                body = json.dumps([root.to_dict() for root in tracing.recent()]).encode()
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Scrapes every few seconds would flood the Streamlit log
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="cricketdb-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,83 @@
+"""
+Registry of hot parameterized statements run as server-side prepared
+statements.
+
+Each statement is prepared once per connection (COM_STMT_PREPARE) and
+then only executed (COM_STMT_EXECUTE), with parameters and rows travelling
+in the binary protocol: no re-parsing or re-planning of the text and no
+string formatting of parameters.  The prepared cursors are kept per
+connection, so the connections must come from a pool that does not reset
+the session on return (a reset deallocates every prepared statement).
+
+Connector cursors only reuse a prepared statement when they are handed
+the very same string object again, so callers go through the registry by
+name rather than passing SQL text.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+STATEMENTS = {
+    "user_login": "SELECT user_id, username, role FROM users WHERE username = %s AND password = %s",
+    "player_by_id": "SELECT * FROM player WHERE player_id = %s",
+    "match_by_id": "SELECT * FROM matches WHERE match_id = %s",
+    "match_details_by_id": """SELECT m.*, t1.team_name as winning_team, t2.team_name as losing_team
+                              FROM matches m
+                              JOIN team t1 ON m.winning_team_id = t1.team_id
+                              JOIN team t2 ON m.losing_team_id = t2.team_id
+                              WHERE m.match_id = %s""",
+}
+
+
+class StatementRegistry:
+    """Named statements plus the prepared cursors of every connection that ran them"""
+
+    def __init__(self, statements=None, max_connections=64):
+        self.statements = dict(STATEMENTS if statements is None else statements)
+        self.max_connections = max_connections
+        # connection_id -> {name: prepared cursor}; a reconnect gets a new id
+        self.cursors = OrderedDict()
+        self.prepares = 0
+        self.executions = 0
+        self.lock = threading.Lock()
+
+    def register(self, name, query):
+        """Add a statement; re-registering the same text keeps the original object"""
+        with self.lock:
+            if self.statements.get(name) != query:
+                self.statements[name] = query
+
+    def _cursor(self, conn, name):
+        with self.lock:
+            per_connection = self.cursors.get(conn.connection_id)
+            if per_connection is None:
+                per_connection = self.cursors[conn.connection_id] = {}
+                # Oldest entries belong to connections that were closed or reconnected
+                while len(self.cursors) > self.max_connections:
+                    self.cursors.popitem(last=False)
+            self.cursors.move_to_end(conn.connection_id)
+
+            cursor = per_connection.get(name)
+            if cursor is None:
+                cursor = per_connection[name] = conn.cursor(prepared=True)
+                self.prepares += 1
+            self.executions += 1
+            return cursor
+
+    def forget(self, conn):
+        """Drop a connection's cursors (after an error left them unusable)"""
+        with self.lock:
+            self.cursors.pop(conn.connection_id, None)
+
+    def execute(self, conn, name, params=()):
+        """Execute a registered statement on conn; returns (column names, rows)"""
+        query = self.statements[name]
+        cursor = self._cursor(conn, name)
+        try:
+            cursor.execute(query, tuple(params))
+            rows = cursor.fetchall()
+            return cursor.column_names, rows
+        except Exception:
+            self.forget(conn)
+            raise
@@ -0,0 +1,97 @@
+"""
+Batched stored-procedure runner with a per-argument result cache.
+
+A batch of calls (e.g. GetPlayersByTeam for every team in a tournament)
+runs over a single connection, collecting every result set from
+``stored_results()``.  Results are cached per (procedure, arguments) and
+tagged with the versions of the tables the procedure reads, so any write
+to those tables (see ``cricketdb.versions``) invalidates them.
+"""
+
+import threading
+from collections import OrderedDict
+
+from cricketdb import versions
+
+
+# Registered procedures -> tables their result depends on
+PROCEDURES = {
+    "GetPlayersByTeam": ("player", "team", "role"),
+}
+
+
+class ProcedureRunner:
+    """Runs registered procedures for many argument tuples over one connection"""
+
+    def __init__(self, procedures=None, max_entries=1024):
+        self.procedures = dict(PROCEDURES if procedures is None else procedures)
+        self.max_entries = max_entries
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def register(self, name, tables):
+        self.procedures[name] = tuple(tables)
+
+    def _cached(self, key, current):
+        entry = self.cache.get(key)
+        if entry is None or entry[0] != current:
+            return None
+        self.cache.move_to_end(key)
+        return entry[1]
+
+    def _store(self, key, current, result):
+        self.cache[key] = (current, result)
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.max_entries:
+            self.cache.popitem(last=False)
+
+    def run_many(self, connect, name, arg_list):
+        """
+        Call procedure `name` once per argument tuple in arg_list.
+
+        `connect` returns a DB-API connection (or None, raising
+        ConnectionError); it is only called when at least one call misses
+        the cache.  Returns a list aligned with
+        arg_list; each item is the list of result sets, each a list of
+        row dicts.
+        """
+        if name not in self.procedures:
+            raise KeyError(f"Procedure {name} is not registered")
+
+        arg_list = [tuple(args) for args in arg_list]
+        # Version taken before running: a write during the batch leaves it stale
+        current = versions.version(*self.procedures[name])
+        results = {}
+
+        with self.lock:
+            for args in arg_list:
+                cached = self._cached((name, args), current)
+                if cached is not None:
+                    results[args] = cached
+            self.hits += len(results)
+
+        missing = [args for args in dict.fromkeys(arg_list) if args not in results]
+        if missing:
+            conn = connect()
+            if conn is None:
+                raise ConnectionError("No database connection")
+            cursor = conn.cursor()
+            try:
+                for args in missing:
+                    cursor.callproc(name, list(args))
+                    results[args] = [
+                        [dict(zip(result.column_names, row)) for row in result.fetchall()]
+                        for result in cursor.stored_results()
+                    ]
+            finally:
+                cursor.close()
+                conn.close()
+
+            with self.lock:
+                self.misses += len(missing)
+                for args in missing:
+                    self._store((name, args), current, results[args])
+
+        return [results[args] for args in arg_list]
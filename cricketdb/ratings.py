@@ -0,0 +1,62 @@
+"""
+Elo-style team rating engine.
+
+Ratings are a pure function of the match history in (date_of_match,
+match_id) order, so the engine only ever needs the ratings as they stood
+at some point in time plus the matches after it:
+
+- a new match dated after everything already rated is one ``apply`` call
+  touching two teams;
+- an edited or back-dated match replays from its date, starting from the
+  ratings recorded just before that date.
+"""
+
+DEFAULT_RATING = 1500.0
+K_FACTOR = 32.0
+
+
+def expected_score(rating_a, rating_b):
+    """Probability that a team rated rating_a beats one rated rating_b"""
+    return 1.0 / (1.0 + 10 ** ((rating_b - rating_a) / 400.0))
+
+
+class EloEngine:
+    """Applies matches to a {team_id: rating} map and records history rows"""
+
+    def __init__(self, ratings=None, k_factor=K_FACTOR, initial_rating=DEFAULT_RATING):
+        self.ratings = {int(t): float(r) for t, r in (ratings or {}).items()}
+        self.k_factor = k_factor
+        self.initial_rating = initial_rating
+
+    def rating(self, team_id):
+        return self.ratings.get(team_id, self.initial_rating)
+
+    def apply(self, match_id, winning_team_id, losing_team_id, date_of_match):
+        """
+        Rate one match and return its two history rows as
+        (match_id, team_id, date_of_match, rating_before, rating_after).
+        """
+        winner_before = self.rating(winning_team_id)
+        loser_before = self.rating(losing_team_id)
+
+        delta = self.k_factor * (1.0 - expected_score(winner_before, loser_before))
+        winner_after = round(winner_before + delta, 2)
+        loser_after = round(loser_before - delta, 2)
+
+        self.ratings[winning_team_id] = winner_after
+        self.ratings[losing_team_id] = loser_after
+
+        return [
+            (match_id, winning_team_id, date_of_match, winner_before, winner_after),
+            (match_id, losing_team_id, date_of_match, loser_before, loser_after)
+        ]
+
+    def replay(self, matches):
+        """
+        Apply matches in order; each item is
+        (match_id, winning_team_id, losing_team_id, date_of_match).
+        """
+        history = []
+        for match_id, winner, loser, date_of_match in matches:
+            history.extend(self.apply(match_id, winner, loser, date_of_match))
+        return history
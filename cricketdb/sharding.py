@@ -0,0 +1,415 @@
+"""
+Tournament sharding of the match data.
+
+matches, player_performance, award and played_in can be split by
+tournament_id across several schemas on the same MySQL server:
+
+  primary schema  the shared tables (team, player, tournament, ...), the
+                  routines, a key sequence, and UNION ALL views named
+                  after the sharded tables, so any query that is not
+                  routed still sees every row
+  shard schemas   the sharded tables themselves (same columns, indexes
+                  and triggers) plus views onto every shared table
+
+``ShardRouter`` decides where a statement runs and db.py executes it:
+
+- Reads scoped to one tournament run on its shard.  Cross-tournament
+  reads that come with a ``Merge`` fan out to every shard in parallel and
+  are combined here; any other read runs on the primary through the views.
+- Writes run on a primary connection with the target table qualified by
+  its shard schema, so a transaction stays one transaction even when it
+  touches several shards.  INSERTs are placed by tournament_id (matches)
+  or by their match; UPDATE/DELETE go to every shard, which each hold
+  disjoint rows.
+- New keys come from the primary's ``shard_sequence`` so they stay unique
+  and increasing across shards (the PromoteAllRounders and calendar
+  rollup watermarks rely on that).
+
+Foreign keys between shared and sharded tables are dropped (MySQL cannot
+enforce them across the split); the app already deletes a player's
+performances and awards before the player.
+
+Enable it with a [sharding] section in the Streamlit secrets:
+
+    [sharding]
+    shards = ["CricketDB_s0", "CricketDB_s1", "CricketDB_s2"]
+
+    [sharding.tournaments]   # optional pinning; others go to tournament_id % shards
+    "4" = 0
+
+and split an existing database with:
+
+    python -m cricketdb.sharding init
+    python -m cricketdb.sharding status
+"""
+
+import argparse
+import re
+from collections import OrderedDict
+
+from mysql.connector.errors import Error
+
+from cricketdb.versions import written_table
+
+
+SHARDED_TABLES = ("matches", "player_performance", "award", "played_in")
+
+# Sharded tables whose key the sequence hands out
+SEQUENCE_KEYS = {
+    "matches": "match_id",
+    "player_performance": "performance_id",
+    "award": "award_id",
+}
+
+SEQUENCE_DDL = """CREATE TABLE IF NOT EXISTS shard_sequence (
+  table_name VARCHAR(64) PRIMARY KEY,
+  last_id BIGINT NOT NULL
+)"""
+SEQUENCE_ALLOCATE = "UPDATE shard_sequence SET last_id = LAST_INSERT_ID(last_id + %s) WHERE table_name = %s"
+
+LOCATE_MATCH = "SELECT tournament_id FROM matches WHERE match_id = %s"
+
+_TABLE_RE = re.compile(r"\b(?:FROM|JOIN|INTO|UPDATE)\s+`?(\w+)`?", re.IGNORECASE)
+_TARGET_RE = re.compile(
+    r"^(\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+)`?(\w+)`?", re.IGNORECASE)
+_INSERT_RE = re.compile(r"^\s*INSERT\s+INTO\s+`?(\w+)`?\s*\(([^)]*)\)\s*VALUES\s*\((.*)\)\s*$",
+                        re.IGNORECASE | re.DOTALL)
+
+
+class ShardingError(Error):
+    """A statement the router cannot place"""
+
+
+def _split_values(text):
+    """Split a VALUES list on its top-level commas"""
+    items, depth, start, quote, escaped = [], 0, 0, None, False
+    for i, char in enumerate(text):
+        if escaped:
+            escaped = False
+        elif quote:
+            if char == "\\":
+                escaped = True
+            elif char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            items.append(text[start:i].strip())
+            start = i + 1
+    items.append(text[start:].strip())
+    return items
+
+
+def _combine(function, a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return function(a, b)
+
+
+def _add(a, b):
+    return a + b
+
+
+class Merge:
+    """
+    How to combine the rows every shard returned for a fanned-out read.
+
+    keys:      group columns; rows with equal keys become one row (no keys:
+               the shards' rows are concatenated)
+    sums, maxes, mins: columns combined by sum, max or min; other columns
+               keep the first shard's value
+    derive:    {column: function(row)} recomputed after combining, e.g. an
+               average from combined sums
+    order_by:  [(column, descending)] applied to the merged rows, then limit
+    """
+
+    def __init__(self, keys=(), sums=(), maxes=(), mins=(), derive=None, order_by=(), limit=None):
+        self.keys = tuple(keys)
+        self.sums = tuple(sums)
+        self.maxes = tuple(maxes)
+        self.mins = tuple(mins)
+        self.derive = derive or {}
+        self.order_by = tuple(order_by)
+        self.limit = limit
+
+    def apply(self, results):
+        """Merged row dicts from a list of per-shard row lists"""
+        rows = [dict(row) for shard_rows in results for row in shard_rows]
+        if self.keys or self.sums or self.maxes or self.mins:
+            groups = OrderedDict()
+            for row in rows:
+                key = tuple(row[column] for column in self.keys)
+                current = groups.get(key)
+                if current is None:
+                    groups[key] = row
+                    continue
+                for columns, function in ((self.sums, _add), (self.maxes, max), (self.mins, min)):
+                    for column in columns:
+                        current[column] = _combine(function, current[column], row[column])
+            rows = list(groups.values())
+
+        for row in rows:
+            for column, function in self.derive.items():
+                row[column] = function(row)
+
+        # Stable sorts from the last key to the first; NULLs sort last either way
+        for column, descending in reversed(self.order_by):
+            if descending:
+                rows.sort(key=lambda row: (row[column] is not None, row[column]), reverse=True)
+            else:
+                rows.sort(key=lambda row: (row[column] is None, row[column]))
+        return rows if self.limit is None else rows[:self.limit]
+
+
+class ShardRouter:
+    """Shard placement for the tables in SHARDED_TABLES"""
+
+    def __init__(self, primary, shards, pinned=None):
+        if not shards:
+            raise ValueError("sharding needs at least one shard schema")
+        self.primary = primary
+        self.shards = list(shards)
+        self.pinned = {int(tournament): int(index) for tournament, index in (pinned or {}).items()}
+        for tournament, index in self.pinned.items():
+            if not 0 <= index < len(self.shards):
+                raise ValueError(f"tournament {tournament} is pinned to shard {index}, "
+                                 f"but there are {len(self.shards)} shards")
+
+    @classmethod
+    def from_config(cls, primary, config):
+        """Router for a [sharding] secrets section (None when sharding is off)"""
+        if not config or not config.get("shards"):
+            return None
+        return cls(primary, config["shards"], config.get("tournaments"))
+
+    def shard_of(self, tournament_id):
+        """Schema holding a tournament's matches"""
+        index = self.pinned.get(int(tournament_id), int(tournament_id) % len(self.shards))
+        return self.shards[index]
+
+    def touches(self, query):
+        """True if the statement reads or writes a sharded table"""
+        return any(table.lower() in SHARDED_TABLES for table in _TABLE_RE.findall(query))
+
+    def qualify(self, query, shard):
+        """The statement with its target table qualified by a shard schema"""
+        return _TARGET_RE.sub(lambda m: f"{m.group(1)}`{shard}`.`{m.group(2)}`", query, count=1)
+
+    # WRITES
+    def locate(self, match_ids, lookup):
+        """
+        Shards of the given matches.  lookup(match_id) -> tournament_id (or
+        None) reads the current row, so a match moved by another process is
+        never placed from a stale cache.
+        """
+        shards = set()
+        for match_id in set(match_ids):
+            tournament_id = lookup(match_id)
+            if tournament_id is None:
+                raise ShardingError(msg=f"Match {match_id} does not exist")
+            shards.add(self.shard_of(tournament_id))
+        return shards
+
+    def plan_insert(self, query, params, lookup, allocate):
+        """
+        Place an INSERT into a sharded table.
+
+        Returns (shard, query, params, first key or None).  Tables with a
+        sequence key get explicit keys from allocate(table, count).
+        """
+        match = _INSERT_RE.match(query)
+        if not match:
+            raise ShardingError(msg="Sharded INSERTs need an explicit column list and one VALUES tuple")
+        table = match.group(1).lower()
+        columns = [column.strip(" `").lower() for column in match.group(2).split(",")]
+        values = _split_values(match.group(3))
+
+        # Parameter position of every column given as a bare placeholder
+        slots, position = {}, 0
+        for column, value in zip(columns, values):
+            if value == "%s":
+                slots[column] = position
+            position += value.count("%s")
+
+        many = isinstance(params, list)
+        rows = [tuple(row) for row in params] if many else [tuple(params)]
+        if table == "matches" and "tournament_id" in slots:
+            shards = {self.shard_of(row[slots["tournament_id"]]) for row in rows}
+        elif "match_id" in slots:
+            shards = self.locate([row[slots["match_id"]] for row in rows], lookup)
+        else:
+            raise ShardingError(msg=f"Cannot place an INSERT into {table} without its tournament or match")
+        if len(shards) != 1:
+            raise ShardingError(msg=f"One INSERT into {table} cannot span shards {sorted(shards)}")
+        shard = shards.pop()
+
+        first_id = None
+        key = SEQUENCE_KEYS.get(table)
+        if key and key not in columns:
+            first_id = allocate(table, len(rows))
+            query = f"INSERT INTO {table} ({key}, {match.group(2).strip()}) VALUES (%s, {match.group(3).strip()})"
+            rows = [(first_id + i,) + row for i, row in enumerate(rows)]
+
+        return shard, self.qualify(query, shard), rows if many else rows[0], first_id
+
+    def plan_write(self, query, params, lookup, allocate):
+        """
+        [(query, params)] to run on one primary connection for a DML
+        statement, plus the first key allocated for an INSERT (or None).
+        """
+        table = written_table(query)
+        if table not in SHARDED_TABLES:
+            return [(query, params)], None
+        if query.lstrip()[:6].upper() == "INSERT":
+            _, query, params, first_id = self.plan_insert(query, params, lookup, allocate)
+            return [(query, params)], first_id
+        return [(self.qualify(query, shard), params) for shard in self.shards], None
+
+    def relocation(self, match_id, source, target):
+        """Statements moving one match and its rows between shards (run in one transaction)"""
+        if source == target:
+            return []
+        statements = [("SET @skip_promotion_trigger = 1", None)]
+        for table in SHARDED_TABLES:
+            statements.append((f"INSERT INTO `{target}`.`{table}` SELECT * FROM `{source}`.`{table}` "
+                               f"WHERE match_id = %s", (match_id,)))
+            statements.append((f"DELETE FROM `{source}`.`{table}` WHERE match_id = %s", (match_id,)))
+        statements.append(("SET @skip_promotion_trigger = NULL", None))
+        return statements
+
+
+# SETUP
+def _rows(cursor, query, params=None):
+    cursor.execute(query, params or ())
+    return cursor.fetchall()
+
+
+def split_database(conn, router, log=print):
+    """
+    Move the sharded tables of the primary schema into the shard schemas
+    and replace them with UNION ALL views.  DDL is not transactional: run
+    it on a quiet database (and keep a snapshot).
+    """
+    primary = router.primary
+    cursor = conn.cursor()
+    kinds = dict(_rows(cursor, "SELECT TABLE_NAME, TABLE_TYPE FROM information_schema.TABLES "
+                               "WHERE TABLE_SCHEMA = %s", (primary,)))
+    if any(kinds.get(table) == "VIEW" for table in SHARDED_TABLES):
+        raise SystemExit(f"{primary} is already sharded")
+    shared = sorted(name for name, kind in kinds.items()
+                    if kind == "BASE TABLE" and name not in SHARDED_TABLES and name != "shard_sequence")
+
+    # Tournament -> shard for every tournament that exists
+    placement = {}
+    for (tournament_id,) in _rows(cursor, "SELECT tournament_id FROM tournament"):
+        placement.setdefault(router.shard_of(tournament_id), []).append(tournament_id)
+
+    placeholders = ", ".join(["%s"] * len(SHARDED_TABLES))
+    triggers = _rows(cursor, f"""SELECT TRIGGER_NAME, ACTION_TIMING, EVENT_MANIPULATION, EVENT_OBJECT_TABLE,
+                                        ACTION_STATEMENT
+                                 FROM information_schema.TRIGGERS
+                                 WHERE TRIGGER_SCHEMA = %s AND EVENT_OBJECT_TABLE IN ({placeholders})""",
+                     (primary,) + SHARDED_TABLES)
+
+    for shard in router.shards:
+        log(f"creating {shard}")
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{shard}`")
+        for table in SHARDED_TABLES:
+            cursor.execute(f"CREATE TABLE `{shard}`.`{table}` LIKE `{primary}`.`{table}`")
+        for table in shared:
+            cursor.execute(f"CREATE OR REPLACE VIEW `{shard}`.`{table}` AS SELECT * FROM `{primary}`.`{table}`")
+
+        tournaments = placement.get(shard)
+        if tournaments:
+            placeholders = ", ".join(["%s"] * len(tournaments))
+            cursor.execute(f"INSERT INTO `{shard}`.matches SELECT * FROM `{primary}`.matches "
+                           f"WHERE tournament_id IN ({placeholders})", tuple(tournaments))
+            for table in SHARDED_TABLES[1:]:
+                cursor.execute(f"INSERT INTO `{shard}`.`{table}` SELECT c.* FROM `{primary}`.`{table}` c "
+                               f"JOIN `{shard}`.matches m ON c.match_id = m.match_id")
+        conn.commit()
+
+        # Triggers resolve unqualified names in their own schema: the shard's views
+        cursor.execute(f"USE `{shard}`")
+        for name, timing, event, table, body in triggers:
+            cursor.execute(f"CREATE TRIGGER `{name}` {timing} {event} ON `{table}` FOR EACH ROW {body}")
+        cursor.execute(f"USE `{primary}`")
+
+    log("starting the key sequence")
+    cursor.execute(SEQUENCE_DDL)
+    for table, key in SEQUENCE_KEYS.items():
+        cursor.execute(f"REPLACE INTO shard_sequence (table_name, last_id) "
+                       f"SELECT %s, COALESCE(MAX({key}), 0) FROM {table}", (table,))
+    conn.commit()
+
+    log("replacing the sharded tables with views")
+    for table, constraint in _rows(cursor, f"""SELECT TABLE_NAME, CONSTRAINT_NAME
+                                              FROM information_schema.REFERENTIAL_CONSTRAINTS
+                                              WHERE CONSTRAINT_SCHEMA = %s
+                                                AND (TABLE_NAME IN ({placeholders})
+                                                     OR REFERENCED_TABLE_NAME IN ({placeholders}))""",
+                                   (primary,) + SHARDED_TABLES * 2):
+        if table not in SHARDED_TABLES:
+            cursor.execute(f"ALTER TABLE `{table}` DROP FOREIGN KEY `{constraint}`")
+    for table in reversed(SHARDED_TABLES):
+        cursor.execute(f"DROP TABLE `{table}`")
+    for table in SHARDED_TABLES:
+        union = " UNION ALL ".join(f"SELECT * FROM `{shard}`.`{table}`" for shard in router.shards)
+        cursor.execute(f"CREATE VIEW `{table}` AS {union}")
+    cursor.close()
+
+
+def shard_status(conn, router):
+    """{shard: {table: rows}}"""
+    cursor = conn.cursor()
+    status = {shard: {table: _rows(cursor, f"SELECT COUNT(*) FROM `{shard}`.`{table}`")[0][0]
+                      for table in SHARDED_TABLES}
+              for shard in router.shards}
+    cursor.close()
+    return status
+
+
+def load_sharding_config(secrets_path=".streamlit/secrets.toml"):
+    """Read the [sharding] section of the Streamlit secrets file"""
+    try:
+        import tomllib
+        with open(secrets_path, "rb") as f:
+            return tomllib.load(f).get("sharding", {})
+    except ImportError:
+        import toml
+        return toml.load(secrets_path).get("sharding", {})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split CricketDB's match data into tournament shards")
+    parser.add_argument("command", choices=["init", "status"])
+    parser.add_argument("--secrets", default=".streamlit/secrets.toml",
+                        help="Streamlit secrets file with [mysql] and [sharding] sections")
+    args = parser.parse_args()
+
+    import mysql.connector
+    from cricketdb.snapshots import load_mysql_config
+
+    config = load_mysql_config(args.secrets)
+    router = ShardRouter.from_config(config["database"], load_sharding_config(args.secrets))
+    if router is None:
+        raise SystemExit(f"No [sharding] shards configured in {args.secrets}")
+
+    conn = mysql.connector.connect(**config)
+    try:
+        if args.command == "init":
+            split_database(conn, router)
+        for shard, counts in shard_status(conn, router).items():
+            print(f"{shard:<24} " + "  ".join(f"{table} {rows:,}" for table, rows in counts.items()))
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Mergeable quantile sketches (t-digest) for runs and wickets.
+
+One digest per metric is kept overall, per format and per tournament.
+Each digest holds an exact count/sum/min/max plus at most a few hundred
+weighted centroids, so averages are exact and percentile thresholds
+(median, top 10%, ...) are an interpolation over a small array instead of
+a full scan.  New performances are added as they are written; an edited
+performance takes its old values back out of the digests it fed (count
+and sum stay exact, quantiles approximate) and adds the new ones.
+
+Digests serialize to a few kilobytes of little-endian float64s for
+storage in the ``performance_sketch`` table.
+"""
+
+import math
+import struct
+import threading
+
+import numpy as np
+
+
+METRICS = ("runs_scored", "wickets_taken")
+
+# dimension -> column it is keyed by (None: a single overall digest)
+DIMENSIONS = {"all": None, "format": "format", "tournament": "tournament_id"}
+
+# Column order of the rows passed to SketchSet.add()/rebuild()
+COLUMNS = ["performance_id", "format", "tournament_id"] + list(METRICS)
+
+_HEADER = struct.Struct("<4sdddddI")
+_MAGIC = b"TDG1"
+
+
+class TDigest:
+    """Merging t-digest (k1 scale function) with exact count, sum, min and max"""
+
+    def __init__(self, compression=100.0):
+        self.compression = float(compression)
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0.0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __len__(self):
+        return int(self.count)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def _k(self, q):
+        return self.compression / (2 * math.pi) * math.asin(2 * q - 1)
+
+    def _q(self, k):
+        return (math.sin(2 * math.pi * k / self.compression) + 1) / 2
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+
+        merged_means, merged_weights = [], []
+        current_mean, current_weight = float(means[0]), float(weights[0])
+        done = 0.0
+        q_limit = self._q(self._k(0.0) + 1)
+        for mean, weight in zip(means[1:].tolist(), weights[1:].tolist()):
+            if (done + current_weight + weight) / total <= q_limit:
+                current_weight += weight
+                current_mean += (mean - current_mean) * weight / current_weight
+            else:
+                merged_means.append(current_mean)
+                merged_weights.append(current_weight)
+                done += current_weight
+                q_limit = self._q(self._k(min(done / total, 1.0)) + 1)
+                current_mean, current_weight = mean, weight
+        merged_means.append(current_mean)
+        merged_weights.append(current_weight)
+
+        self.means = np.array(merged_means)
+        self.weights = np.array(merged_weights)
+
+    def add(self, values):
+        """Add a batch of observations"""
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        # Runs and wickets repeat a lot: one centroid per distinct value first
+        distinct, counts = np.unique(values, return_counts=True)
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.min = min(self.min, float(distinct[0]))
+        self.max = max(self.max, float(distinct[-1]))
+        self._compress(np.concatenate([self.means, distinct]),
+                       np.concatenate([self.weights, counts.astype(float)]))
+
+    def remove(self, values):
+        """
+        Take observations back out (an edited row's old values).  Each value
+        leaves the centroid nearest to it, so count and sum stay exact and
+        quantiles approximate; min and max remain outer bounds.
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        means, weights = self.means.copy(), self.weights.copy()
+        for value in values.tolist():
+            live = np.flatnonzero(weights > 0)
+            if not len(live):
+                break
+            i = live[np.argmin(np.abs(means[live] - value))]
+            taken = min(1.0, weights[i])
+            remaining = weights[i] - taken
+            if remaining > 0:
+                means[i] = min(max((means[i] * weights[i] - value * taken) / remaining, self.min), self.max)
+            weights[i] = remaining
+            self.count -= taken
+            self.total -= value * taken
+
+        keep = weights > 0
+        order = np.argsort(means[keep], kind="stable")
+        self.means, self.weights = means[keep][order], weights[keep][order]
+        if not len(self.weights):
+            self.count, self.total, self.min, self.max = 0.0, 0.0, math.inf, -math.inf
+
+    def merge(self, other):
+        """Fold another digest into this one"""
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+
+    def quantile(self, q):
+        """Estimated value below which a fraction q of observations fall"""
+        if not self.count:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        centres = np.cumsum(self.weights) - self.weights / 2
+        return float(np.interp(q * self.count,
+                               np.concatenate([[0.0], centres, [self.count]]),
+                               np.concatenate([[self.min], self.means, [self.max]])))
+
+    def cdf(self, value):
+        """Estimated fraction of observations at or below value"""
+        if not self.count:
+            return None
+        centres = np.cumsum(self.weights) - self.weights / 2
+        return float(np.interp(value,
+                               np.concatenate([[self.min], self.means, [self.max]]),
+                               np.concatenate([[0.0], centres, [self.count]]))) / self.count
+
+    def to_bytes(self):
+        header = _HEADER.pack(_MAGIC, self.compression, self.count, self.total,
+                              self.min, self.max, len(self.means))
+        return header + np.concatenate([self.means, self.weights]).astype("<f8").tobytes()
+
+    @classmethod
+    def from_bytes(cls, blob):
+        magic, compression, count, total, low, high, size = _HEADER.unpack_from(blob)
+        if magic != _MAGIC:
+            raise ValueError("Not a serialized TDigest")
+        digest = cls(compression)
+        digest.count, digest.total, digest.min, digest.max = count, total, low, high
+        centroids = np.frombuffer(blob, dtype="<f8", offset=_HEADER.size, count=2 * size)
+        digest.means, digest.weights = centroids[:size].copy(), centroids[size:].copy()
+        return digest
+
+
+class SketchSet:
+    """Digests per (dimension, key, metric) fed from performance rows (thread-safe)"""
+
+    def __init__(self, compression=100.0):
+        self.compression = compression
+        self.digests = {}
+        self.high_water = 0
+        self.rows = 0
+        # Opaque marker set by whoever keeps the sketches in sync with the database
+        self.synced = None
+        # Digests changed since they were last stored, and whether the stored set is obsolete
+        self.changed = set()
+        self.rebuilt = False
+        self.lock = threading.Lock()
+
+    def get(self, metric, dimension="all", key="all"):
+        """The digest for one metric and group (an empty digest if unseen)"""
+        digest = self.digests.get((dimension, str(key), metric))
+        return digest if digest is not None else TDigest(self.compression)
+
+    def keys(self, dimension):
+        """Group keys seen for a dimension"""
+        return sorted({key for dim, key, _ in self.digests if dim == dimension})
+
+    @staticmethod
+    def _columns(columns):
+        return {name: np.asarray(columns.get(name, ()), dtype=object) for name in COLUMNS}
+
+    @staticmethod
+    def _feeds(rows):
+        """{(dimension, key, metric): values} for the digests a batch of rows feeds"""
+        feeds = {}
+        for dimension, column in DIMENSIONS.items():
+            if column is None:
+                keys = np.full(len(rows["performance_id"]), "all", dtype=object)
+            else:
+                # Rows without a key (e.g. a match outside any tournament) only count overall
+                keys = np.array([None if value is None else str(value) for value in rows[column]],
+                                dtype=object)
+            for key in {key for key in keys if key is not None}:
+                selected = keys == key
+                for metric in METRICS:
+                    feeds[(dimension, str(key), metric)] = rows[metric][selected].astype(float)
+        return feeds
+
+    def add(self, columns):
+        """
+        Add performance rows ({column: values}); returns the digest keys touched.
+
+        Rows at or below the high-water mark are ignored, so two sessions
+        appending the same new rows cannot count them twice.
+        """
+        rows = self._columns(columns)
+
+        with self.lock:
+            fresh = rows["performance_id"].astype(np.int64) > self.high_water
+            rows = {name: values[fresh] for name, values in rows.items()}
+            if not len(rows["performance_id"]):
+                return set()
+            feeds = self._feeds(rows)
+            for name, values in feeds.items():
+                self.digests.setdefault(name, TDigest(self.compression)).add(values)
+            self.high_water = max(self.high_water, int(rows["performance_id"].max()))
+            self.rows += len(rows["performance_id"])
+            self.changed.update(feeds)
+        return set(feeds)
+
+    def replace(self, old, new):
+        """
+        Apply edits to rows already added: `old` ({column: values}) comes
+        out of the digests it fed and `new` goes in.  Returns the digest
+        keys touched.
+        """
+        old_feeds, new_feeds = self._feeds(self._columns(old)), self._feeds(self._columns(new))
+        with self.lock:
+            for name, values in old_feeds.items():
+                if name in self.digests:
+                    self.digests[name].remove(values)
+                    self.changed.add(name)
+            for name, values in new_feeds.items():
+                self.digests.setdefault(name, TDigest(self.compression)).add(values)
+            self.changed.update(new_feeds)
+        return set(old_feeds) | set(new_feeds)
+
+    def rebuild(self, columns):
+        """Replace everything with digests of a full performance history"""
+        with self.lock:
+            self.digests = {}
+            self.high_water = 0
+            self.rows = 0
+            self.changed = set()
+            self.rebuilt = True
+        return self.add(columns)
+
+    def load(self, stored):
+        """Restore from (dimension, dim_key, metric, digest blob, high_water, row_count) rows"""
+        with self.lock:
+            self.digests = {}
+            self.high_water = 0
+            self.rows = 0
+            self.changed = set()
+            self.rebuilt = False
+            for dimension, key, metric, blob, high_water, rows in stored:
+                self.digests[(dimension, key, metric)] = TDigest.from_bytes(bytes(blob))
+                # Every write touches the overall digests, so the newest row carries the true marks
+                if int(high_water) >= self.high_water:
+                    self.high_water, self.rows = int(high_water), int(rows)
+
+    def dump(self, names=None):
+        """Rows for the performance_sketch table (all digests, or only `names`)"""
+        with self.lock:
+            return self._rows(self.digests.keys() if names is None else names)
+
+    def take_changes(self):
+        """
+        (replace_all, rows) to bring the performance_sketch table up to
+        date: every digest after a rebuild (replace_all), otherwise only
+        those changed since the last call.
+        """
+        with self.lock:
+            replace_all = self.rebuilt
+            rows = self._rows(self.digests.keys() if replace_all else self.changed)
+            self.changed = set()
+            self.rebuilt = False
+        return replace_all, rows
+
+    def keep_changes(self, replace_all, rows):
+        """Hand back changes from take_changes() that could not be stored"""
+        with self.lock:
+            self.rebuilt = self.rebuilt or replace_all
+            self.changed.update(tuple(row[:3]) for row in rows)
+
+    def _rows(self, names):
+        return [(dimension, key, metric, self.digests[(dimension, key, metric)].to_bytes(),
+                 self.high_water, self.rows)
+                for dimension, key, metric in names]
@@ -0,0 +1,319 @@
+"""
+Offline analytics snapshots.
+
+Each table (plus the denormalized performance join) is exported to an
+Arrow IPC file.  Readers open the files with ``pa.memory_map`` so column
+buffers are used in place without copying into Python memory; the
+aggregate, join and nested analyses then run on Arrow compute kernels and
+never touch MySQL.
+
+Each export goes into a new version directory; ``manifest.json`` names the
+current one and is swapped in with ``os.replace`` only once every file is
+complete.  Files that readers have mapped are therefore never rewritten,
+and a reader never sees a half-written snapshot.  The version before the
+current one is kept for a reader that has read the old manifest but not
+yet mapped its files; older ones are removed.
+
+Snapshots are written uncompressed by default because only uncompressed
+IPC buffers can be memory-mapped zero-copy.  ``compression="zstd"`` (or
+``"lz4"``) gives much smaller files for archiving or shipping to another
+machine, at the cost of decompressing on read.
+
+Command line (reads connection settings from .streamlit/secrets.toml):
+
+    python -m cricketdb.snapshots export --out snapshots [--compression zstd]
+"""
+
+import argparse
+import json
+import os
+import shutil
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+TABLES = [
+    "team", "role", "player", "tournament", "trainer",
+    "matches", "player_performance", "award", "played_in"
+]
+
+DENORMALIZED = {
+    "performance_details": """
+        SELECT pp.performance_id, pp.player_id, CONCAT(p.f_name, ' ', p.l_name) AS player_name,
+               t.team_id, t.team_name, r.role_name, pp.match_id, m.date_of_match, m.location,
+               m.tournament_id, pp.runs_scored, pp.wickets_taken, pp.format, pp.avg
+        FROM player_performance pp
+        JOIN player p ON pp.player_id = p.player_id
+        JOIN team t ON p.team_id = t.team_id
+        JOIN role r ON p.role_id = r.role_id
+        JOIN matches m ON pp.match_id = m.match_id
+    """
+}
+
+MANIFEST = "manifest.json"
+BATCH_ROWS = 50000
+VERSION_PREFIX = "v"
+
+# Precision and scale of DECIMAL columns (the protocol does not report them)
+DECIMAL_COLUMNS_QUERY = """SELECT COLUMN_NAME, NUMERIC_PRECISION, NUMERIC_SCALE
+                           FROM information_schema.COLUMNS
+                           WHERE TABLE_SCHEMA = DATABASE() AND DATA_TYPE = 'decimal'"""
+BINARY_CHARSET = 63
+
+
+def load_mysql_config(secrets_path=".streamlit/secrets.toml"):
+    """Read the [mysql] section of the Streamlit secrets file"""
+    try:
+        import tomllib
+        with open(secrets_path, "rb") as f:
+            return tomllib.load(f)["mysql"]
+    except ImportError:
+        import toml
+        return toml.load(secrets_path)["mysql"]
+
+
+def decimal_columns(conn):
+    """
+    Column name -> Arrow decimal type wide enough for every DECIMAL column
+    of that name in the database
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(DECIMAL_COLUMNS_QUERY)
+        widths = {}
+        for name, precision, scale in cursor.fetchall():
+            digits, places = widths.get(name, (0, 0))
+            widths[name] = (max(digits, precision - scale), max(places, scale))
+    finally:
+        cursor.close()
+    return {name: pa.decimal128(digits + places, places) for name, (digits, places) in widths.items()}
+
+
+def arrow_schema(description, decimals):
+    """
+    Arrow schema of a result set from its cursor.description, so a column
+    that happens to be all NULL in the first batch still gets its real type
+    """
+    from mysql.connector.constants import FieldFlag, FieldType
+
+    integers = {FieldType.TINY, FieldType.SHORT, FieldType.INT24, FieldType.LONG,
+                FieldType.LONGLONG, FieldType.YEAR, FieldType.BIT}
+    texts = {FieldType.VARCHAR, FieldType.VAR_STRING, FieldType.STRING, FieldType.TINY_BLOB,
+             FieldType.MEDIUM_BLOB, FieldType.LONG_BLOB, FieldType.BLOB}
+    fields = []
+    for name, type_code, *_, flags, charset in description:
+        if type_code in integers:
+            unsigned = type_code == FieldType.LONGLONG and flags & FieldFlag.UNSIGNED
+            arrow_type = pa.uint64() if unsigned else pa.int64()
+        elif type_code in (FieldType.FLOAT, FieldType.DOUBLE):
+            arrow_type = pa.float64()
+        elif type_code in (FieldType.DECIMAL, FieldType.NEWDECIMAL):
+            # Computed columns have no definition: MySQL's widest DECIMAL(65,30)
+            arrow_type = decimals.get(name, pa.decimal256(65, 30))
+        elif type_code in (FieldType.DATE, FieldType.NEWDATE):
+            arrow_type = pa.date32()
+        elif type_code in (FieldType.DATETIME, FieldType.TIMESTAMP):
+            arrow_type = pa.timestamp("us")
+        elif type_code == FieldType.TIME:
+            arrow_type = pa.duration("us")
+        elif type_code in texts and charset == BINARY_CHARSET:
+            arrow_type = pa.binary()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _export_query(conn, query, path, compression, decimals):
+    """Stream one result set into an Arrow IPC file; returns the row count"""
+    cursor = conn.cursor()
+    cursor.execute(query)
+    schema = arrow_schema(cursor.description, decimals)
+
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    rows_written = 0
+    try:
+        with pa.ipc.new_file(path, schema, options=options) as writer:
+            while True:
+                rows = cursor.fetchmany(BATCH_ROWS)
+                if not rows:
+                    break
+                writer.write_batch(pa.RecordBatch.from_pydict(dict(zip(schema.names, zip(*rows))),
+                                                              schema=schema))
+                rows_written += len(rows)
+    finally:
+        cursor.close()
+    return rows_written
+
+
+def _write_manifest(out_dir, manifest):
+    """Publish a manifest atomically (readers see the old one or the new one)"""
+    staging = os.path.join(out_dir, f".{MANIFEST}.{os.getpid()}")
+    with open(staging, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(staging, os.path.join(out_dir, MANIFEST))
+
+
+def _prune_versions(out_dir, previous):
+    """Remove version directories older than the one just replaced"""
+    if previous is None:
+        return
+    for entry in os.listdir(out_dir):
+        if entry.startswith(VERSION_PREFIX) and entry < previous:
+            shutil.rmtree(os.path.join(out_dir, entry), ignore_errors=True)
+
+
+def export_snapshots(conn, out_dir, compression=None):
+    """Export every table and the denormalized views as a new version; returns the manifest"""
+    os.makedirs(out_dir, exist_ok=True)
+    exported_at = datetime.now()
+    # Sorts by export time; the pid keeps concurrent exports apart
+    version = f"{VERSION_PREFIX}{exported_at:%Y%m%d-%H%M%S-%f}-{os.getpid()}"
+    version_dir = os.path.join(out_dir, version)
+    os.makedirs(version_dir)
+
+    manifest = {
+        "exported_at": exported_at.isoformat(timespec="seconds"),
+        "compression": compression,
+        "version": version,
+        "tables": {}
+    }
+
+    queries = {table: f"SELECT * FROM {table}" for table in TABLES}
+    queries.update(DENORMALIZED)
+
+    try:
+        decimals = decimal_columns(conn)
+        for name, query in queries.items():
+            path = os.path.join(version_dir, f"{name}.arrow")
+            manifest["tables"][name] = _export_query(conn, query, path, compression, decimals)
+    except BaseException:
+        shutil.rmtree(version_dir, ignore_errors=True)
+        raise
+
+    previous = None
+    try:
+        with open(os.path.join(out_dir, MANIFEST)) as f:
+            previous = json.load(f).get("version")
+    except (OSError, ValueError):
+        pass
+    _write_manifest(out_dir, manifest)
+    _prune_versions(out_dir, previous)
+    return manifest
+
+
+class SnapshotStore:
+    """Memory-mapped, read-only view of an exported snapshot directory"""
+
+    def __init__(self, snapshot_dir):
+        self.snapshot_dir = snapshot_dir
+        with open(os.path.join(snapshot_dir, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        # Snapshots exported before versioning keep their files beside the manifest
+        data_dir = os.path.join(snapshot_dir, self.manifest.get("version", ""))
+        # Map every file now: a mapping stays valid after a later export prunes the files
+        self._sources = {name: pa.memory_map(os.path.join(data_dir, f"{name}.arrow"), "r")
+                         for name in self.manifest["tables"]}
+        self._tables = {}
+
+    def table(self, name):
+        if name not in self._tables:
+            self._tables[name] = pa.ipc.open_file(self._sources[name]).read_all()
+        return self._tables[name]
+
+    # Offline versions of the Advanced Queries
+
+    def nested_query(self):
+        """Performances scoring above the overall average (players above average)"""
+        details = self.table("performance_details")
+        avg_runs = pc.mean(details["runs_scored"]).as_py()
+        if avg_runs is None:
+            return details.slice(0, 0), None
+        above = details.filter(pc.greater(details["runs_scored"], avg_runs))
+        result = above.select(["player_id", "player_name", "team_name", "runs_scored", "format"])
+        return result.sort_by([("runs_scored", "descending")]), avg_runs
+
+    def join_query(self):
+        """Player performance details (player x team x role x performance x match)"""
+        performance = self.table("player_performance").select(
+            ["player_id", "match_id", "runs_scored", "wickets_taken", "format"])
+        player = self.table("player").select(["player_id", "f_name", "l_name", "team_id", "role_id"])
+        team = self.table("team").select(["team_id", "team_name"])
+        role = self.table("role").select(["role_id", "role_name"])
+        matches = self.table("matches").select(["match_id", "date_of_match", "location"])
+
+        joined = (performance
+                  .join(player, "player_id")
+                  .join(team, "team_id")
+                  .join(role, "role_id")
+                  .join(matches, "match_id"))
+        player_name = pc.binary_join_element_wise(joined["f_name"], joined["l_name"], " ")
+        joined = joined.append_column("player_name", player_name)
+
+        result = joined.select(["player_name", "team_name", "role_name", "runs_scored",
+                                "wickets_taken", "format", "date_of_match", "location"])
+        return result.sort_by([("runs_scored", "descending"), ("wickets_taken", "descending")])
+
+    def aggregate_query(self):
+        """Team statistics (players, wins/losses over performances, runs, wickets)"""
+        team = self.table("team").select(["team_id", "team_name"])
+        player = self.table("player").select(["player_id", "team_id"])
+        performance = self.table("player_performance").select(
+            ["player_id", "match_id", "runs_scored", "wickets_taken"])
+        matches = self.table("matches").select(["match_id", "winning_team_id", "losing_team_id"])
+
+        players = player.group_by("team_id").aggregate([("player_id", "count_distinct")])
+        players = players.rename_columns(["team_id", "total_players"])
+
+        rows = performance.join(player, "player_id").join(matches, "match_id")
+        rows = rows.append_column(
+            "won", pc.cast(pc.equal(rows["winning_team_id"], rows["team_id"]), pa.int64()))
+        rows = rows.append_column(
+            "lost", pc.cast(pc.equal(rows["losing_team_id"], rows["team_id"]), pa.int64()))
+        stats = rows.group_by("team_id").aggregate([
+            ("won", "sum"), ("lost", "sum"), ("runs_scored", "sum"),
+            ("wickets_taken", "sum"), ("runs_scored", "mean")
+        ]).rename_columns(["team_id", "matches_won", "matches_lost", "total_runs",
+                           "total_wickets", "avg_runs_per_match"])
+
+        result = team.join(players, "team_id", join_type="left outer") \
+                     .join(stats, "team_id", join_type="left outer")
+        # Teams without players/performances get zeros, as COALESCE does online
+        columns = {"team_name": result["team_name"]}
+        for name in ["total_players", "matches_won", "matches_lost",
+                     "total_runs", "total_wickets", "avg_runs_per_match"]:
+            columns[name] = pc.fill_null(result[name], 0)
+        return pa.table(columns).sort_by([("matches_won", "descending")])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export CricketDB analytics snapshots")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="Export all tables to Arrow IPC files")
+    export.add_argument("--out", default="snapshots", help="Output directory")
+    export.add_argument("--compression", choices=["zstd", "lz4"], default=None,
+                        help="Compress buffers (disables zero-copy memory mapping)")
+    export.add_argument("--secrets", default=".streamlit/secrets.toml",
+                        help="Streamlit secrets file with a [mysql] section")
+    args = parser.parse_args()
+
+    import mysql.connector
+
+    conn = mysql.connector.connect(**load_mysql_config(args.secrets))
+    try:
+        manifest = export_snapshots(conn, args.out, args.compression)
+    finally:
+        conn.close()
+
+    for name, count in manifest["tables"].items():
+        print(f"{name:<22} {count:>10} rows")
+    print(f"Snapshot written to {args.out} at {manifest['exported_at']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Login throttling shared by every session in the process.
+
+Each username and each client address gets a token bucket; an attempt
+costs one token from both and is rejected when either is empty.  Credential
+pairs that just failed are remembered for a short time (negative cache),
+so hammering the same wrong password is answered from memory.
+
+User buckets, client buckets and failures live in separate LRU-bounded
+stores, so a flood of random usernames cannot grow them without limit or
+push client limits out.  Eviction prefers buckets that have refilled
+(losing those changes nothing), so a flood also does not easily reset a
+drained bucket.  A client whose address is unknown (None) is only limited
+per username.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+
+
+class TokenBucket:
+    """Classic token bucket: `capacity` burst, refilled at `rate` tokens/second"""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity, rate, now):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self.updated = now
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def is_full(self, now):
+        """True once refilled to capacity (indistinguishable from a new bucket)"""
+        return self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+    def retry_after(self):
+        """Seconds until one token is available"""
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class LRUStore:
+    """
+    Bounded mapping that evicts the least recently used entry.  With an
+    `idle` predicate the least recently used idle entry among the `scan`
+    oldest goes first.
+    """
+
+    def __init__(self, max_entries, idle=None, scan=64):
+        self.max_entries = max_entries
+        self.idle = idle
+        self.scan = scan
+        self.items = OrderedDict()
+
+    def get(self, key):
+        value = self.items.get(key)
+        if value is not None:
+            self.items.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.items[key] = value
+        self.items.move_to_end(key)
+        while len(self.items) > self.max_entries:
+            self._evict()
+
+    def _evict(self):
+        if self.idle is not None:
+            # Never the entry just put (a new bucket is full, hence idle)
+            for key, value in islice(self.items.items(), min(self.scan, len(self.items) - 1)):
+                if self.idle(value):
+                    del self.items[key]
+                    return
+        self.items.popitem(last=False)
+
+    def pop(self, key):
+        self.items.pop(key, None)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class LoginThrottle:
+    """Per-username and per-client rate limits plus a negative cache"""
+
+    def __init__(self, user_burst=5, user_per_minute=1.0, client_burst=30, client_per_minute=10.0,
+                 negative_ttl=30.0, max_entries=10000, clock=time.monotonic):
+        self.user_burst = user_burst
+        self.user_rate = user_per_minute / 60.0
+        self.client_burst = client_burst
+        self.client_rate = client_per_minute / 60.0
+        self.negative_ttl = negative_ttl
+        self.clock = clock
+        self.user_buckets = LRUStore(max_entries, idle=self._idle)
+        self.client_buckets = LRUStore(max_entries, idle=self._idle)
+        self.failures = LRUStore(max_entries)
+        self.lock = threading.Lock()
+
+    def _idle(self, bucket):
+        return bucket.is_full(self.clock())
+
+    @staticmethod
+    def _bucket(store, key, capacity, rate, now):
+        bucket = store.get(key)
+        if bucket is None:
+            bucket = TokenBucket(capacity, rate, now)
+            store.put(key, bucket)
+        else:
+            bucket.refill(now)
+        return bucket
+
+    def check(self, username, client, credential):
+        """
+        Decide whether an attempt may reach the database.
+
+        Returns (allowed, retry_after_seconds).  `client` is the client
+        address, or None when it is unknown.  `credential` is any hashable
+        digest of the username/password pair.
+        """
+        now = self.clock()
+        with self.lock:
+            buckets = [self._bucket(self.user_buckets, username, self.user_burst, self.user_rate, now)]
+            if client is not None:
+                buckets.append(self._bucket(self.client_buckets, client,
+                                            self.client_burst, self.client_rate, now))
+
+            if any(bucket.tokens < 1 for bucket in buckets):
+                return False, max(bucket.retry_after() for bucket in buckets)
+
+            for bucket in buckets:
+                bucket.tokens -= 1
+
+            expires = self.failures.get(credential)
+            if expires is not None:
+                if expires > now:
+                    return False, expires - now
+                self.failures.pop(credential)
+
+            return True, 0.0
+
+    def record_failure(self, credential):
+        """Remember a rejected credential pair for negative_ttl seconds"""
+        with self.lock:
+            self.failures.put(credential, self.clock() + self.negative_ttl)
+
+    def record_success(self, username):
+        """A good login restores the user's full allowance"""
+        with self.lock:
+            self.user_buckets.pop(username)
+
+
+def forwarded_client(headers, hops):
+    """
+    Client address as recorded by the outermost of `hops` trusted proxies:
+    each proxy appends the address it saw to X-Forwarded-For, so entries
+    further left were supplied by the client and cannot be trusted.
+    """
+    forwarded = [address.strip() for address in headers.get("X-Forwarded-For", "").split(",")
+                 if address.strip()]
+    if forwarded:
+        return forwarded[-min(hops, len(forwarded))]
+    return headers.get("X-Real-Ip") or None
@@ -0,0 +1,117 @@
+"""
+Lightweight trace spans: page -> connection/query.
+
+A page render opens a root span with ``trace()``; database helpers open
+child spans with ``span()``.  The current span lives in a context
+variable, so nesting follows the call stack of the script thread and
+concurrent sessions never mix their spans.  Outside a trace (or with
+tracing switched off) ``span()`` records nothing and costs one context
+variable lookup.
+
+Finished traces are kept in a small ring buffer for the metrics endpoint
+and the sidebar breakdown.
+"""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+_current = contextvars.ContextVar("cricketdb_span", default=None)
+_lock = threading.Lock()
+_finished = deque(maxlen=50)
+_enabled = False
+
+
+class Span:
+    """One timed operation and the spans opened inside it"""
+
+    __slots__ = ("name", "attributes", "started_at", "start", "end", "children")
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = dict(attributes)
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.end = None
+        self.children = []
+
+    @property
+    def duration(self):
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "attributes": self.attributes,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3),
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def enabled():
+    return _enabled
+
+
+@contextmanager
+def trace(name, **attributes):
+    """Root span; yields None when tracing is off"""
+    if not _enabled:
+        yield None
+        return
+    root = Span(name, attributes)
+    token = _current.set(root)
+    try:
+        yield root
+    except BaseException as e:
+        root.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        root.end = time.perf_counter()
+        _current.reset(token)
+        with _lock:
+            _finished.append(root)
+
+
+@contextmanager
+def span(name, **attributes):
+    """Child of the current span; yields None outside a trace"""
+    parent = _current.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(name, attributes)
+    parent.children.append(child)
+    token = _current.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        child.end = time.perf_counter()
+        _current.reset(token)
+
+
+def recent(limit=None):
+    """Finished root spans, newest first"""
+    with _lock:
+        traces = list(reversed(_finished))
+    return traces[:limit] if limit else traces
+
+
+def format_tree(root, depth=0):
+    """Indented text lines: name, duration and attributes of every span"""
+    details = " ".join(f"{key}={value}" for key, value in root.attributes.items())
+    lines = [f"{'  ' * depth}{root.name:<{max(1, 12 - 2 * depth)}} {root.duration * 1000:8.1f} ms  {details}".rstrip()]
+    for child in root.children:
+        lines.extend(format_tree(child, depth + 1))
+    return lines
@@ -0,0 +1,85 @@
+"""
+Process-wide table versions used to invalidate cached results.
+
+Every write that goes through ``execute_query`` bumps the version of the
+table it touches.  Cached loaders take the versions of the tables they read
+as part of their cache key, so a write anywhere in the process makes the
+next read reload fresh data.
+"""
+
+import re
+import threading
+
+
+_lock = threading.Lock()
+_versions = {}
+_rewrite_versions = {}
+
+# Triggers write to other tables behind our back
+SIDE_EFFECTS = {
+    "player_performance": ("player",),
+}
+
+_WRITE_RE = re.compile(
+    r"^\s*(INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)`?",
+    re.IGNORECASE
+)
+
+
+def written_table(query):
+    """Return the table a DML statement writes to, or None"""
+    match = _WRITE_RE.match(query)
+    return match.group(2).lower() if match else None
+
+
+def is_rewrite(query):
+    """True for statements that change or remove existing rows (not plain inserts)"""
+    match = _WRITE_RE.match(query)
+    return bool(match) and not match.group(1).upper().startswith("INSERT")
+
+
+def bump(*tables, rewrite=False):
+    """
+    Mark tables (and the tables their triggers touch) as changed.
+
+    rewrite=True additionally bumps the rewrite version, which append-only
+    caches use to tell "new rows arrived" from "existing rows changed".
+    """
+    with _lock:
+        for table in tables:
+            if not table:
+                continue
+            for name in (table,) + SIDE_EFFECTS.get(table, ()):
+                _versions[name] = _versions.get(name, 0) + 1
+                if rewrite:
+                    _rewrite_versions[name] = _rewrite_versions.get(name, 0) + 1
+
+
+def version(*tables):
+    """Current version tuple for a set of tables (use as a cache key)"""
+    with _lock:
+        return tuple(_versions.get(table, 0) for table in tables)
+
+
+def advanced(before, tables, *written):
+    """
+    The version tuple of `tables` that bump(*written) turns `before` into:
+    a cache refreshed by its own write may keep its entry only if the
+    current version equals this (nobody else wrote meanwhile).
+    """
+    bumps = {}
+    for table in written:
+        for name in (table,) + SIDE_EFFECTS.get(table, ()):
+            bumps[name] = bumps.get(name, 0) + 1
+    return tuple(v + bumps.get(table, 0) for v, table in zip(before, tables))
+
+
+def rewrite_version(*tables):
+    """Version tuple counting only updates/deletes/replaces"""
+    with _lock:
+        return tuple(_rewrite_versions.get(table, 0) for table in tables)
+
+
+def bump_for(query):
+    """Bump whatever table a DML statement wrote to"""
+    bump(written_table(query), rewrite=is_rewrite(query))
@@ -0,0 +1,616 @@
+"""
+Cricket Database Management System - database access
+
+Connection handling and the query helpers every page uses.  Kept free of
+pandas/plotly so the login page can import it cheaply.
+"""
+
+import contextvars
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+import mysql.connector
+from mysql.connector import Error, errorcode
+from mysql.connector import pooling
+from mysql.connector.errors import IntegrityError, PoolError
+
+from cricketdb import metrics, tracing, versions
+from cricketdb.executor import (Executor, CircuitOpenError, QueryCancelled, QUERY_TIMEOUT,
+                                is_transient, run_cancellable_many)
+from cricketdb.prepared import StatementRegistry
+from cricketdb.sharding import ShardRouter, LOCATE_MATCH, SEQUENCE_ALLOCATE
+
+
+POOL_SIZE = 8
+PREPARED_POOL_SIZE = 4
+SHARD_POOL_SIZE = 4
+
+
+# DATABASE CONNECTION
+def connection_config():
+    """MySQL connection settings from Streamlit secrets"""
+    return {
+        "host": st.secrets["mysql"]["host"],
+        "port": st.secrets["mysql"]["port"],
+        "database": st.secrets["mysql"]["database"],
+        "user": st.secrets["mysql"]["user"],
+        "password": st.secrets["mysql"]["password"]
+    }
+
+
+@st.cache_resource
+def get_pool():
+    """Process-wide MySQL connection pool"""
+    return pooling.MySQLConnectionPool(pool_name="cricketdb", pool_size=POOL_SIZE, **connection_config())
+
+
+@st.cache_resource
+def get_prepared_pool():
+    """
+    Pool for registered prepared statements.  Sessions are not reset on
+    return (a reset would deallocate the statements), and autocommit is on
+    so no read snapshot outlives a call.
+    """
+    return pooling.MySQLConnectionPool(pool_name="cricketdb_prepared", pool_size=PREPARED_POOL_SIZE,
+                                       pool_reset_session=False, autocommit=True, **connection_config())
+
+
+@st.cache_resource
+def get_statement_registry():
+    """Process-wide named hot statements and their prepared cursors"""
+    return StatementRegistry()
+
+
+@st.cache_resource
+def get_executor():
+    """Process-wide executor: time budgets, read retries and the circuit breaker"""
+    return Executor()
+
+
+@st.cache_resource
+def get_router():
+    """Tournament shard router, or None unless secrets have a [sharding] section"""
+    try:
+        config = st.secrets.get("sharding", {})
+    except FileNotFoundError:
+        return None
+    return ShardRouter.from_config(st.secrets["mysql"]["database"], config)
+
+
+@st.cache_resource
+def get_shard_pools():
+    """One pool per shard schema, for reads routed to a shard"""
+    return {shard: pooling.MySQLConnectionPool(pool_name=f"cricketdb_{shard}", pool_size=SHARD_POOL_SIZE,
+                                               **{**connection_config(), "database": shard})
+            for shard in get_router().shards}
+
+
+@st.cache_resource
+def get_fan_out_pool():
+    """Threads running one fanned-out read per shard"""
+    return ThreadPoolExecutor(max_workers=2 * SHARD_POOL_SIZE, thread_name_prefix="cricketdb-shard")
+
+
+@st.cache_resource
+def start_metrics_endpoint():
+    """
+    Serve /metrics and /traces when secrets have a [metrics] section:
+
+        [metrics]
+        port = 9464          # endpoint for the local scraper
+        host = "127.0.0.1"
+        trace = true         # record page -> query spans
+
+    Returns the HTTP server, or None when not configured.
+    """
+    try:
+        config = st.secrets.get("metrics", {})
+    except FileNotFoundError:
+        return None
+    tracing.set_enabled(config.get("trace", False))
+    if "port" not in config:
+        return None
+    try:
+        return metrics.serve(int(config["port"]), config.get("host", "127.0.0.1"))
+    except OSError as e:
+        # Another app process already owns the port; keep serving pages
+        print(f"cricketdb: metrics endpoint not started: {e}", file=sys.stderr)
+        return None
+
+
+def _acquire(get_pool_fn, **direct_options):
+    """
+    Connection from a pool, else a dedicated one when every pooled
+    connection is busy.  The wait is recorded per pool for /metrics.
+    """
+    with tracing.span("connect") as span:
+        start = time.perf_counter()
+        try:
+            pool = get_pool_fn()
+            conn, source = pool.get_connection(), pool.pool_name
+        except PoolError:
+            conn, source = mysql.connector.connect(**{**connection_config(), **direct_options}), "direct"
+        metrics.CONNECTION_SECONDS.observe(time.perf_counter() - start, pool=source)
+        if span is not None:
+            span.attributes["pool"] = source
+        return conn
+
+
+def _connect():
+    """Pooled connection; raises on failure (the executor decides what to do)"""
+    return _acquire(get_pool)
+
+
+def _shard_connect(shard):
+    """Pooled connection whose default schema is a shard"""
+    return _acquire(lambda: get_shard_pools()[shard], database=shard)
+
+
+def _release(conn):
+    """Hand a connection back to the pool, even if the server dropped it"""
+    try:
+        conn.close()
+    except Error:
+        pass
+
+
+def report_error(e, label="Query Error"):
+    """Show a database error, telling outages and timeouts apart from bad queries"""
+    if isinstance(e, CircuitOpenError):
+        st.error(f"🔌 {e.msg}")
+    elif e.errno == QUERY_TIMEOUT:
+        st.error("⏱️ Query stopped: it ran past its time budget")
+    elif is_transient(e):
+        st.error(f"🔌 Lost the database connection: {str(e)}")
+    else:
+        st.error(f"{label}: {str(e)}")
+
+
+def init_connection():
+    """Get a pooled MySQL connection (close() hands it back to the pool)"""
+    try:
+        return get_executor().run(_connect, retry=True)
+    except Error as e:
+        report_error(e, "Database Connection Error")
+        return None
+
+
+# QUERY ACCOUNTING
+def count_query():
+    """Count a statement against the current session (shown per page)"""
+    st.session_state.query_count = st.session_state.get('query_count', 0) + 1
+
+
+def query_count():
+    """Statements issued by this session so far"""
+    return st.session_state.get('query_count', 0)
+
+
+def session_frame(name, loader, *inputs, tables=()):
+    """
+    Session-scoped cache for a page's data-loading stage.
+
+    loader(*inputs) runs only when its DB-relevant inputs change or a
+    write bumped the version of one of `tables`; pure view controls
+    (sorting, client-side filters) never re-run it.  A None result (load
+    failed) is not cached.
+    """
+    frames = st.session_state.setdefault('session_frames', {})
+    key = (inputs, versions.version(*tables))
+    entry = frames.get(name)
+    if entry is None or entry[0] != key:
+        metrics.CACHE_REQUESTS.inc(cache=name, result="miss")
+        result = loader(*inputs)
+        if result is None:
+            return None
+        entry = (key, result)
+        frames[name] = entry
+    else:
+        metrics.CACHE_REQUESTS.inc(cache=name, result="hit")
+    return entry[1]
+
+
+# SHARD ROUTING
+def _read_shards(query, tournament, merge):
+    """Shards a read runs on, or None for the primary (whose views see every shard)"""
+    router = get_router()
+    if router is None or (tournament is None and merge is None) or not router.touches(query):
+        return None
+    return [router.shard_of(tournament)] if tournament is not None else router.shards
+
+
+def _fan_out(shards, read):
+    """read(conn) on every shard in parallel; returns the per-shard results in shard order"""
+    def run(shard):
+        conn = _shard_connect(shard)
+        try:
+            return read(conn)
+        finally:
+            _release(conn)
+
+    for _ in shards:
+        count_query()
+    if len(shards) == 1:
+        return [run(shards[0])]
+    # Each task keeps the page's trace context so its spans nest under the page
+    pool = get_fan_out_pool()
+    futures = [pool.submit(contextvars.copy_context().run, run, shard) for shard in shards]
+    return [future.result() for future in futures]
+
+
+def _allocate_keys(table, count):
+    """First of `count` new keys of a sharded table, from the primary's sequence"""
+    conn = _connect()
+    cursor = None
+    try:
+        count_query()
+        cursor = conn.cursor()
+        cursor.execute(SEQUENCE_ALLOCATE, (count, table))
+        cursor.execute("SELECT LAST_INSERT_ID()")
+        last_id = cursor.fetchone()[0]
+        conn.commit()
+        return last_id - count + 1
+    finally:
+        if cursor:
+            cursor.close()
+        _release(conn)
+
+
+def _plan_write(conn, query, params):
+    """
+    Statements to run on a primary connection for one DML statement (the
+    statement itself unless sharding moves it), plus the first key the
+    shard sequence allocated for it or None.
+    """
+    router = get_router()
+    if router is None:
+        return [(query, params)], None
+
+    def lookup(match_id):
+        count_query()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(LOCATE_MATCH, (match_id,))
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+        return row[0] if row else None
+
+    return router.plan_write(query, params, lookup, _allocate_keys)
+
+
+def match_relocation(match_id, from_tournament, to_tournament):
+    """
+    Statements moving a match and its rows to the shard of its new
+    tournament, to run in the same transaction as the update ([] when
+    sharding is off or both tournaments share a shard).
+    """
+    router = get_router()
+    if router is None:
+        return []
+    return router.relocation(match_id, router.shard_of(from_tournament), router.shard_of(to_tournament))
+
+
+# EXECUTE QUERY
+def execute_query(query, params=None, fetch=False, query_class="interactive", tournament=None, merge=None):
+    """
+    Execute SQL query with proper error handling.
+
+    Reads run under the MAX_EXECUTION_TIME budget of `query_class` and are
+    retried on connection errors; they return the rows ([] when there are
+    none) or None when the query failed.  Writes return True/False.
+
+    With sharding on, a read of match data given `tournament` runs on that
+    tournament's shard, and one given a `merge` (cricketdb.sharding.Merge)
+    runs on every shard in parallel and returns the merged rows.
+    """
+    executor = get_executor()
+    statement = executor.prepare(query, query_class) if fetch else query
+    name = metrics.statement_name(query)
+    shards = _read_shards(query, tournament, merge) if fetch else None
+
+    def read(conn):
+        cursor = conn.cursor(dictionary=True)
+        try:
+            with metrics.observe_statement(name) as observed:
+                if params:
+                    cursor.execute(statement, params)
+                else:
+                    cursor.execute(statement)
+                rows = cursor.fetchall()
+                observed["rows"] = len(rows)
+            return rows
+        finally:
+            cursor.close()
+
+    def run():
+        if shards is not None:
+            results = _fan_out(shards, read)
+            return merge.apply(results) if merge is not None else results[0]
+
+        conn = _connect()
+        cursor = None
+        try:
+            if fetch:
+                count_query()
+                return read(conn)
+            cursor = conn.cursor()
+            for routed, routed_params in _plan_write(conn, query, params)[0]:
+                count_query()
+                with metrics.observe_statement(name):
+                    if routed_params:
+                        cursor.execute(routed, routed_params)
+                    else:
+                        cursor.execute(routed)
+            conn.commit()
+            return True
+        finally:
+            if cursor:
+                cursor.close()
+            _release(conn)
+
+    try:
+        result = executor.run(run, retry=fetch)
+    except Error as e:
+        report_error(e)
+        return None if fetch else False
+
+    if not fetch:
+        versions.bump_for(query)
+    return result
+
+
+def fetch_columns(query, params=None):
+    """
+    Fetch a result set column-wise as {column: tuple} for the NumPy engines
+    (every column with an empty tuple when there are no rows), or None when
+    the query failed, so callers can tell a failure from an empty table.
+    """
+    def run():
+        conn = _connect()
+        cursor = None
+        try:
+            count_query()
+            with metrics.observe_statement(metrics.statement_name(query)) as observed:
+                cursor = conn.cursor()
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+
+                rows = cursor.fetchall()
+                observed["rows"] = len(rows)
+            names = cursor.column_names
+            if not rows:
+                return {name: () for name in names}
+            return dict(zip(names, zip(*rows)))
+        finally:
+            if cursor:
+                cursor.close()
+            _release(conn)
+
+    try:
+        # Full-history loads for the in-memory engines: no time budget
+        return get_executor().run(run, retry=True)
+    except Error as e:
+        report_error(e)
+        return None
+
+
+def execute_prepared(name, params=(), query=None):
+    """
+    Run a registered statement as a server-side prepared statement.
+
+    Pages with their own hot statements pass `query` (a module constant)
+    and it is registered under `name` on first use.  Same contract as a
+    read through execute_query: row dicts ([] when there are none) or None
+    on failure, with retries on connection errors.
+    """
+    registry = get_statement_registry()
+    if query is not None:
+        registry.register(name, query)
+
+    def run():
+        # A one-off connection (pool exhausted) loses its prepared statements on close
+        conn = _acquire(get_prepared_pool, autocommit=True)
+        try:
+            count_query()
+            with metrics.observe_statement(name) as observed:
+                names, rows = registry.execute(conn, name, params)
+                observed["rows"] = len(rows)
+            return [dict(zip(names, row)) for row in rows]
+        finally:
+            _release(conn)
+
+    try:
+        return get_executor().run(run, retry=True)
+    except Error as e:
+        report_error(e)
+        return None
+
+
+def kill_query(connection_id):
+    """Stop the statement running on another connection (KILL QUERY)"""
+    try:
+        conn = _connect()
+    except Error:
+        return
+    try:
+        cursor = conn.cursor()
+        cursor.execute("KILL QUERY %s", (int(connection_id),))
+        cursor.close()
+    except Error:
+        # The statement finished (or the connection went) in the meantime
+        pass
+    finally:
+        _release(conn)
+
+
+def execute_report(query, params=None, merge=None):
+    """
+    Run a long read that the user can abandon.
+
+    The statement runs on a worker thread under the "report" time budget
+    while this session shows elapsed time.  Any rerun of the session (a
+    Cancel button, navigating away) stops it on the server with KILL QUERY.
+    With sharding on and a `merge`, it runs on every shard at once and the
+    merged rows are returned.  Returns row dicts, or None if it failed or
+    was cancelled.
+    """
+    executor = get_executor()
+    status = st.empty()
+    shards = _read_shards(query, None, merge)
+    if shards is None:
+        conn = init_connection()
+        conns = [conn] if conn else []
+    else:
+        try:
+            conns = []
+            for shard in shards:
+                conns.append(executor.run(lambda: _shard_connect(shard), retry=True))
+        except Error as e:
+            for conn in conns:
+                _release(conn)
+            report_error(e, "Database Connection Error")
+            conns = []
+    if not conns:
+        return None
+
+    def poll(elapsed):
+        status.caption(f"⏳ Running report... {elapsed:.1f}s")
+
+    try:
+        for _ in conns:
+            count_query()
+        with metrics.observe_statement(metrics.statement_name(query)) as observed:
+            results = executor.run(
+                lambda: run_cancellable_many(conns, executor.prepare(query, "report"), params, kill_query, poll),
+                retry=False
+            )
+            observed["rows"] = sum(len(rows) for _, rows in results)
+    except QueryCancelled:
+        status.warning("Report cancelled")
+        return None
+    except Error as e:
+        status.empty()
+        report_error(e)
+        return None
+    finally:
+        for conn in conns:
+            _release(conn)
+
+    status.empty()
+    per_shard = [[dict(zip(names, row)) for row in rows] for names, rows in results]
+    return merge.apply(per_shard) if shards is not None else per_shard[0]
+
+
+def execute_transaction(statements):
+    """
+    Execute [(query, params), ...] in one transaction.
+
+    A list of parameter tuples runs that statement with executemany.
+    Parameters may also be a function of the (lastrowid, rowcount) pairs
+    of the statements before it, for values only known mid-transaction
+    (the ids a batch INSERT got).  Everything is rolled back if any
+    statement fails.  Returns one (lastrowid, rowcount) pair per statement
+    on success, False on failure.
+    """
+    def run():
+        conn = _connect()
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            conn.start_transaction()
+            results = []
+            for query, params in statements:
+                if callable(params):
+                    params = params(results)
+                routed_statements, first_id = _plan_write(conn, query, params)
+                rowcount = 0
+                for routed, routed_params in routed_statements:
+                    count_query()
+                    with metrics.observe_statement(metrics.statement_name(query)):
+                        if isinstance(routed_params, list):
+                            if routed_params:
+                                cursor.executemany(routed, routed_params)
+                        elif routed_params:
+                            cursor.execute(routed, routed_params)
+                        else:
+                            cursor.execute(routed)
+                    rowcount += max(cursor.rowcount, 0)
+                results.append((cursor.lastrowid if first_id is None else first_id,
+                                rowcount if len(routed_statements) > 1 else cursor.rowcount))
+            conn.commit()
+            return results
+        except Error:
+            if conn.is_connected():
+                conn.rollback()
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+            _release(conn)
+
+    try:
+        # Writes are never retried: a lost connection may have committed
+        results = get_executor().run(run, retry=False)
+    except Error as e:
+        report_error(e, "Transaction Error")
+        return False
+
+    for query, _ in statements:
+        versions.bump_for(query)
+    return results
+
+
+def execute_insert(query, params):
+    """
+    INSERT into a table with an AUTO_INCREMENT key in one round trip.
+
+    With a parameter tuple, returns the new id.  With a list of tuples the
+    rows go out as a single multi-row INSERT (a "simple insert", for which
+    InnoDB reserves one consecutive block of keys) and the range of new ids
+    is returned.  Duplicate-key conflicts are reported as such; returns
+    None on failure.
+    """
+    if isinstance(params, list) and not params:
+        return range(0)
+
+    def run():
+        conn = _connect()
+        cursor = None
+        try:
+            # An INSERT always plans to exactly one statement
+            [(routed, routed_params)], first_id = _plan_write(conn, query, params)
+            count_query()
+            with metrics.observe_statement(metrics.statement_name(query)):
+                cursor = conn.cursor()
+                if isinstance(routed_params, list):
+                    cursor.executemany(routed, routed_params)
+                else:
+                    cursor.execute(routed, routed_params)
+                conn.commit()
+            return cursor.lastrowid if first_id is None else first_id
+        finally:
+            if cursor:
+                cursor.close()
+            _release(conn)
+
+    try:
+        first_id = get_executor().run(run, retry=False)
+    except IntegrityError as e:
+        if e.errno == errorcode.ER_DUP_ENTRY:
+            st.error(f"Already exists: {e.msg}")
+        else:
+            st.error(f"Query Error: {str(e)}")
+        return None
+    except Error as e:
+        report_error(e)
+        return None
+
+    versions.bump_for(query)
+    if isinstance(params, list):
+        return range(first_id, first_id + len(params))
+    return first_id
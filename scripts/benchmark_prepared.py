@@ -0,0 +1,150 @@
+"""
+Compare the hot lookups on the text protocol (what execute_query does)
+with the prepared-statement registry (execute_prepared).
+
+First both paths run on one connection so only the statement handling
+differs, then each call also checks a connection out of a pool and hands
+it back, as the app does:
+
+    python scripts/benchmark_prepared.py [--iterations 2000]
+
+  one connection
+    text       cursor.execute(sql % params) each call: parse + plan + text rows
+    prepared   COM_STMT_EXECUTE of a statement prepared once: binary params/rows
+  through a pool
+    text       the main pool (session reset on return) and the text protocol
+    reprepare  prepared statements on a pool that resets the session on
+               return: each call has to prepare its statement again
+    kept       the prepared-statement pool (pool_reset_session=False): the
+               statement stays prepared across checkouts
+
+Needs the MySQL instance from .streamlit/secrets.toml.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import mysql.connector
+from mysql.connector import pooling
+
+from auth import hash_password
+from cricketdb.prepared import StatementRegistry, STATEMENTS
+from cricketdb.snapshots import load_mysql_config
+from views.updates import PERFORMANCE_BY_ID_QUERY, TEAM_PERFORMANCES_QUERY
+
+
+EXTRA_STATEMENTS = {
+    "performances_by_team": TEAM_PERFORMANCES_QUERY,
+    "performance_by_id": PERFORMANCE_BY_ID_QUERY,
+}
+
+
+def sample_params(conn):
+    """One realistic parameter tuple per statement, taken from the data"""
+    cursor = conn.cursor()
+    cursor.execute("""SELECT (SELECT MIN(player_id) FROM player),
+                             (SELECT MIN(match_id) FROM matches),
+                             (SELECT MIN(performance_id) FROM player_performance),
+                             (SELECT team_name FROM team ORDER BY team_id LIMIT 1)""")
+    player_id, match_id, performance_id, team_name = cursor.fetchone()
+    cursor.close()
+    return {
+        "user_login": ("admin", hash_password("admin123")),
+        "player_by_id": (player_id,),
+        "match_by_id": (match_id,),
+        "match_details_by_id": (match_id,),
+        "performances_by_team": (team_name,),
+        "performance_by_id": (performance_id,),
+    }
+
+
+def call_text(conn, query, params):
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(query, params)
+    cursor.fetchall()
+    cursor.close()
+
+
+def call_reprepared(conn, query, params):
+    cursor = conn.cursor(prepared=True)
+    cursor.execute(query, params)
+    cursor.fetchall()
+    cursor.close()
+
+
+def time_text(conn, query, params, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_text(conn, query, params)
+    return (time.perf_counter() - start) / iterations
+
+
+def time_prepared(conn, registry, name, params, iterations):
+    registry.execute(conn, name, params)  # prepare outside the timed loop
+    start = time.perf_counter()
+    for _ in range(iterations):
+        registry.execute(conn, name, params)
+    return (time.perf_counter() - start) / iterations
+
+
+def time_pooled(pool, call, iterations):
+    """Seconds per checkout + call(conn) + return (after one untimed warm-up call)"""
+    start = None
+    for _ in range(iterations + 1):
+        conn = pool.get_connection()
+        try:
+            call(conn)
+        finally:
+            conn.close()
+        if start is None:
+            start = time.perf_counter()
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark text-protocol vs prepared hot statements")
+    parser.add_argument("--iterations", type=int, default=2000, help="Calls per statement and path")
+    parser.add_argument("--secrets", default=os.path.join(ROOT, ".streamlit", "secrets.toml"),
+                        help="Streamlit secrets file with a [mysql] section")
+    args = parser.parse_args()
+
+    config = load_mysql_config(args.secrets)
+    conn = mysql.connector.connect(autocommit=True, **config)
+    try:
+        registry = StatementRegistry({**STATEMENTS, **EXTRA_STATEMENTS})
+        params = sample_params(conn)
+
+        print("one connection")
+        print(f"{'statement':<22} {'text':>10} {'prepared':>10} {'speedup':>8}")
+        for name, query in registry.statements.items():
+            text = time_text(conn, query, params[name], args.iterations)
+            prepared = time_prepared(conn, registry, name, params[name], args.iterations)
+            print(f"{name:<22} {text * 1e6:>8.0f}us {prepared * 1e6:>8.0f}us {text / prepared:>7.2f}x")
+    finally:
+        conn.close()
+
+    # Pools of one connection, configured like db.get_pool() and db.get_prepared_pool()
+    text_pool = pooling.MySQLConnectionPool(pool_name="bench_text", pool_size=1, **config)
+    reset_pool = pooling.MySQLConnectionPool(pool_name="bench_reset", pool_size=1, autocommit=True, **config)
+    kept_pool = pooling.MySQLConnectionPool(pool_name="bench_kept", pool_size=1, pool_reset_session=False,
+                                            autocommit=True, **config)
+    registry = StatementRegistry({**STATEMENTS, **EXTRA_STATEMENTS})
+
+    print()
+    print("through a pool (checkout + call + return)")
+    print(f"{'statement':<22} {'text':>10} {'reprepare':>10} {'kept':>10} {'speedup':>8}")
+    for name, query in registry.statements.items():
+        text = time_pooled(text_pool, lambda c: call_text(c, query, params[name]), args.iterations)
+        reprepared = time_pooled(reset_pool, lambda c: call_reprepared(c, query, params[name]), args.iterations)
+        kept = time_pooled(kept_pool, lambda c: registry.execute(c, name, params[name]), args.iterations)
+        print(f"{name:<22} {text * 1e6:>8.0f}us {reprepared * 1e6:>8.0f}us {kept * 1e6:>8.0f}us "
+              f"{text / kept:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
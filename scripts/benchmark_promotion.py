@@ -0,0 +1,112 @@
+"""
+Compare per-row trigger promotion with the set-based
+PromoteAllRoundersIn(first_id, last_id) procedure on a bulk performance
+load, the way services.load_performances runs it.
+
+Each mode inserts the same synthetic rows (random existing players and
+matches) inside a transaction that is rolled back afterwards, so the
+database is left as it was:
+
+    python scripts/benchmark_promotion.py [--rows 100000] [--repeat 3]
+
+  trigger    trg_promote_to_allrounder fires an UPDATE per qualifying row
+  set-based  @skip_promotion_trigger is set, then one CALL PromoteAllRoundersIn()
+             over exactly the ids the load inserted
+
+Needs the MySQL instance from .streamlit/secrets.toml.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import mysql.connector
+
+from cricketdb.snapshots import load_mysql_config
+
+
+INSERT = """INSERT INTO player_performance (player_id, match_id, runs_scored, wickets_taken, format, avg)
+            VALUES (%s, %s, %s, %s, %s, %s)"""
+CHUNK_ROWS = 10000
+FORMATS = ["One Day", "Test", "T20"]
+
+
+def synthetic_rows(player_ids, match_ids, count, seed):
+    """Performances with roughly 5% meeting the all-rounder condition"""
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        runs = rng.randint(50, 120) if rng.random() < 0.2 else rng.randint(0, 49)
+        wickets = rng.randint(3, 6) if rng.random() < 0.25 else rng.randint(0, 2)
+        rows.append((rng.choice(player_ids), rng.choice(match_ids), runs, wickets,
+                     rng.choice(FORMATS), round(rng.uniform(0, 60), 2)))
+    return rows
+
+
+def run_load(conn, rows, set_based):
+    """Load rows in one rolled-back transaction; returns (seconds, players promoted)"""
+    cursor = conn.cursor()
+    try:
+        conn.start_transaction()
+        cursor.execute("SELECT COUNT(*) FROM player WHERE role_id = 3")
+        before = cursor.fetchone()[0]
+        cursor.execute("SELECT COALESCE(MAX(performance_id), 0) FROM player_performance")
+        high_water = cursor.fetchone()[0]
+
+        start = time.perf_counter()
+        if set_based:
+            cursor.execute("SET @skip_promotion_trigger = 1")
+        for i in range(0, len(rows), CHUNK_ROWS):
+            cursor.executemany(INSERT, rows[i:i + CHUNK_ROWS])
+        if set_based:
+            # Nothing else writes during the benchmark, so the load got the ids past the old maximum
+            cursor.execute("SELECT MAX(performance_id) FROM player_performance")
+            cursor.execute("CALL PromoteAllRoundersIn(%s, %s)", (high_water + 1, cursor.fetchone()[0]))
+            cursor.execute("SET @skip_promotion_trigger = NULL")
+        elapsed = time.perf_counter() - start
+
+        cursor.execute("SELECT COUNT(*) FROM player WHERE role_id = 3")
+        return elapsed, cursor.fetchone()[0] - before
+    finally:
+        conn.rollback()
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark trigger vs set-based all-rounder promotion")
+    parser.add_argument("--rows", type=int, default=100000, help="Performances per load")
+    parser.add_argument("--repeat", type=int, default=3, help="Loads per mode (best is reported)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--secrets", default=os.path.join(ROOT, ".streamlit", "secrets.toml"),
+                        help="Streamlit secrets file with a [mysql] section")
+    args = parser.parse_args()
+
+    conn = mysql.connector.connect(**load_mysql_config(args.secrets))
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT player_id FROM player")
+        player_ids = [r[0] for r in cursor.fetchall()]
+        cursor.execute("SELECT match_id FROM matches")
+        match_ids = [r[0] for r in cursor.fetchall()]
+        cursor.close()
+        if not player_ids or not match_ids:
+            sys.exit("Need at least one player and one match to generate performances")
+
+        rows = synthetic_rows(player_ids, match_ids, args.rows, args.seed)
+
+        print(f"{'mode':<10} {'best':>10} {'rows/s':>12} {'promoted':>9}")
+        for name, set_based in (("trigger", False), ("set-based", True)):
+            runs = [run_load(conn, rows, set_based) for _ in range(args.repeat)]
+            best, promoted = min(runs)
+            print(f"{name:<10} {best:>9.2f}s {len(rows) / best:>12,.0f} {promoted:>9}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Load-test the real pages with many concurrent sessions.
+
+Each session is a headless Streamlit AppTest that logs in through the
+login form and then navigates at random according to a weighted mix,
+interacting with the page the way an analyst would:
+
+    python scripts/loadtest.py [--sessions 20] [--processes N] [--duration 60]
+                               [--mix dashboard=2,read_players=3,join_query=2]
+
+  login                      fill in the login form and submit it
+  dashboard                  open the dashboard
+  read_players               open CRUD, then filter the player list by a team
+  update_player_performance  open Updates, then filter the performance grid by a team
+  join_query                 open Advanced Queries, then filter the join results by a team
+  aggregate_query            open Advanced Queries and run the aggregate report
+
+AppTest keeps its runtime in process-global state, so one process can
+only run one script at a time (runs on several threads deadlock).  Each
+session therefore gets its own worker process by default, so --sessions N
+really means N scripts running at once.  A smaller --processes packs
+several sessions into a process, where they take turns: that lowers the
+memory needed but also the concurrency, which is then --processes.
+
+Reported per step: p50/p95/p99 latency of the script run, statements on
+that run (the counter the sidebar shows) and runs that showed an error.
+Overall: throughput, peak/baseline MySQL connections (Threads_connected,
+sampled twice a second) and peak RSS of the worker processes.
+
+Needs the MySQL instance from .streamlit/secrets.toml.
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+APP = os.path.join(ROOT, "cricket_db_app.py")
+
+ACTIONS = ["login", "dashboard", "read_players", "update_player_performance",
+           "join_query", "aggregate_query"]
+DEFAULT_MIX = "login=1,dashboard=3,read_players=3,update_player_performance=1,join_query=2,aggregate_query=1"
+
+CREDENTIALS = {"admin": "admin123", "user": "user123"}
+
+
+def parse_mix(text):
+    """'dashboard=2,join_query=1' -> {'dashboard': 2.0, 'join_query': 1.0}"""
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in ACTIONS:
+            raise argparse.ArgumentTypeError(f"Unknown action {name!r} (choose from {', '.join(ACTIONS)})")
+        mix[name] = float(weight or 1)
+    if not mix or not any(mix.values()):
+        raise argparse.ArgumentTypeError("The mix needs at least one action with a positive weight")
+    return mix
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, int(round(q / 100 * len(values))) - 1))]
+
+
+class Session:
+    """One simulated user: an AppTest plus the measurements of its script runs"""
+
+    def __init__(self, username, samples):
+        from streamlit.testing.v1 import AppTest
+
+        self.username = username
+        self.samples = samples
+        self.at = AppTest.from_file(APP, default_timeout=120)
+        self.at.run()
+
+    def run(self, step, widget=None, value=None, click=False):
+        """Apply one interaction, rerun the script and record (step, seconds, statements, failed)"""
+        if click:
+            widget.click()
+        elif widget is not None:
+            widget.set_value(value)
+        start = time.perf_counter()
+        self.at.run()
+        elapsed = time.perf_counter() - start
+
+        state = self.at.session_state
+        statements = state["query_count"] if "query_count" in state else 0
+        failed = bool(len(self.at.exception) or len(self.at.error))
+        if self.samples is not None:
+            self.samples.append((step, elapsed, statements, failed))
+
+    def find(self, kind, label=None, key=None):
+        for widget in getattr(self.at, kind):
+            if (key is not None and widget.key == key) or (label is not None and widget.label == label):
+                return widget
+        return None
+
+    def login(self):
+        state = self.at.session_state
+        if "authenticated" in state and state["authenticated"]:
+            self.run("logout", self.find("button", label="🚪 Logout"), click=True)
+        self.at.text_input(key="login_username").set_value(self.username)
+        self.at.text_input(key="login_password").set_value(CREDENTIALS[self.username])
+        self.run("login", self.find("button", label="🔓 Login"), click=True)
+
+    def navigate(self, step, page):
+        if not len(self.at.sidebar.radio):
+            self.login()
+            if not len(self.at.sidebar.radio):
+                return  # login failed (recorded as an error on the login step)
+        self.run(step, self.at.sidebar.radio[0], page)
+
+    def filter_first(self, step, kind, label=None, key=None, skip=()):
+        """Pick the first real option of a filter widget (if the page rendered it)"""
+        widget = self.find(kind, label=label, key=key)
+        options = [o for o in (widget.options if widget is not None else []) if o not in skip]
+        if options:
+            value = [options[0]] if kind == "multiselect" else options[0]
+            self.run(step, widget, value)
+
+    def perform(self, action):
+        if action == "login":
+            self.login()
+        elif action == "dashboard":
+            self.navigate("dashboard", "📊 Dashboard")
+        elif action == "read_players":
+            self.navigate("read_players", "📝 CRUD Operations")
+            self.filter_first("read_players:filter", "multiselect", key="filter_team")
+        elif action == "update_player_performance":
+            self.navigate("update_player_performance", "⚙️ Updates")
+            self.filter_first("update_player_performance:filter", "selectbox",
+                              key="perf_team_filter", skip=("All Teams",))
+        elif action == "join_query":
+            self.navigate("join_query", "🔍 Advanced Queries")
+            self.filter_first("join_query:filter", "multiselect", label="Filter by Team")
+        elif action == "aggregate_query":
+            self.navigate("aggregate_query", "🔍 Advanced Queries")
+            run = self.find("button", key="aggregate_run")
+            if run is not None:
+                self.run("aggregate_query:report", run, click=True)
+
+
+def worker(args):
+    """Drive a share of the sessions (one, by default) round-robin; returns (samples, peak RSS bytes)"""
+    index, sessions, mix, duration, think, warmup, username, seed = args
+    rng = random.Random(seed + index)
+    actions, weights = zip(*mix.items())
+
+    users = [Session(username, None) for _ in range(sessions)]
+    for session in users:
+        session.login()
+        if warmup:
+            # First visits pay for page imports; keep them out of the figures
+            for action in ACTIONS[1:]:
+                session.perform(action)
+
+    samples = []
+    for session in users:
+        session.samples = samples
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        for session in users:
+            session.perform(rng.choices(actions, weights)[0])
+            if think:
+                time.sleep(rng.uniform(0, think))
+            if time.monotonic() >= deadline:
+                break
+
+    # ru_maxrss is in kilobytes on Linux
+    return samples, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class ConnectionMonitor(threading.Thread):
+    """Samples the server's Threads_connected while the load runs"""
+
+    def __init__(self, secrets, interval=0.5):
+        super().__init__(name="loadtest-monitor", daemon=True)
+        import mysql.connector
+        from cricketdb.snapshots import load_mysql_config
+
+        self.conn = mysql.connector.connect(autocommit=True, **load_mysql_config(secrets))
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.baseline = self.sample()
+        self.peak = self.baseline
+
+    def sample(self):
+        cursor = self.conn.cursor()
+        cursor.execute("SHOW GLOBAL STATUS LIKE 'Threads_connected'")
+        connected = int(cursor.fetchone()[1])
+        cursor.close()
+        return connected
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.peak = max(self.peak, self.sample())
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+        self.conn.close()
+
+
+def report(samples, rss, duration, monitor):
+    steps = {}
+    for step, seconds, statements, failed in samples:
+        steps.setdefault(step, []).append((seconds, statements, failed))
+
+    print(f"{'step':<34} {'runs':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'stmts/run':>10} {'errors':>7}")
+    for step in sorted(steps):
+        runs = steps[step]
+        latencies = sorted(seconds for seconds, _, _ in runs)
+        p50, p95, p99 = (percentile(latencies, q) * 1000 for q in (50, 95, 99))
+        statements = sum(s for _, s, _ in runs) / len(runs)
+        errors = sum(1 for _, _, failed in runs if failed)
+        print(f"{step:<34} {len(runs):>6} {p50:>7.1f}ms {p95:>7.1f}ms {p99:>7.1f}ms "
+              f"{statements:>10.1f} {errors:>7}")
+
+    print()
+    print(f"script runs      {len(samples)} in {duration:.0f}s ({len(samples) / duration:.1f}/s)")
+    if monitor is not None:
+        print(f"MySQL connections  baseline {monitor.baseline}, peak {monitor.peak} "
+              f"(+{monitor.peak - monitor.baseline} under load, monitor included in both)")
+    else:
+        print("MySQL connections  not sampled (monitor could not connect)")
+    print(f"peak RSS         {max(rss) / 2**20:.0f} MiB per process, {sum(rss) / 2**20:.0f} MiB total "
+          f"over {len(rss)} processes")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test of the Streamlit pages")
+    parser.add_argument("--sessions", type=int, default=20, help="Simulated concurrent sessions")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Worker processes the sessions are spread over (default: one per session; "
+                             "fewer processes means fewer sessions running at once)")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds of load after warm-up")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"Weighted navigation mix (default {DEFAULT_MIX})")
+    parser.add_argument("--think", type=float, default=0.0,
+                        help="Maximum random pause between a session's actions, in seconds")
+    parser.add_argument("--user", choices=sorted(CREDENTIALS), default="admin", help="Account to log in as")
+    parser.add_argument("--warmup", action=argparse.BooleanOptionalAction, default=True,
+                        help="Visit every page once per session before measuring")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--secrets", default=os.path.join(ROOT, ".streamlit", "secrets.toml"),
+                        help="Streamlit secrets file with a [mysql] section")
+    args = parser.parse_args()
+
+    processes = max(1, min(args.processes or args.sessions, args.sessions))
+    shares = [args.sessions // processes + (i < args.sessions % processes) for i in range(processes)]
+
+    try:
+        monitor = ConnectionMonitor(args.secrets)
+    except Exception as e:
+        print(f"Connection monitor unavailable: {e}", file=sys.stderr)
+        monitor = None
+
+    # Workers must start from a clean interpreter (AppTest and the pools are per process)
+    context = multiprocessing.get_context("spawn")
+    print(f"{args.sessions} sessions over {processes} processes for {args.duration:.0f}s "
+          f"(mix: {', '.join(f'{k}={v:g}' for k, v in args.mix.items())})")
+    if processes < args.sessions:
+        print(f"Note: sessions in one process take turns, so at most {processes} run at once",
+              file=sys.stderr)
+    with context.Pool(processes) as pool:
+        if monitor is not None:
+            monitor.start()
+        results = pool.map(worker, [(i, share, args.mix, args.duration, args.think, args.warmup,
+                                     args.user, args.seed) for i, share in enumerate(shares)])
+    if monitor is not None:
+        monitor.stop()
+
+    samples = [sample for worker_samples, _ in results for sample in worker_samples]
+    report(samples, [rss for _, rss in results], args.duration, monitor)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measure cold-start and per-rerun time of the login page and the dashboard.
+
+Every scenario runs in a fresh interpreter so imports are genuinely cold,
+then drives the real app with Streamlit's AppTest:
+
+    python scripts/measure_startup.py [--reruns 5]
+
+Reported per scenario:
+  streamlit_import  time to import streamlit itself (paid by any page)
+  first_run         first script run: app imports + page render
+  rerun_avg         mean of the following reruns (modules already cached)
+  heavy_modules     which of pandas/numpy/plotly/pyarrow the page loaded
+
+The dashboard scenario needs the MySQL instance from .streamlit/secrets.toml;
+without it the timings still show import cost but the page renders errors.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "cricket_db_app.py")
+HEAVY = ["pandas", "numpy", "plotly", "pyarrow"]
+
+CHILD = r"""
+import json, sys, time
+
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+streamlit_import = time.perf_counter() - start
+preloaded = set(sys.modules)
+
+at = AppTest.from_file({app!r}, default_timeout=120)
+if {scenario!r} == "dashboard":
+    at.session_state["authenticated"] = True
+    at.session_state["username"] = "admin"
+    at.session_state["role"] = "admin"
+
+start = time.perf_counter()
+at.run()
+first_run = time.perf_counter() - start
+
+reruns = []
+for _ in range({reruns}):
+    start = time.perf_counter()
+    at.run()
+    reruns.append(time.perf_counter() - start)
+
+print(json.dumps({{
+    "streamlit_import": streamlit_import,
+    "first_run": first_run,
+    "rerun_avg": sum(reruns) / len(reruns) if reruns else None,
+    "heavy_modules": [m for m in {heavy!r} if m in sys.modules and m not in preloaded],
+    "exceptions": len(at.exception),
+}}))
+"""
+
+
+def measure(scenario, reruns):
+    code = CHILD.format(app=APP, scenario=scenario, reruns=reruns, heavy=HEAVY)
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure login/dashboard startup time")
+    parser.add_argument("--reruns", type=int, default=5, help="Reruns to average per scenario")
+    args = parser.parse_args()
+
+    print(f"{'scenario':<10} {'st import':>10} {'first run':>10} {'rerun avg':>10}  heavy modules loaded")
+    for scenario in ("login", "dashboard"):
+        r = measure(scenario, args.reruns)
+        rerun = f"{r['rerun_avg'] * 1000:.1f}ms" if r['rerun_avg'] is not None else "-"
+        heavy = ", ".join(r['heavy_modules']) or "none"
+        note = f"  ({r['exceptions']} page exceptions)" if r['exceptions'] else ""
+        print(f"{scenario:<10} {r['streamlit_import'] * 1000:>8.1f}ms {r['first_run'] * 1000:>8.1f}ms "
+              f"{rerun:>10}  {heavy}{note}")
+
+
+if __name__ == "__main__":
+    main()
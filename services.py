@@ -0,0 +1,644 @@
+"""
+Cricket Database Management System - derived data services
+
+Maintenance of data derived from the core tables (team ratings, player
+form, performance sketches, the calendar rollup, tournament standings,
+all-rounder promotion, cached procedure results) that more than one page
+needs to keep up to date, and the writes that must keep it consistent
+(merging duplicate players).
+"""
+
+import time
+
+import streamlit as st
+from mysql.connector import Error
+
+from cricketdb import metrics, versions
+from cricketdb.form import FormIndex
+from cricketdb.procedures import ProcedureRunner
+from cricketdb.ratings import EloEngine
+from cricketdb.sketches import SketchSet
+from db import execute_query, fetch_columns, execute_transaction, init_connection
+
+
+# TEAM RATINGS (ELO)
+RATING_HISTORY_INSERT = """INSERT INTO team_rating_history
+                           (match_id, team_id, date_of_match, rating_before, rating_after)
+                           VALUES (%s, %s, %s, %s, %s)"""
+RATING_UPSERT = """INSERT INTO team_rating (team_id, rating) VALUES (%s, %s)
+                   ON DUPLICATE KEY UPDATE rating = VALUES(rating)"""
+
+
+def rate_new_match(match_id, winning_team_id, losing_team_id, date_of_match):
+    """Incrementally rate a newly inserted match (falls back to a replay if back-dated)"""
+    later = execute_query(
+        """SELECT match_id FROM team_rating_history
+           WHERE date_of_match > %s OR (date_of_match = %s AND match_id > %s)
+           LIMIT 1""",
+        (date_of_match, date_of_match, match_id),
+        fetch=True
+    )
+    if later is None:
+        return False
+    if later:
+        return replay_ratings_from(date_of_match)
+
+    current = execute_query(
+        "SELECT team_id, rating FROM team_rating WHERE team_id IN (%s, %s)",
+        (winning_team_id, losing_team_id),
+        fetch=True
+    )
+    if current is None:
+        return False
+    engine = EloEngine({r['team_id']: r['rating'] for r in current})
+    history = engine.apply(match_id, winning_team_id, losing_team_id, date_of_match)
+
+    return execute_transaction([
+        (RATING_HISTORY_INSERT, history),
+        (RATING_UPSERT, [(team_id, engine.rating(team_id)) for team_id in (winning_team_id, losing_team_id)])
+    ])
+
+
+def replay_ratings_from(start_date=None):
+    """Recompute ratings for matches on/after start_date (all matches if None)"""
+    if start_date is None:
+        starting = []
+        matches = execute_query(
+            """SELECT match_id, winning_team_id, losing_team_id, date_of_match
+               FROM matches ORDER BY date_of_match, match_id""", fetch=True)
+        clear_history = ("DELETE FROM team_rating_history", None)
+    else:
+        # Each team's last recorded rating before the cutoff (index seek per team)
+        starting = execute_query(
+            """SELECT t.team_id,
+                      (SELECT h.rating_after FROM team_rating_history h
+                       WHERE h.team_id = t.team_id AND h.date_of_match < %s
+                       ORDER BY h.date_of_match DESC, h.match_id DESC
+                       LIMIT 1) AS rating
+               FROM team t""",
+            (start_date,),
+            fetch=True
+        )
+        matches = execute_query(
+            """SELECT match_id, winning_team_id, losing_team_id, date_of_match
+               FROM matches WHERE date_of_match >= %s
+               ORDER BY date_of_match, match_id""",
+            (start_date,),
+            fetch=True
+        )
+        clear_history = ("DELETE FROM team_rating_history WHERE date_of_match >= %s", (start_date,))
+
+    if starting is None or matches is None:
+        return False
+
+    engine = EloEngine({r['team_id']: r['rating'] for r in starting if r['rating'] is not None})
+    history = engine.replay(
+        (m['match_id'], m['winning_team_id'], m['losing_team_id'], m['date_of_match']) for m in matches
+    )
+
+    statements = [clear_history, (RATING_HISTORY_INSERT, history)]
+    if engine.ratings:
+        placeholders = ", ".join(["%s"] * len(engine.ratings))
+        statements.append((f"DELETE FROM team_rating WHERE team_id NOT IN ({placeholders})",
+                           tuple(engine.ratings)))
+        statements.append((RATING_UPSERT, list(engine.ratings.items())))
+    else:
+        statements.append(("DELETE FROM team_rating", None))
+
+    return execute_transaction(statements)
+
+
+# PLAYER FORM
+FORM_QUERY = """SELECT pp.performance_id, pp.player_id, pp.match_id, pp.format, m.date_of_match,
+                       pp.runs_scored, pp.wickets_taken
+                FROM player_performance pp
+                JOIN matches m ON pp.match_id = m.match_id"""
+FORM_RESYNC_SECONDS = 60
+PERFORMANCE_TABLES = ("player_performance", "matches")
+# One dive into the primary key: catches rows deleted from the top elsewhere
+HIGH_WATER_QUERY = "SELECT MAX(performance_id) AS high_water FROM player_performance"
+
+
+def _top_deleted(high_water):
+    """True if player_performance no longer reaches high_water"""
+    top = execute_query(HIGH_WATER_QUERY, fetch=True)
+    return bool(top) and (top[0]['high_water'] or 0) < high_water
+
+
+def _is_current(structure):
+    """True if a shared structure has seen every write to the performance tables so far"""
+    return structure.synced is not None and \
+        structure.synced[:2] == (versions.version(*PERFORMANCE_TABLES), versions.rewrite_version(*PERFORMANCE_TABLES))
+
+
+def _advance_synced(structure):
+    """
+    Move a shared structure's sync marker past one UPDATE of
+    player_performance whose delta it has already applied, provided nobody
+    wrote in between (otherwise its next refresh catches up as usual).
+    """
+    written, rewritten, synced_at = structure.synced
+    expected = (versions.advanced(written, PERFORMANCE_TABLES, "player_performance"),
+                versions.advanced(rewritten, PERFORMANCE_TABLES, "player_performance"))
+    if (versions.version(*PERFORMANCE_TABLES), versions.rewrite_version(*PERFORMANCE_TABLES)) == expected:
+        structure.synced = expected + (synced_at,)
+
+
+@st.cache_resource
+def get_form_index():
+    """Process-wide form index shared by all sessions"""
+    return FormIndex()
+
+
+def refresh_form_index():
+    """
+    Sync the shared form index with the database.
+
+    New performances are appended (one indexed range query); edits saved
+    through update_performances arrive as deltas.  Other edits to existing
+    performances or match dates trigger a full rebuild, as do rows deleted
+    from the top of the table outside this process.  A failed read keeps
+    the previous frame and leaves the index unsynced.
+    """
+    form = get_form_index()
+    written, rewritten = versions.version(*PERFORMANCE_TABLES), versions.rewrite_version(*PERFORMANCE_TABLES)
+
+    if form.synced is not None:
+        synced_written, synced_rewritten, synced_at = form.synced
+        if (written, rewritten) == (synced_written, synced_rewritten) and \
+                time.time() - synced_at < FORM_RESYNC_SECONDS:
+            return form
+
+    rebuild = form.synced is None or rewritten != form.synced[1]
+    if not rebuild:
+        new_rows = fetch_columns(FORM_QUERY + " WHERE pp.performance_id > %s", (form.high_water,))
+        if new_rows is None:
+            return form
+        form.append(new_rows)
+        rebuild = _top_deleted(form.high_water)
+
+    if rebuild:
+        history = fetch_columns(FORM_QUERY)
+        if history is None:
+            # Keep the previous frame, still unsynced, and try again next time
+            return form
+        form.rebuild(history)
+
+    form.synced = (written, rewritten, time.time())
+    return form
+
+
+# PERFORMANCE SKETCHES
+SKETCH_QUERY = """SELECT pp.performance_id, pp.format, m.tournament_id, pp.runs_scored, pp.wickets_taken
+                  FROM player_performance pp
+                  JOIN matches m ON pp.match_id = m.match_id"""
+SKETCH_UPSERT = """REPLACE INTO performance_sketch (dimension, dim_key, metric, digest, high_water, row_count)
+                   VALUES (%s, %s, %s, %s, %s, %s)"""
+
+
+@st.cache_resource
+def get_performance_sketches():
+    """Process-wide runs/wickets sketches shared by all sessions"""
+    return SketchSet()
+
+
+def refresh_performance_sketches():
+    """
+    Sync the shared sketches with the database, in memory only: pages that
+    read the sketches never write (see save_performance_sketches).
+
+    A fresh process starts from the stored digests and catches up with one
+    indexed range query past their high-water mark, as it does for new
+    performances afterwards.  Edits saved through update_performances
+    arrive as deltas; other edits to existing performances or matches, or
+    rows deleted from the top of the table (caught by one MAX() index
+    seek), rebuild the digests from a full scan.  A failed read leaves the
+    sketches unsynced, to be retried on the next call.
+    """
+    sketches = get_performance_sketches()
+    written, rewritten = versions.version(*PERFORMANCE_TABLES), versions.rewrite_version(*PERFORMANCE_TABLES)
+
+    if sketches.synced is not None:
+        synced_written, synced_rewritten, synced_at = sketches.synced
+        if (written, rewritten) == (synced_written, synced_rewritten) and \
+                time.time() - synced_at < FORM_RESYNC_SECONDS:
+            return sketches
+
+    if sketches.synced is None:
+        stored = execute_query(
+            "SELECT dimension, dim_key, metric, digest, high_water, row_count FROM performance_sketch",
+            fetch=True)
+        if stored is None:
+            return sketches
+        sketches.load([tuple(row.values()) for row in stored])
+
+    rebuild = sketches.synced is not None and rewritten != sketches.synced[1]
+    if not rebuild:
+        new_rows = fetch_columns(SKETCH_QUERY + " WHERE pp.performance_id > %s", (sketches.high_water,))
+        if new_rows is None:
+            return sketches
+        sketches.add(new_rows)
+        rebuild = _top_deleted(sketches.high_water)
+
+    if rebuild:
+        history = fetch_columns(SKETCH_QUERY)
+        if history is None:
+            # Keep the digests we have and try again next time
+            return sketches
+        sketches.rebuild(history)
+
+    sketches.synced = (written, rewritten, time.time())
+    return sketches
+
+
+def save_performance_sketches():
+    """
+    Sync the shared sketches and store the digests that changed since they
+    were last stored.  Only the code paths that write performances (or move
+    matches between tournaments) call this.  Returns True on success.
+    """
+    sketches = refresh_performance_sketches()
+    replace_all, rows = sketches.take_changes()
+    statements = [("DELETE FROM performance_sketch", None)] if replace_all else []
+    if rows:
+        statements.append((SKETCH_UPSERT, rows))
+    if statements and not execute_transaction(statements):
+        sketches.keep_changes(replace_all, rows)
+        return False
+    return True
+
+
+# PERFORMANCE EDITS
+PERFORMANCE_UPDATE = """UPDATE player_performance SET runs_scored = %s, wickets_taken = %s, format = %s, avg = %s
+                        WHERE performance_id = %s"""
+PERFORMANCE_ROWS_QUERY = """SELECT pp.performance_id, pp.player_id, pp.match_id, pp.format, m.date_of_match,
+                                   m.tournament_id, pp.runs_scored, pp.wickets_taken
+                            FROM player_performance pp
+                            JOIN matches m ON pp.match_id = m.match_id
+                            WHERE pp.performance_id IN ({placeholders})"""
+
+
+def update_performances(params):
+    """
+    Save edited performances [(runs_scored, wickets_taken, format, avg,
+    performance_id), ...] with one batched UPDATE.  The shared form index
+    and sketches take the edit as a delta (old values out, new ones in)
+    instead of being rebuilt.  Returns True on success.
+    """
+    # Deltas apply only to structures that are current up to this write
+    sketches_current = _is_current(refresh_performance_sketches())
+    form = get_form_index()
+    form_current = form.synced is not None and _is_current(refresh_form_index())
+
+    ids = tuple(performance_id for *_, performance_id in params)
+    before = fetch_columns(PERFORMANCE_ROWS_QUERY.format(placeholders=", ".join(["%s"] * len(ids))), ids)
+
+    if not execute_transaction([(PERFORMANCE_UPDATE, params)]):
+        return False
+
+    # Without the old values the next refresh rebuilds instead
+    if before and len(before['performance_id']) == len(ids):
+        edits = {performance_id: (runs, wickets, format_)
+                 for runs, wickets, format_, _, performance_id in params}
+        after = {name: list(values) for name, values in before.items()}
+        for i, performance_id in enumerate(before['performance_id']):
+            after['runs_scored'][i], after['wickets_taken'][i], after['format'][i] = edits[performance_id]
+
+        if form_current:
+            form.replace(after)
+            _advance_synced(form)
+        if sketches_current:
+            sketches = get_performance_sketches()
+            sketches.replace(before, after)
+            _advance_synced(sketches)
+
+    save_performance_sketches()
+    return True
+
+
+# TOURNAMENT STANDINGS
+WIN_POINTS = 2
+
+# Adds a delta row to a team's line (a negative delta takes a result back out)
+STANDINGS_DELTA = """INSERT INTO tournament_standings (tournament_id, team_id, played, won, lost, points)
+                     VALUES (%s, %s, %s, %s, %s, %s)
+                     ON DUPLICATE KEY UPDATE played = played + VALUES(played), won = won + VALUES(won),
+                                             lost = lost + VALUES(lost), points = points + VALUES(points)"""
+
+STANDINGS_REBUILD = f"""INSERT INTO tournament_standings (tournament_id, team_id, played, won, lost, points)
+SELECT tournament_id, team_id, COUNT(*), SUM(won), COUNT(*) - SUM(won), SUM(won) * {WIN_POINTS}
+FROM (SELECT tournament_id, winning_team_id AS team_id, 1 AS won FROM matches
+      UNION ALL
+      SELECT tournament_id, losing_team_id, 0 FROM matches) results
+GROUP BY tournament_id, team_id"""
+
+
+def standings_delta(tournament_id, winning_team_id, losing_team_id, sign=1):
+    """STANDINGS_DELTA rows for one result; sign=-1 reverses it"""
+    return [(tournament_id, winning_team_id, sign, sign, 0, sign * WIN_POINTS),
+            (tournament_id, losing_team_id, sign, 0, sign, 0)]
+
+
+MATCH_INSERT = """INSERT INTO matches (winning_team_id, losing_team_id, date_of_match, location, tournament_id)
+                  VALUES (%s, %s, %s, %s, %s)"""
+
+
+def insert_match(winning_team_id, losing_team_id, date_of_match, location, tournament_id):
+    """
+    Insert a match and add its result to the tournament's points table in
+    one transaction; returns the new match id, or None on failure.
+    """
+    results = execute_transaction([
+        (MATCH_INSERT, (winning_team_id, losing_team_id, date_of_match, location, tournament_id)),
+        (STANDINGS_DELTA, standings_delta(tournament_id, winning_team_id, losing_team_id))
+    ])
+    return results[0][0] if results else None
+
+
+def standings_change(old, new):
+    """
+    Statements moving a match's result from old to new, each a
+    (tournament_id, winning_team_id, losing_team_id) tuple: the old result
+    is reversed and the new one applied, touching only the two or four
+    team lines involved.  Meant for the transaction that updates the match;
+    [] when the result did not change.
+    """
+    if tuple(old) == tuple(new):
+        return []
+    return [
+        (STANDINGS_DELTA, standings_delta(*old, sign=-1) + standings_delta(*new)),
+        # A team that no longer has a match in the old tournament drops off its table
+        ("DELETE FROM tournament_standings WHERE tournament_id = %s AND played = 0", (old[0],))
+    ]
+
+
+def rebuild_standings():
+    """Recompute every points table from the matches (repair; normal updates are incremental)"""
+    return execute_transaction([("DELETE FROM tournament_standings", None), (STANDINGS_REBUILD, None)])
+
+
+# CALENDAR ROLLUP
+MONTH_OF = "DATE_SUB(m.date_of_match, INTERVAL DAYOFMONTH(m.date_of_match) - 1 DAY)"
+
+# One row per (month, team); {where} restricts matches (the idx_date range)
+ROLLUP_INSERT = f"""
+INSERT INTO calendar_rollup (month_start, team_id, matches_played, wins, losses, runs, wickets)
+SELECT month_start, team_id, SUM(played), SUM(won), SUM(lost), SUM(runs), SUM(wickets)
+FROM (
+    SELECT {MONTH_OF} AS month_start, m.winning_team_id AS team_id,
+           1 AS played, 1 AS won, 0 AS lost, 0 AS runs, 0 AS wickets
+    FROM matches m WHERE {{where}}
+    UNION ALL
+    SELECT {MONTH_OF}, m.losing_team_id, 1, 0, 1, 0, 0
+    FROM matches m WHERE {{where}}
+    UNION ALL
+    SELECT {MONTH_OF}, p.team_id, 0, 0, 0, COALESCE(pp.runs_scored, 0), COALESCE(pp.wickets_taken, 0)
+    FROM player_performance pp
+    JOIN player p ON pp.player_id = p.player_id
+    JOIN matches m ON pp.match_id = m.match_id
+    WHERE {{where}}
+) x
+GROUP BY month_start, team_id
+"""
+MONTH_RANGE = "m.date_of_match >= %s AND m.date_of_match < DATE_ADD(%s, INTERVAL 1 MONTH)"
+ROLLUP_TABLES = ("matches", "player_performance", "player")
+
+
+@st.cache_resource
+def get_calendar_sync():
+    """Process-wide marker of the table versions the rollup was last synced at"""
+    return {"synced": None}
+
+
+def refresh_calendar_rollup(full=False):
+    """
+    Bring calendar_rollup up to date.
+
+    Only the months of matches and performances added since the stored
+    high-water marks are recomputed (primary-key range queries, then one
+    idx_date range per month).  Rewrites of matches, performances or
+    players in this process recompute every month.
+    """
+    sync = get_calendar_sync()
+    written, rewritten = versions.version(*ROLLUP_TABLES), versions.rewrite_version(*ROLLUP_TABLES)
+    if sync["synced"] is not None:
+        if written == sync["synced"][0] and not full:
+            return True
+        full = full or rewritten != sync["synced"][1]
+
+    state = execute_query(
+        "SELECT last_match_id, last_performance_id FROM calendar_rollup_state WHERE id = 1", fetch=True)
+    marks = execute_query(
+        """SELECT (SELECT COALESCE(MAX(match_id), 0) FROM matches) AS last_match_id,
+                  (SELECT COALESCE(MAX(performance_id), 0) FROM player_performance) AS last_performance_id""",
+        fetch=True)
+    if not state or not marks:
+        return False
+    state, marks = state[0], marks[0]
+    # Nothing recorded yet: one set-based pass beats a statement per month
+    full = full or state['last_match_id'] == 0
+    save_marks = ("UPDATE calendar_rollup_state SET last_match_id = %s, last_performance_id = %s WHERE id = 1",
+                  (marks['last_match_id'], marks['last_performance_id']))
+
+    if full:
+        statements = [("DELETE FROM calendar_rollup", None),
+                      (ROLLUP_INSERT.format(where="1 = 1"), None),
+                      save_marks]
+    else:
+        months = execute_query(
+            f"""SELECT DISTINCT {MONTH_OF} AS month_start FROM matches m WHERE m.match_id > %s
+                UNION
+                SELECT DISTINCT {MONTH_OF} FROM player_performance pp
+                JOIN matches m ON pp.match_id = m.match_id
+                WHERE pp.performance_id > %s""",
+            (state['last_match_id'], state['last_performance_id']), fetch=True)
+        if months is None:
+            return False
+        month_starts = [row['month_start'] for row in months]
+        statements = [
+            ("DELETE FROM calendar_rollup WHERE month_start = %s", [(month,) for month in month_starts]),
+            (ROLLUP_INSERT.format(where=MONTH_RANGE), [(month, month) * 3 for month in month_starts]),
+            save_marks
+        ]
+
+    if not execute_transaction(statements):
+        return False
+    sync["synced"] = (written, rewritten)
+    return True
+
+
+# ALL-ROUNDER PROMOTION
+PERFORMANCE_INSERT = """INSERT INTO player_performance (player_id, match_id, runs_scored, wickets_taken, format, avg)
+                        VALUES (%s, %s, %s, %s, %s, %s)"""
+
+
+def load_performances(rows):
+    """
+    Insert many performances and promote all-rounders set-based.
+
+    The per-row promotion trigger is switched off for the session, the rows
+    go out as one multi-row INSERT and PromoteAllRoundersIn() handles
+    exactly the ids they got in one UPDATE, all in one transaction (the
+    high-water mark is left to the catch-up event).  Returns (new ids,
+    players promoted) or None on failure.
+    """
+    def inserted(results):
+        first_id = results[1][0]
+        return first_id, first_id + len(rows) - 1
+
+    results = execute_transaction([
+        ("SET @skip_promotion_trigger = 1", None),
+        (PERFORMANCE_INSERT, rows),
+        ("CALL PromoteAllRoundersIn(%s, %s)", inserted),
+        ("SET @skip_promotion_trigger = NULL", None)
+    ])
+    if not results:
+        return None
+    # The procedure writes player, which bump_for cannot see through CALL
+    versions.bump("player", rewrite=True)
+    # Keep the shared and stored sketches current as performances are written
+    save_performance_sketches()
+    first_id = results[1][0]
+    return range(first_id, first_id + len(rows)), max(results[2][1], 0)
+
+
+def promote_all_rounders():
+    """Run the set-based promotion now; returns the number of players promoted"""
+    results = execute_transaction([("CALL PromoteAllRounders()", None)])
+    if not results:
+        return None
+    versions.bump("player", rewrite=True)
+    return max(results[0][1], 0)
+
+
+# STORED PROCEDURES
+@st.cache_resource
+def get_procedure_runner():
+    """Process-wide batched procedure runner and its result cache"""
+    return ProcedureRunner()
+
+
+def run_procedure_batch(name, arg_list):
+    """Run a registered procedure for many argument tuples over one pooled connection"""
+    try:
+        return get_procedure_runner().run_many(init_connection, name, arg_list)
+    except ConnectionError:
+        # init_connection has already reported the problem
+        return None
+    except Error as e:
+        st.error(f"Error: {str(e)}")
+        return None
+
+
+# AWARDS
+AWARD_TABLES = ("award", "player", "matches")
+AWARD_PAGE_SIZE = 25
+AWARD_CACHE_ENTRIES = 256
+
+AWARD_LIST_QUERY = """SELECT a.award_id, a.award_name, a.player_id, p.f_name, p.l_name,
+                             CONCAT(p.f_name, ' ', p.l_name) AS player_name,
+                             a.match_id, m.date_of_match, a.award_date, a.description
+                      FROM award a
+                      JOIN player p ON a.player_id = p.player_id
+                      JOIN matches m ON a.match_id = m.match_id
+                      ORDER BY a.award_date DESC, a.award_id DESC"""
+
+# Range scan of idx_date (award_date is the index prefix, so no table rows are read)
+AWARD_TIMELINE_QUERY = """SELECT DATE_SUB(award_date, INTERVAL DAYOFMONTH(award_date) - 1 DAY) AS month_start,
+                                 COUNT(*) AS awards
+                          FROM award
+                          WHERE award_date >= %s AND award_date <= %s
+                          GROUP BY month_start
+                          ORDER BY month_start"""
+
+# Grouped in idx_player (player_id, award_date) order, then one player lookup per group
+AWARD_COUNTS_QUERY = """SELECT c.player_id, CONCAT(p.f_name, ' ', p.l_name) AS player_name, c.awards, c.latest
+                        FROM (SELECT player_id, COUNT(*) AS awards, MAX(award_date) AS latest
+                              FROM award GROUP BY player_id) c
+                        JOIN player p ON c.player_id = p.player_id
+                        ORDER BY c.awards DESC, c.latest DESC"""
+
+# Keyset pages in idx_date order: each page starts after the previous page's last award
+AWARD_PAGE_QUERY = """SELECT award_id, award_name, award_date, description
+                      FROM award
+                      {where}
+                      ORDER BY award_date DESC, award_id DESC
+                      LIMIT %s"""
+AWARD_PAGE_AFTER = "WHERE award_date < %s OR (award_date = %s AND award_id < %s)"
+
+
+@st.cache_resource
+def get_award_results():
+    """Process-wide award query results: {(query name, inputs): (table versions, rows)}"""
+    return {}
+
+
+def _award_rows(name, query, params=()):
+    """Rows of an award query, shared by every session until an award, player or match changes"""
+    results = get_award_results()
+    key, current = (name, params), versions.version(*AWARD_TABLES)
+    entry = results.get(key)
+    if entry is not None and entry[0] == current:
+        metrics.CACHE_REQUESTS.inc(cache=f"awards:{name}", result="hit")
+        return entry[1]
+
+    metrics.CACHE_REQUESTS.inc(cache=f"awards:{name}", result="miss")
+    rows = execute_query(query, params or None, fetch=True)
+    if rows is not None:
+        if len(results) >= AWARD_CACHE_ENTRIES:
+            results.clear()
+        results[key] = (current, rows)
+    return rows
+
+
+def award_list():
+    """Every award with its player and match, newest first"""
+    return _award_rows("list", AWARD_LIST_QUERY)
+
+
+def award_timeline(start_date, end_date):
+    """Awards per month between two dates: [{'month_start', 'awards'}]"""
+    return _award_rows("timeline", AWARD_TIMELINE_QUERY, (start_date, end_date))
+
+
+def award_counts():
+    """Awards per player, most decorated first"""
+    return _award_rows("counts", AWARD_COUNTS_QUERY)
+
+
+def award_page(after=None, size=AWARD_PAGE_SIZE):
+    """
+    One page of awards, newest first.  `after` is the (award_date,
+    award_id) of the previous page's last row.  Returns (rows, more) where
+    more says whether another page follows.
+    """
+    if after is None:
+        query, params = AWARD_PAGE_QUERY.format(where=""), (size + 1,)
+    else:
+        query = AWARD_PAGE_QUERY.format(where=AWARD_PAGE_AFTER)
+        params = (after[0], after[0], after[1], size + 1)
+    rows = _award_rows("page", query, params)
+    if rows is None:
+        return None, False
+    return rows[:size], len(rows) > size
+
+
+# PLAYER MERGE
+MERGE_STATEMENTS = (
+    "UPDATE player_performance SET player_id = %s WHERE player_id = %s",
+    "UPDATE award SET player_id = %s WHERE player_id = %s",
+)
+
+
+def merge_players(keep_id, duplicate_id):
+    """
+    Fold a duplicate player into the record kept: performances and awards
+    are re-pointed and the duplicate deleted, all in one transaction.
+    Returns (performances moved, awards moved), or None on failure.
+    """
+    statements = [(query, (keep_id, duplicate_id)) for query in MERGE_STATEMENTS]
+    statements.append(("DELETE FROM player WHERE player_id = %s", (duplicate_id,)))
+    results = execute_transaction(statements)
+    if not results:
+        return None
+    return results[0][1], results[1][1]
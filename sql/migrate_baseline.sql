@@ -0,0 +1,243 @@
+-- =============================================
+-- CRICKET DATABASE MANAGEMENT SYSTEM - MIGRATION
+-- Brings a database created by the original single-file setup script up
+-- to the current schema without touching its data.  Safe to run more than
+-- once: every step checks information_schema first or uses IF NOT EXISTS /
+-- DROP ... IF EXISTS.  Run it before starting the updated app:
+--
+--   mysql -u root -p < sql/migrate_baseline.sql
+--
+-- Sharded databases (python -m cricketdb.sharding init) are migrated
+-- before they are split; the split itself creates shard_sequence.
+-- =============================================
+
+USE CricketDB;
+
+-- =============================================
+-- TABLES ADDED SINCE THE ORIGINAL SCHEMA
+-- (same columns, keys and foreign keys as schema.sql + post_load.sql)
+-- =============================================
+
+CREATE TABLE IF NOT EXISTS team_rating (
+  team_id INT PRIMARY KEY,
+  rating DECIMAL(7,2) NOT NULL,
+  FOREIGN KEY (team_id) REFERENCES team(team_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS team_rating_history (
+  match_id INT NOT NULL,
+  team_id INT NOT NULL,
+  date_of_match DATE NOT NULL,
+  rating_before DECIMAL(7,2) NOT NULL,
+  rating_after DECIMAL(7,2) NOT NULL,
+  PRIMARY KEY (match_id, team_id),
+  INDEX idx_team_date (team_id, date_of_match, match_id),
+  INDEX idx_date (date_of_match, match_id),
+  FOREIGN KEY (match_id) REFERENCES matches(match_id) ON DELETE CASCADE,
+  FOREIGN KEY (team_id) REFERENCES team(team_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS calendar_rollup (
+  month_start DATE NOT NULL,
+  team_id INT NOT NULL,
+  matches_played INT NOT NULL DEFAULT 0,
+  wins INT NOT NULL DEFAULT 0,
+  losses INT NOT NULL DEFAULT 0,
+  runs INT NOT NULL DEFAULT 0,
+  wickets INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (month_start, team_id),
+  INDEX idx_team_month (team_id, month_start),
+  FOREIGN KEY (team_id) REFERENCES team(team_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS calendar_rollup_state (
+  id TINYINT PRIMARY KEY,
+  last_match_id INT NOT NULL DEFAULT 0,
+  last_performance_id INT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS tournament_standings (
+  tournament_id INT NOT NULL,
+  team_id INT NOT NULL,
+  played INT NOT NULL DEFAULT 0,
+  won INT NOT NULL DEFAULT 0,
+  lost INT NOT NULL DEFAULT 0,
+  points INT NOT NULL DEFAULT 0,
+  net_run_rate DECIMAL(6,3),
+  PRIMARY KEY (tournament_id, team_id),
+  INDEX idx_team (team_id),
+  FOREIGN KEY (tournament_id) REFERENCES tournament(tournament_id) ON DELETE CASCADE,
+  FOREIGN KEY (team_id) REFERENCES team(team_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS performance_sketch (
+  dimension VARCHAR(20) NOT NULL,
+  dim_key VARCHAR(50) NOT NULL,
+  metric VARCHAR(20) NOT NULL,
+  digest BLOB NOT NULL,
+  high_water INT NOT NULL,
+  row_count INT NOT NULL,
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (dimension, dim_key, metric)
+);
+
+CREATE TABLE IF NOT EXISTS promotion_state (
+  id TINYINT PRIMARY KEY,
+  last_performance_id INT NOT NULL DEFAULT 0
+);
+
+-- =============================================
+-- CHANGES TO EXISTING TABLES
+-- =============================================
+
+DROP PROCEDURE IF EXISTS MigrateBaseline;
+
+DELIMITER //
+
+CREATE PROCEDURE MigrateBaseline()
+BEGIN
+  -- Server-generated keys (the app no longer picks MAX(id) + 1).  The
+  -- columns are referenced by foreign keys, which MySQL only lets us alter
+  -- with the checks off; the type itself does not change.
+  SET FOREIGN_KEY_CHECKS = 0;
+  IF NOT EXISTS (SELECT 1 FROM information_schema.COLUMNS
+                 WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'player'
+                   AND COLUMN_NAME = 'player_id' AND EXTRA LIKE '%auto_increment%') THEN
+    ALTER TABLE player MODIFY player_id INT NOT NULL AUTO_INCREMENT;
+  END IF;
+  IF NOT EXISTS (SELECT 1 FROM information_schema.COLUMNS
+                 WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'matches'
+                   AND COLUMN_NAME = 'match_id' AND EXTRA LIKE '%auto_increment%') THEN
+    ALTER TABLE matches MODIFY match_id INT NOT NULL AUTO_INCREMENT;
+  END IF;
+  IF NOT EXISTS (SELECT 1 FROM information_schema.COLUMNS
+                 WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'player_performance'
+                   AND COLUMN_NAME = 'performance_id' AND EXTRA LIKE '%auto_increment%') THEN
+    ALTER TABLE player_performance MODIFY performance_id INT NOT NULL AUTO_INCREMENT;
+  END IF;
+  IF NOT EXISTS (SELECT 1 FROM information_schema.COLUMNS
+                 WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'award'
+                   AND COLUMN_NAME = 'award_id' AND EXTRA LIKE '%auto_increment%') THEN
+    ALTER TABLE award MODIFY award_id INT NOT NULL AUTO_INCREMENT;
+  END IF;
+  SET FOREIGN_KEY_CHECKS = 1;
+
+  -- Season explorer, timelines and the calendar rollup read matches by date
+  IF NOT EXISTS (SELECT 1 FROM information_schema.STATISTICS
+                 WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'matches' AND INDEX_NAME = 'idx_date') THEN
+    ALTER TABLE matches ADD INDEX idx_date (date_of_match, match_id);
+  END IF;
+
+  -- Awards: day/month/year become one indexed award_date
+  IF NOT EXISTS (SELECT 1 FROM information_schema.COLUMNS
+                 WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'award' AND COLUMN_NAME = 'award_date') THEN
+    ALTER TABLE award ADD COLUMN award_date DATE AFTER match_id;
+    UPDATE award SET award_date = MAKEDATE(year, 1) + INTERVAL month - 1 MONTH + INTERVAL day - 1 DAY;
+    ALTER TABLE award MODIFY award_date DATE NOT NULL,
+      DROP COLUMN day, DROP COLUMN month, DROP COLUMN year;
+  END IF;
+  IF NOT EXISTS (SELECT 1 FROM information_schema.STATISTICS
+                 WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'award' AND INDEX_NAME = 'idx_date') THEN
+    -- idx_player gains award_date; it still leads with player_id for the foreign key
+    ALTER TABLE award DROP INDEX idx_player,
+      ADD INDEX idx_player (player_id, award_date),
+      ADD INDEX idx_date (award_date, award_id);
+  END IF;
+
+  -- Bookkeeping rows.  Existing performances were promoted by the trigger
+  -- as they were inserted, so the promotion mark starts past them.
+  INSERT IGNORE INTO calendar_rollup_state (id, last_match_id, last_performance_id) VALUES (1, 0, 0);
+  INSERT IGNORE INTO promotion_state (id, last_performance_id)
+  SELECT 1, COALESCE(MAX(performance_id), 0) FROM player_performance;
+
+  -- Points table of the existing matches (same statement as services.STANDINGS_REBUILD)
+  IF NOT EXISTS (SELECT 1 FROM tournament_standings) THEN
+    INSERT INTO tournament_standings (tournament_id, team_id, played, won, lost, points)
+    SELECT tournament_id, team_id, COUNT(*), SUM(won), COUNT(*) - SUM(won), SUM(won) * 2
+    FROM (SELECT tournament_id, winning_team_id AS team_id, 1 AS won FROM matches
+          UNION ALL
+          SELECT tournament_id, losing_team_id, 0 FROM matches) results
+    GROUP BY tournament_id, team_id;
+  END IF;
+END;
+
+//
+DELIMITER ;
+
+CALL MigrateBaseline();
+
+DROP PROCEDURE MigrateBaseline;
+
+-- =============================================
+-- TRIGGERS, PROCEDURES AND EVENTS (current definitions from post_load.sql)
+-- =============================================
+
+DROP TRIGGER IF EXISTS trg_promote_to_allrounder;
+
+DELIMITER //
+
+-- Interactive single-row inserts only: batch loads set @skip_promotion_trigger
+-- and call PromoteAllRounders() once instead
+CREATE TRIGGER trg_promote_to_allrounder
+AFTER INSERT ON player_performance
+FOR EACH ROW
+BEGIN
+  IF @skip_promotion_trigger IS NULL AND NEW.runs_scored >= 50 AND NEW.wickets_taken >= 3 THEN
+    UPDATE player
+    SET role_id = 3
+    WHERE player_id = NEW.player_id AND role_id <> 3;
+  END IF;
+END;
+
+//
+DELIMITER ;
+
+DROP PROCEDURE IF EXISTS PromoteAllRoundersIn;
+
+DELIMITER //
+
+CREATE PROCEDURE PromoteAllRoundersIn(IN first_id INT, IN last_id INT)
+BEGIN
+  UPDATE player p
+  JOIN (
+    SELECT DISTINCT player_id
+    FROM player_performance
+    WHERE performance_id BETWEEN first_id AND last_id
+      AND runs_scored >= 50 AND wickets_taken >= 3
+  ) q ON p.player_id = q.player_id
+  SET p.role_id = 3
+  WHERE p.role_id <> 3;
+END;
+
+//
+DELIMITER ;
+
+DROP PROCEDURE IF EXISTS PromoteAllRounders;
+
+DELIMITER //
+
+CREATE PROCEDURE PromoteAllRounders()
+BEGIN
+  DECLARE from_id INT;
+  DECLARE to_id INT;
+
+  SELECT last_performance_id INTO from_id
+  FROM promotion_state WHERE id = 1 FOR UPDATE;
+
+  SELECT COALESCE(MAX(performance_id), from_id) INTO to_id
+  FROM player_performance;
+
+  UPDATE promotion_state SET last_performance_id = to_id WHERE id = 1;
+
+  CALL PromoteAllRoundersIn(from_id + 1, to_id);
+END;
+
+//
+DELIMITER ;
+
+DROP EVENT IF EXISTS ev_promote_all_rounders;
+
+-- Catch-up for rows loaded outside the app (needs event_scheduler=ON, the MySQL 8 default)
+CREATE EVENT ev_promote_all_rounders
+ON SCHEDULE EVERY 10 MINUTE
+DO CALL PromoteAllRounders();
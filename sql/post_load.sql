@@ -0,0 +1,245 @@
+-- =============================================
+-- CRICKET DATABASE MANAGEMENT SYSTEM - POST-LOAD
+-- Run after the data is in (seed.sql or python -m cricketdb.bootstrap):
+-- secondary indexes and unique keys, foreign keys, derived columns,
+-- bookkeeping rows, then triggers, procedures, events and functions.
+-- Each table's indexes are added in one ALTER so it is sorted only once.
+-- =============================================
+
+-- =============================================
+-- INDEXES AND UNIQUE KEYS
+-- =============================================
+
+ALTER TABLE users ADD UNIQUE KEY uq_username (username);
+
+ALTER TABLE role ADD UNIQUE KEY uq_role_name (role_name);
+
+ALTER TABLE team ADD UNIQUE KEY uq_team_name (team_name);
+
+ALTER TABLE player
+  ADD INDEX idx_team (team_id),
+  ADD INDEX idx_role (role_id);
+
+ALTER TABLE tournament ADD UNIQUE KEY uq_tournament_name (tournament_name);
+
+ALTER TABLE trainer ADD INDEX idx_team (team_id);
+
+ALTER TABLE matches
+  ADD INDEX idx_winner (winning_team_id),
+  ADD INDEX idx_loser (losing_team_id),
+  ADD INDEX idx_tournament (tournament_id),
+  ADD INDEX idx_date (date_of_match, match_id);
+
+ALTER TABLE player_performance
+  ADD INDEX idx_player (player_id),
+  ADD INDEX idx_match (match_id);
+
+-- idx_date: timeline ranges and the keyset-paged pickers; idx_player: per-player counts
+ALTER TABLE award
+  ADD INDEX idx_player (player_id, award_date),
+  ADD INDEX idx_match (match_id),
+  ADD INDEX idx_date (award_date, award_id);
+
+ALTER TABLE played_in ADD INDEX idx_team (team_id);
+
+ALTER TABLE team_rating_history
+  ADD INDEX idx_team_date (team_id, date_of_match, match_id),
+  ADD INDEX idx_date (date_of_match, match_id);
+
+ALTER TABLE calendar_rollup ADD INDEX idx_team_month (team_id, month_start);
+
+ALTER TABLE tournament_standings ADD INDEX idx_team (team_id);
+
+-- =============================================
+-- FOREIGN KEYS
+-- =============================================
+
+ALTER TABLE player
+  ADD FOREIGN KEY (team_id) REFERENCES team(team_id),
+  ADD FOREIGN KEY (role_id) REFERENCES role(role_id);
+
+ALTER TABLE trainer
+  ADD FOREIGN KEY (team_id) REFERENCES team(team_id);
+
+ALTER TABLE matches
+  ADD FOREIGN KEY (winning_team_id) REFERENCES team(team_id),
+  ADD FOREIGN KEY (losing_team_id) REFERENCES team(team_id),
+  ADD FOREIGN KEY (tournament_id) REFERENCES tournament(tournament_id);
+
+ALTER TABLE player_performance
+  ADD FOREIGN KEY (player_id) REFERENCES player(player_id) ON DELETE CASCADE,
+  ADD FOREIGN KEY (match_id) REFERENCES matches(match_id) ON DELETE CASCADE;
+
+ALTER TABLE award
+  ADD FOREIGN KEY (player_id) REFERENCES player(player_id) ON DELETE CASCADE,
+  ADD FOREIGN KEY (match_id) REFERENCES matches(match_id) ON DELETE CASCADE;
+
+ALTER TABLE played_in
+  ADD FOREIGN KEY (match_id) REFERENCES matches(match_id) ON DELETE CASCADE,
+  ADD FOREIGN KEY (team_id) REFERENCES team(team_id) ON DELETE CASCADE;
+
+ALTER TABLE team_rating
+  ADD FOREIGN KEY (team_id) REFERENCES team(team_id) ON DELETE CASCADE;
+
+ALTER TABLE team_rating_history
+  ADD FOREIGN KEY (match_id) REFERENCES matches(match_id) ON DELETE CASCADE,
+  ADD FOREIGN KEY (team_id) REFERENCES team(team_id) ON DELETE CASCADE;
+
+ALTER TABLE calendar_rollup
+  ADD FOREIGN KEY (team_id) REFERENCES team(team_id) ON DELETE CASCADE;
+
+ALTER TABLE tournament_standings
+  ADD FOREIGN KEY (tournament_id) REFERENCES tournament(tournament_id) ON DELETE CASCADE,
+  ADD FOREIGN KEY (team_id) REFERENCES team(team_id) ON DELETE CASCADE;
+
+-- =============================================
+-- DERIVED DATA AND BOOKKEEPING
+-- =============================================
+
+-- What trg_set_age would have set on every loaded row
+UPDATE player SET age = TIMESTAMPDIFF(YEAR, dob, CURDATE());
+
+INSERT INTO calendar_rollup_state (id, last_match_id, last_performance_id) VALUES (1, 0, 0);
+
+INSERT INTO promotion_state (id, last_performance_id) VALUES (1, 0);
+
+-- Points table of the loaded matches (same statement as services.STANDINGS_REBUILD)
+INSERT INTO tournament_standings (tournament_id, team_id, played, won, lost, points)
+SELECT tournament_id, team_id, COUNT(*), SUM(won), COUNT(*) - SUM(won), SUM(won) * 2
+FROM (SELECT tournament_id, winning_team_id AS team_id, 1 AS won FROM matches
+      UNION ALL
+      SELECT tournament_id, losing_team_id, 0 FROM matches) results
+GROUP BY tournament_id, team_id;
+
+-- =============================================
+-- TRIGGERS
+-- =============================================
+
+DELIMITER //
+
+CREATE TRIGGER trg_set_age
+BEFORE INSERT ON player
+FOR EACH ROW
+BEGIN
+    SET NEW.age = TIMESTAMPDIFF(YEAR, NEW.dob, CURDATE());
+END;
+
+//
+DELIMITER ;
+
+DELIMITER //
+
+-- Interactive single-row inserts only: batch loads set @skip_promotion_trigger
+-- and call PromoteAllRounders() once instead
+CREATE TRIGGER trg_promote_to_allrounder
+AFTER INSERT ON player_performance
+FOR EACH ROW
+BEGIN
+  IF @skip_promotion_trigger IS NULL AND NEW.runs_scored >= 50 AND NEW.wickets_taken >= 3 THEN
+    UPDATE player
+    SET role_id = 3
+    WHERE player_id = NEW.player_id AND role_id <> 3;
+  END IF;
+END;
+
+//
+DELIMITER ;
+
+-- =============================================
+-- STORED PROCEDURES
+-- =============================================
+
+DELIMITER //
+
+CREATE PROCEDURE GetPlayersByTeam(IN teamName VARCHAR(50))
+BEGIN
+  SELECT p.player_id, p.f_name, p.l_name, r.role_name
+  FROM player p
+  JOIN team t ON p.team_id = t.team_id
+  JOIN role r ON p.role_id = r.role_id
+  WHERE t.team_name = teamName
+  ORDER BY p.f_name;
+END;
+
+//
+DELIMITER ;
+
+DELIMITER //
+
+-- Set-based all-rounder promotion of the performances first_id..last_id.
+-- Batch loads pass exactly the ids they inserted, so a concurrent run of
+-- the event cannot move the high-water mark past them before they commit.
+-- The last statement is the player UPDATE, so the CALL reports the number
+-- of players promoted as its affected rows.
+CREATE PROCEDURE PromoteAllRoundersIn(IN first_id INT, IN last_id INT)
+BEGIN
+  UPDATE player p
+  JOIN (
+    SELECT DISTINCT player_id
+    FROM player_performance
+    WHERE performance_id BETWEEN first_id AND last_id
+      AND runs_scored >= 50 AND wickets_taken >= 3
+  ) q ON p.player_id = q.player_id
+  SET p.role_id = 3
+  WHERE p.role_id <> 3;
+END;
+
+//
+DELIMITER ;
+
+DELIMITER //
+
+-- Catch-up promotion of everything inserted since the high-water mark
+-- (reports the players promoted the same way)
+CREATE PROCEDURE PromoteAllRounders()
+BEGIN
+  DECLARE from_id INT;
+  DECLARE to_id INT;
+
+  SELECT last_performance_id INTO from_id
+  FROM promotion_state WHERE id = 1 FOR UPDATE;
+
+  SELECT COALESCE(MAX(performance_id), from_id) INTO to_id
+  FROM player_performance;
+
+  UPDATE promotion_state SET last_performance_id = to_id WHERE id = 1;
+
+  CALL PromoteAllRoundersIn(from_id + 1, to_id);
+END;
+
+//
+DELIMITER ;
+
+-- Catch-up for rows loaded outside the app (needs event_scheduler=ON, the MySQL 8 default)
+CREATE EVENT ev_promote_all_rounders
+ON SCHEDULE EVERY 10 MINUTE
+DO CALL PromoteAllRounders();
+
+-- =============================================
+-- FUNCTIONS
+-- =============================================
+
+DELIMITER //
+
+CREATE FUNCTION GetPlayerBattingAvg(playerId INT)
+RETURNS DECIMAL(5,2)
+DETERMINISTIC
+READS SQL DATA
+BEGIN
+  DECLARE avg_runs DECIMAL(5,2);
+  SELECT AVG(runs_scored) INTO avg_runs 
+  FROM player_performance 
+  WHERE player_id = playerId;
+  RETURN IFNULL(avg_runs, 0);
+END;
+
+//
+DELIMITER ;
+
+-- =============================================
+-- CATCH UP ON THE LOADED DATA
+-- =============================================
+
+-- One set-based pass instead of trg_promote_to_allrounder per loaded row;
+-- also moves the high-water mark past everything loaded
+CALL PromoteAllRounders();
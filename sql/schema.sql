@@ -0,0 +1,212 @@
+-- =============================================
+-- CRICKET DATABASE MANAGEMENT SYSTEM - SCHEMA
+-- Tables with their primary keys only.  Secondary indexes, unique keys,
+-- foreign keys, triggers and routines are in post_load.sql so bulk loads
+-- (python -m cricketdb.bootstrap) can run before them.
+-- =============================================
+
+DROP DATABASE IF EXISTS CricketDB;
+CREATE DATABASE CricketDB;
+USE CricketDB;
+
+-- =============================================
+-- USER MANAGEMENT TABLE
+-- =============================================
+
+CREATE TABLE users (
+  user_id INT PRIMARY KEY AUTO_INCREMENT,
+  username VARCHAR(50) NOT NULL,
+  password VARCHAR(255) NOT NULL,
+  role VARCHAR(20) NOT NULL DEFAULT 'user',
+  created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- =============================================
+-- ROLE TABLE
+-- =============================================
+
+CREATE TABLE role (
+  role_id INT PRIMARY KEY,
+  role_name VARCHAR(50) NOT NULL
+);
+
+-- =============================================
+-- TEAM TABLE
+-- =============================================
+
+CREATE TABLE team (
+  team_id INT PRIMARY KEY,
+  team_name VARCHAR(50) NOT NULL,
+  country VARCHAR(50) NOT NULL
+);
+
+-- =============================================
+-- PLAYER TABLE
+-- =============================================
+
+CREATE TABLE player (
+  player_id INT PRIMARY KEY AUTO_INCREMENT,
+  f_name VARCHAR(50) NOT NULL,
+  l_name VARCHAR(50) NOT NULL,
+  dob DATE NOT NULL,
+  age INT,
+  team_id INT NOT NULL,
+  role_id INT NOT NULL
+);
+
+-- =============================================
+-- TOURNAMENT TABLE
+-- =============================================
+
+CREATE TABLE tournament (
+  tournament_id INT PRIMARY KEY,
+  tournament_name VARCHAR(100) NOT NULL,
+  year INT NOT NULL
+);
+
+-- =============================================
+-- TRAINER TABLE
+-- =============================================
+
+CREATE TABLE trainer (
+  trainer_id INT PRIMARY KEY,
+  name VARCHAR(50) NOT NULL,
+  specialization VARCHAR(50) NOT NULL,
+  experience INT NOT NULL,
+  team_id INT NOT NULL
+);
+
+-- =============================================
+-- MATCHES TABLE - FIXED: losing_team_id (was loosing_team_id)
+-- =============================================
+
+CREATE TABLE matches (
+  match_id INT PRIMARY KEY AUTO_INCREMENT,
+  winning_team_id INT NOT NULL,
+  losing_team_id INT NOT NULL,
+  date_of_match DATE NOT NULL,
+  location VARCHAR(50) NOT NULL,
+  tournament_id INT NOT NULL
+);
+
+-- =============================================
+-- PLAYER_PERFORMANCE TABLE
+-- =============================================
+
+CREATE TABLE player_performance (
+  performance_id INT PRIMARY KEY AUTO_INCREMENT,
+  player_id INT NOT NULL,
+  match_id INT NOT NULL,
+  runs_scored INT DEFAULT 0,
+  wickets_taken INT DEFAULT 0,
+  format VARCHAR(20) NOT NULL,
+  avg DECIMAL(5,2) DEFAULT 0
+);
+
+-- =============================================
+-- AWARD TABLE
+-- =============================================
+
+CREATE TABLE award (
+  award_id INT PRIMARY KEY AUTO_INCREMENT,
+  award_name VARCHAR(50) NOT NULL,
+  player_id INT NOT NULL,
+  match_id INT NOT NULL,
+  award_date DATE NOT NULL,
+  description VARCHAR(255)
+);
+
+-- =============================================
+-- PLAYED_IN TABLE
+-- =============================================
+
+CREATE TABLE played_in (
+  match_id INT NOT NULL,
+  team_id INT NOT NULL,
+  PRIMARY KEY (match_id, team_id)
+);
+
+-- =============================================
+-- TEAM RATING TABLES (Elo, maintained by the app)
+-- =============================================
+
+CREATE TABLE team_rating (
+  team_id INT PRIMARY KEY,
+  rating DECIMAL(7,2) NOT NULL
+);
+
+CREATE TABLE team_rating_history (
+  match_id INT NOT NULL,
+  team_id INT NOT NULL,
+  date_of_match DATE NOT NULL,
+  rating_before DECIMAL(7,2) NOT NULL,
+  rating_after DECIMAL(7,2) NOT NULL,
+  PRIMARY KEY (match_id, team_id)
+);
+
+-- =============================================
+-- CALENDAR ROLLUP (per team per month)
+-- =============================================
+
+-- Maintained by services.refresh_calendar_rollup(); runs and wickets are
+-- credited to the player's current team, as in the aggregate query
+CREATE TABLE calendar_rollup (
+  month_start DATE NOT NULL,
+  team_id INT NOT NULL,
+  matches_played INT NOT NULL DEFAULT 0,
+  wins INT NOT NULL DEFAULT 0,
+  losses INT NOT NULL DEFAULT 0,
+  runs INT NOT NULL DEFAULT 0,
+  wickets INT NOT NULL DEFAULT 0,
+  PRIMARY KEY (month_start, team_id)
+);
+
+CREATE TABLE calendar_rollup_state (
+  id TINYINT PRIMARY KEY,
+  last_match_id INT NOT NULL DEFAULT 0,
+  last_performance_id INT NOT NULL DEFAULT 0
+);
+
+-- =============================================
+-- TOURNAMENT STANDINGS (points table)
+-- =============================================
+
+-- Kept up to date match by match by services.record_match_standings() and
+-- services.standings_change(); net_run_rate stays NULL until innings
+-- (runs and overs per side) are recorded
+CREATE TABLE tournament_standings (
+  tournament_id INT NOT NULL,
+  team_id INT NOT NULL,
+  played INT NOT NULL DEFAULT 0,
+  won INT NOT NULL DEFAULT 0,
+  lost INT NOT NULL DEFAULT 0,
+  points INT NOT NULL DEFAULT 0,
+  net_run_rate DECIMAL(6,3),
+  PRIMARY KEY (tournament_id, team_id)
+);
+
+-- =============================================
+-- PERFORMANCE DISTRIBUTION SKETCHES
+-- =============================================
+
+-- Serialized t-digests (cricketdb/sketches.py) of runs and wickets,
+-- overall ('all', 'all'), per format and per tournament
+CREATE TABLE performance_sketch (
+  dimension VARCHAR(20) NOT NULL,
+  dim_key VARCHAR(50) NOT NULL,
+  metric VARCHAR(20) NOT NULL,
+  digest BLOB NOT NULL,
+  high_water INT NOT NULL,
+  row_count INT NOT NULL,
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+  PRIMARY KEY (dimension, dim_key, metric)
+);
+
+-- =============================================
+-- ALL-ROUNDER PROMOTION HIGH-WATER MARK
+-- =============================================
+
+CREATE TABLE promotion_state (
+  id TINYINT PRIMARY KEY,
+  last_performance_id INT NOT NULL DEFAULT 0
+);
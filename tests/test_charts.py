@@ -0,0 +1,89 @@
+"""
+Timeline downsampling and the figure cache (no database needed)
+"""
+
+import numpy as np
+import pytest
+
+from cricketdb.charts import FigureCache, downsample, lttb_indices, minmax_indices
+
+
+def career(size=10000, seed=11):
+    rng = np.random.default_rng(seed)
+    x = np.arange(size)
+    y = np.cumsum(rng.normal(0.2, 3.0, size=size))
+    return x, y
+
+
+# LTTB
+@pytest.mark.parametrize("threshold", [3, 50, 1200])
+def test_lttb_keeps_endpoints_and_point_count(threshold):
+    x, y = career()
+    kept = lttb_indices(x, y, threshold)
+    assert len(kept) == threshold
+    assert kept[0] == 0 and kept[-1] == len(y) - 1
+    assert np.all(np.diff(kept) > 0)
+
+
+def test_lttb_short_series_is_unchanged():
+    x, y = career(size=40)
+    np.testing.assert_array_equal(lttb_indices(x, y, 40), np.arange(40))
+    np.testing.assert_array_equal(lttb_indices(x, y, 100), np.arange(40))
+    np.testing.assert_array_equal(lttb_indices(x, y, 2), np.arange(40))
+
+
+def test_lttb_keeps_a_spike():
+    x, y = np.arange(1000), np.zeros(1000)
+    y[637] = 100.0
+    assert 637 in lttb_indices(x, y, 20)
+
+
+def test_lttb_accepts_dates():
+    x = np.arange("2001-01-01", "2011-01-01", dtype="datetime64[D]")
+    y = np.sin(np.arange(len(x)) / 50.0)
+    kept = lttb_indices(x, y, 300)
+    assert len(kept) == 300 and kept[-1] == len(x) - 1
+
+
+# MIN/MAX BUCKETS
+def test_minmax_keeps_endpoints_extremes_and_bound():
+    rng = np.random.default_rng(5)
+    x = np.sort(rng.uniform(0, 500, size=5000))
+    y = rng.integers(0, 60, size=5000).astype(float)
+    y[4321] = 264.0
+    kept = minmax_indices(x, y, 100)
+    assert kept[0] == 0 and kept[-1] == len(y) - 1
+    assert len(kept) <= 2 * 100 + 2
+    assert 4321 in kept and y[kept].min() == y.min()
+    assert np.all(np.diff(kept) > 0)
+
+
+def test_downsample_dispatches_on_method():
+    x, y = career()
+    assert len(downsample(x, y, points=400)) == 400
+    assert len(downsample(x, y, points=400, method="minmax")) <= 402
+
+
+# FIGURE CACHE
+def test_figure_cache_builds_once_and_evicts_oldest():
+    cache = FigureCache(max_entries=2)
+    builds = []
+
+    def build(value):
+        builds.append(value)
+        return {"data": value}
+
+    assert cache.get_or_build("a", lambda: build(1)) == {"data": 1}
+    assert cache.get_or_build("a", lambda: build(2)) == {"data": 1}
+    cache.get_or_build("b", lambda: build(3))
+    cache.get_or_build("a", lambda: build(4))
+    cache.get_or_build("c", lambda: build(5))
+    assert list(cache.entries) == ["a", "c"]
+    assert builds == [1, 3, 5]
+    assert (cache.hits, cache.misses) == (2, 3)
+
+
+def test_figure_cache_does_not_keep_failed_builds():
+    cache = FigureCache()
+    assert cache.get_or_build("a", lambda: None) is None
+    assert cache.get_or_build("a", lambda: {"data": 1}) == {"data": 1}
@@ -0,0 +1,75 @@
+"""
+Duplicate-player blocking and scoring (no database needed)
+"""
+
+import datetime
+import re
+
+from cricketdb.bootstrap import seed_dataset
+from cricketdb.dedup import blocking_keys, candidate_pairs, find_duplicates, name_similarity, soundex
+
+
+SEED_ROW = re.compile(r"\((\d+), '((?:[^']|'')*)', '((?:[^']|'')*)', '([\d-]+)', \d+, (\d+), \d+\)")
+
+
+def seed_players():
+    """The players of sql/seed.sql as the dicts PLAYERS_QUERY returns"""
+    players = []
+    for statement in seed_dataset(tables=["player"])["player"]:
+        for player_id, first, last, dob, team_id in SEED_ROW.findall(statement):
+            players.append({'player_id': int(player_id), 'f_name': first.replace("''", "'"),
+                            'l_name': last.replace("''", "'"),
+                            'dob': datetime.date.fromisoformat(dob), 'team_id': int(team_id)})
+    return players
+
+
+def player(player_id, first, last, dob=None, team_id=None):
+    return {'player_id': player_id, 'f_name': first, 'l_name': last, 'dob': dob, 'team_id': team_id}
+
+
+def test_soundex():
+    assert soundex("Robert") == soundex("Rupert") == "R163"
+    assert soundex("Smith") == soundex("Smyth") == "S530"
+    assert soundex("Ashcraft") == "A261"
+    assert soundex("Tymczak") == "T522"
+    assert soundex("Lee") == "L000"
+    assert soundex("") == soundex("--") == ""
+
+
+def test_seed_duplicates_are_found():
+    players = seed_players()
+    assert len(players) > 60
+    found = find_duplicates(players)
+    assert [(pair['keep_id'], pair['duplicate_id']) for pair in found] == [(6, 22), (7, 23), (24, 38)]
+    assert found[0]['score'] == 1.0
+    assert "same date of birth" in found[2]['reasons'] and "same team" in found[2]['reasons']
+
+
+def test_blocking_compares_far_fewer_pairs_than_all():
+    players = seed_players()
+    pairs = candidate_pairs(players)
+    assert {(6, 22), (7, 23), (24, 38)} <= pairs
+    assert len(pairs) < len(players) * (len(players) - 1) // 20
+
+
+def test_blocking_keys_cover_swaps_and_misspellings():
+    swapped = candidate_pairs([player(1, "Smith", "Steve"), player(2, "Steve", "Smith")])
+    misspelt = candidate_pairs([player(1, "Steve", "Smith"), player(2, "Steven", "Smyth")])
+    renamed = candidate_pairs([player(1, "Steve", "Smith", "1989-06-02"), player(2, "Peter", "Smith", "1989-06-02")])
+    assert swapped == misspelt == renamed == {(1, 2)}
+    assert candidate_pairs([player(1, "Steve", "Smith"), player(2, "Steve", "Waugh")]) == set()
+    assert blocking_keys(player(1, "", "")) == [("tokens", "")]
+
+
+def test_oversized_blocks_are_skipped():
+    players = [player(i, "Steve", "Smith") for i in range(1, 6)]
+    assert len(candidate_pairs(players, max_block=5)) == 10
+    assert candidate_pairs(players, max_block=4) == set()
+
+
+def test_name_similarity_and_threshold():
+    assert name_similarity(player(1, "Steve", "Smith"), player(2, "Smith", "Steve")) == 1.0
+    assert name_similarity(player(1, "Rob", "Smith"), player(2, "Robert", "Smith")) == 0.95
+    same_name_only = [player(1, "Steve", "Smith", team_id=1), player(2, "Steve", "Smith", team_id=2)]
+    assert find_duplicates(same_name_only) == []
+    assert len(find_duplicates(same_name_only, threshold=0.6)) == 1
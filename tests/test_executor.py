@@ -0,0 +1,121 @@
+"""
+Circuit breaker and executor retries (no database needed)
+"""
+
+import pytest
+from mysql.connector import errorcode
+from mysql.connector.errors import Error, OperationalError
+
+from cricketdb.executor import CircuitBreaker, CircuitOpenError, Executor
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def lost_connection():
+    raise OperationalError(msg="Lost connection", errno=errorcode.CR_SERVER_LOST)
+
+
+def make_executor(threshold=2, cooldown=10.0):
+    clock = Clock()
+    breaker = CircuitBreaker(threshold=threshold, cooldown=cooldown, clock=clock)
+    return Executor(attempts=1, breaker=breaker, sleep=lambda seconds: None), clock
+
+
+def open_circuit(executor, clock):
+    for _ in range(executor.breaker.threshold):
+        with pytest.raises(Error):
+            executor.run(lost_connection, retry=True)
+    assert executor.breaker.state == "open"
+    clock.now += executor.breaker.cooldown
+    assert executor.breaker.state == "half-open"
+
+
+def test_opens_after_threshold_and_fails_fast():
+    executor, clock = make_executor()
+    open_circuit(executor, clock)
+    clock.now -= 1
+    with pytest.raises(CircuitOpenError):
+        executor.run(lambda: "never called", retry=False)
+
+
+def test_successful_probe_closes():
+    executor, clock = make_executor()
+    open_circuit(executor, clock)
+    assert executor.run(lambda: "ok", retry=False) == "ok"
+    assert executor.breaker.state == "closed"
+
+
+def test_failed_probe_reopens():
+    executor, clock = make_executor()
+    open_circuit(executor, clock)
+    with pytest.raises(Error):
+        executor.run(lost_connection, retry=False)
+    assert executor.breaker.state == "open"
+
+
+class Rerun(Exception):
+    """Stands in for Streamlit's RerunException/StopException"""
+
+
+@pytest.mark.parametrize("error", [Rerun, TypeError, KeyboardInterrupt])
+def test_interrupted_probe_releases_breaker(error):
+    executor, clock = make_executor()
+    open_circuit(executor, clock)
+
+    def interrupted():
+        raise error()
+
+    with pytest.raises(error):
+        executor.run(interrupted, retry=True)
+    # Neither a failure nor a success: still half-open, and the next probe gets through
+    assert executor.breaker.state == "half-open"
+    assert executor.breaker.failures == executor.breaker.threshold
+    assert executor.run(lambda: "ok", retry=False) == "ok"
+    assert executor.breaker.state == "closed"
+
+
+def test_interruption_while_closed_is_not_a_failure():
+    executor, _ = make_executor()
+
+    def interrupted():
+        raise Rerun()
+
+    for _ in range(5):
+        with pytest.raises(Rerun):
+            executor.run(interrupted, retry=True)
+    assert executor.breaker.state == "closed"
+    assert executor.breaker.failures == 0
+
+
+def test_reads_retry_transient_errors():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            lost_connection()
+        return "ok"
+
+    executor = Executor(attempts=3, breaker=CircuitBreaker(threshold=5), sleep=lambda seconds: None)
+    assert executor.run(flaky, retry=True) == "ok"
+    assert executor.retries == 2
+    assert executor.breaker.state == "closed"
+
+
+def test_writes_are_not_retried():
+    calls = []
+
+    def write():
+        calls.append(1)
+        lost_connection()
+
+    executor = Executor(attempts=3, breaker=CircuitBreaker(threshold=5), sleep=lambda seconds: None)
+    with pytest.raises(Error):
+        executor.run(write, retry=False)
+    assert len(calls) == 1
@@ -0,0 +1,102 @@
+"""
+Player form engine: full rebuilds and incremental updates (no database needed)
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cricketdb.form import COLUMNS, FormIndex, compute_form
+
+
+FORMATS = ["T20", "Test", "One Day"]
+
+
+def history(size=400, players=12, seed=4):
+    """Performance rows in COLUMNS order; ids grow with the match date"""
+    rng = np.random.default_rng(seed)
+    start = datetime.date(2020, 1, 1)
+    rows = []
+    for i in range(size):
+        match_id = 1 + i // 4
+        rows.append((i + 1, int(rng.integers(1, players + 1)), match_id, FORMATS[match_id % 3],
+                     start + datetime.timedelta(days=3 * match_id),
+                     int(rng.integers(0, 120)), int(rng.integers(0, 6))))
+    return rows
+
+
+def by_id(index):
+    return index.frame.sort_values("performance_id").reset_index(drop=True)
+
+
+def rebuilt(rows, window=5, halflife=3.0):
+    index = FormIndex(window, halflife)
+    index.rebuild(rows)
+    return index
+
+
+def test_rolling_and_ewma_by_hand():
+    day = datetime.date(2024, 1, 1)
+    rows = [(i, 1, i, "T20", day + datetime.timedelta(days=i), runs, 0)
+            for i, runs in enumerate([10, 20, 30, 40], start=1)]
+    frame = compute_form(pd.DataFrame(rows, columns=COLUMNS), window=2, halflife=1.0)
+    assert frame["runs_scored_rolling"].tolist() == [10.0, 15.0, 25.0, 35.0]
+    # halflife 1: weights halve per innings, newest first (1, 0.5, 0.25, ...)
+    assert frame["runs_scored_ewma"].tolist() == [10.0, round(50 / 3, 2), round(170 / 7, 2), round(490 / 15, 2)]
+
+
+def test_groups_are_per_player_and_format_in_date_order():
+    day = datetime.date(2024, 1, 1)
+    rows = [(1, 1, 5, "T20", day + datetime.timedelta(days=5), 50, 0),
+            (2, 1, 2, "T20", day + datetime.timedelta(days=2), 10, 0),
+            (3, 1, 3, "Test", day + datetime.timedelta(days=3), 90, 1),
+            (4, 2, 5, "T20", day + datetime.timedelta(days=5), 0, 4)]
+    index = rebuilt(rows, window=3)
+    frame = by_id(index)
+    assert frame["runs_scored_rolling"].tolist() == [30.0, 10.0, 90.0, 0.0]
+    assert index.high_water == 4
+    latest = index.latest(1).set_index("format")
+    assert latest.loc["T20", "performance_id"] == 1 and latest.loc["Test", "performance_id"] == 3
+    assert index.player_history(1)["performance_id"].tolist()[0] == 1
+
+
+def test_append_matches_full_rebuild():
+    rows = history()
+    index = rebuilt(rows[:300])
+    index.append(rows[300:350])
+    index.append(rows[350:])
+    assert index.high_water == len(rows)
+    pd.testing.assert_frame_equal(by_id(index), by_id(rebuilt(rows)))
+
+
+def test_replace_matches_full_rebuild():
+    rows = history()
+    index = rebuilt(rows)
+    edited = [(row[0], row[1], row[2], "Test" if row[3] == "T20" else row[3], row[4], row[5] + 7, row[6])
+              for row in rows[100:110]]
+    edited.append(rows[5][:1] + (99,) + rows[5][2:])
+    index.replace(edited)
+    expected = list(rows)
+    for row in edited:
+        expected[row[0] - 1] = row
+    assert len(index) == len(rows)
+    pd.testing.assert_frame_equal(by_id(index), by_id(rebuilt(expected)))
+
+
+def test_empty_updates_and_history():
+    index = FormIndex()
+    assert len(index) == 0 and index.high_water == 0
+    index.append([])
+    index.rebuild([])
+    assert "runs_scored_ewma" in index.frame.columns and index.high_water == 0
+
+
+@pytest.mark.parametrize("window", [1, 3, 10])
+def test_window_bounds_rolling_mean(window):
+    rows = history(size=200)
+    frame = by_id(rebuilt(rows, window=window))
+    player = frame[(frame["player_id"] == 3) & (frame["format"] == "T20")].sort_values("date_of_match")
+    expected = player["runs_scored"].astype(float).rolling(window, min_periods=1).mean().round(2)
+    assert player["runs_scored_rolling"].tolist() == expected.tolist()
@@ -0,0 +1,75 @@
+"""
+Indexed filter/sort frames against plain pandas (no database needed)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cricketdb.frames import IndexedFrame
+
+
+KEYS = ["team_name", "role_name"]
+SORTS = {"Name": ("f_name", True), "Age (oldest)": ("age", False), "Runs": ("runs", False)}
+TEAMS = ["India", "Australia", "England", "South Africa", "New Zealand"]
+ROLES = ["Batsman", "Bowler", "All-rounder", "Wicket-keeper"]
+
+
+def players(size=500, seed=9):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "player_id": np.arange(1, size + 1),
+        "f_name": rng.choice(["Ben", "Joe", "Kane", "Pat", "Rohit", "Steve"], size),
+        "team_name": rng.choice(TEAMS, size),
+        "role_name": rng.choice(ROLES, size),
+        "age": rng.integers(18, 40, size),
+        "runs": rng.integers(0, 5000, size).astype(float),
+    }, index=np.arange(1000, 1000 + size))
+
+
+def expected(df, filters, sort):
+    keep = pd.Series(True, index=df.index)
+    for key, values in filters.items():
+        if values:
+            keep &= df[key].isin(values)
+    selected = df[keep].reset_index(drop=True)
+    if sort is not None:
+        column, ascending = SORTS[sort]
+        selected = selected.sort_values(column, ascending=ascending, kind="stable")
+    return selected
+
+
+CASES = [
+    {},
+    {"team_name": ["India"]},
+    {"team_name": ["India", "England"], "role_name": ["Bowler"]},
+    {"team_name": [], "role_name": ["All-rounder", "Batsman"]},
+    {"team_name": ["Ireland"]},
+    {"team_name": ["India", "Ireland"]},
+]
+
+
+@pytest.mark.parametrize("filters", CASES)
+@pytest.mark.parametrize("sort", [None] + list(SORTS))
+def test_select_matches_isin_and_sort_values(filters, sort):
+    df = players()
+    frame = IndexedFrame(df, KEYS, SORTS)
+    result = frame.select(filters, sort)
+    wanted = expected(df, filters, sort)
+    assert result["player_id"].tolist() == wanted["player_id"].tolist()
+    pd.testing.assert_frame_equal(result.reset_index(drop=True).astype({key: object for key in KEYS}),
+                                  wanted.reset_index(drop=True))
+
+
+def test_options_and_categorical_keys():
+    df = players(size=50)
+    frame = IndexedFrame(df, KEYS, SORTS)
+    assert frame.options("team_name") == sorted(df["team_name"].unique())
+    assert isinstance(frame.frame["role_name"].dtype, pd.CategoricalDtype)
+    assert len(frame) == 50 and not frame.empty
+
+
+def test_empty_frame():
+    frame = IndexedFrame(players().iloc[:0], KEYS, SORTS)
+    assert frame.empty and frame.options("team_name") == []
+    assert frame.select({"team_name": ["India"]}, "Runs").empty
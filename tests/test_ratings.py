@@ -0,0 +1,58 @@
+"""
+Elo team ratings (no database needed)
+"""
+
+import random
+
+import pytest
+
+from cricketdb.ratings import DEFAULT_RATING, K_FACTOR, EloEngine, expected_score
+
+
+def season(teams=8, matches=200, seed=1):
+    rng = random.Random(seed)
+    for match_id in range(1, matches + 1):
+        winner, loser = rng.sample(range(1, teams + 1), 2)
+        yield match_id, winner, loser, f"2024-{1 + match_id % 12:02d}-01"
+
+
+def test_expected_scores_are_complementary():
+    assert expected_score(1500, 1500) == 0.5
+    assert expected_score(1700, 1500) + expected_score(1500, 1700) == pytest.approx(1.0)
+    assert expected_score(1900, 1500) == pytest.approx(10 / 11)
+
+
+def test_single_match_is_zero_sum():
+    engine = EloEngine({1: 1600, 2: 1450})
+    winner, loser = engine.apply(7, 2, 1, "2024-03-01")
+    assert winner[:3] == (7, 2, "2024-03-01") and loser[:3] == (7, 1, "2024-03-01")
+    gain, loss = winner[4] - winner[3], loser[4] - loser[3]
+    assert gain > K_FACTOR / 2 and gain == pytest.approx(-loss, abs=0.01)
+
+
+def test_new_teams_start_at_default_and_split_k():
+    engine = EloEngine()
+    engine.apply(1, 3, 4, "2024-01-01")
+    assert engine.ratings == {3: DEFAULT_RATING + K_FACTOR / 2, 4: DEFAULT_RATING - K_FACTOR / 2}
+
+
+def test_replay_keeps_total_rating_constant():
+    engine = EloEngine()
+    history = engine.replay(season())
+    assert len(history) == 400
+    assert sum(engine.ratings.values()) == pytest.approx(DEFAULT_RATING * len(engine.ratings), abs=0.01 * 200)
+    for winner, loser in zip(history[0::2], history[1::2]):
+        assert winner[4] > winner[3] and loser[4] < loser[3]
+        assert (winner[4] - winner[3]) + (loser[4] - loser[3]) == pytest.approx(0.0, abs=0.01)
+
+
+def test_replay_from_a_checkpoint_matches_full_replay():
+    matches = list(season())
+    full = EloEngine()
+    full.replay(matches)
+
+    head = EloEngine()
+    head.replay(matches[:120])
+    resumed = EloEngine(head.ratings)
+    resumed.replay(matches[120:])
+    assert resumed.ratings == full.ratings
@@ -0,0 +1,222 @@
+"""
+Shard router statement rewriting and fan-out merging (no database needed)
+"""
+
+import pytest
+
+from cricketdb.sharding import Merge, ShardingError, ShardRouter, _split_values
+
+
+SHARDS = ["cdb_s0", "cdb_s1"]
+
+
+def make_router(pinned=None):
+    return ShardRouter("cdb", SHARDS, pinned)
+
+
+class Allocator:
+    """allocate(table, count) handing out keys from 100 and recording the calls"""
+
+    def __init__(self):
+        self.last = 99
+        self.calls = []
+
+    def __call__(self, table, count):
+        self.calls.append((table, count))
+        first, self.last = self.last + 1, self.last + count
+        return first
+
+
+def no_lookup(match_id):
+    raise AssertionError("lookup not expected")
+
+
+# VALUES SPLITTING
+def test_split_values_plain():
+    assert _split_values("%s, %s,%s") == ["%s", "%s", "%s"]
+
+
+def test_split_values_keeps_quoted_commas_and_parentheses():
+    text = "%s, 'Lord''s, London', \"a (b, c\", COALESCE(%s, 0), NOW()"
+    assert _split_values(text) == ["%s", "'Lord''s, London'", "\"a (b, c\"", "COALESCE(%s, 0)", "NOW()"]
+
+
+def test_split_values_backslash_escaped_quote():
+    assert _split_values(r"'it\'s, here', %s") == [r"'it\'s, here'", "%s"]
+
+
+# ROUTING
+def test_pinned_and_modulo_placement():
+    router = make_router({"4": 1, 6: 0})
+    assert router.shard_of(4) == "cdb_s1"
+    assert router.shard_of(6) == "cdb_s0"
+    assert router.shard_of(3) == "cdb_s1"
+    assert router.shard_of("2") == "cdb_s0"
+
+
+def test_pinned_index_out_of_range():
+    with pytest.raises(ValueError):
+        make_router({"4": 2})
+    with pytest.raises(ValueError):
+        make_router({"4": -1})
+    with pytest.raises(ValueError):
+        ShardRouter("cdb", [])
+
+
+def test_from_config_off_without_shards():
+    assert ShardRouter.from_config("cdb", {}) is None
+    assert ShardRouter.from_config("cdb", {"shards": []}) is None
+    router = ShardRouter.from_config("cdb", {"shards": SHARDS, "tournaments": {"5": 0}})
+    assert router.shard_of(5) == "cdb_s0"
+
+
+def test_touches_and_qualify():
+    router = make_router()
+    assert router.touches("SELECT * FROM player p JOIN `matches` m ON 1")
+    assert not router.touches("SELECT * FROM tournament_standings")
+    assert router.qualify("UPDATE matches SET location = %s WHERE match_id = %s", "cdb_s1") == \
+        "UPDATE `cdb_s1`.`matches` SET location = %s WHERE match_id = %s"
+    assert router.qualify("  DELETE FROM `award` WHERE award_id = %s", "cdb_s0") == \
+        "  DELETE FROM `cdb_s0`.`award` WHERE award_id = %s"
+
+
+def test_insert_match_allocates_key_on_tournament_shard():
+    router = make_router()
+    allocate = Allocator()
+    query = "INSERT INTO matches (winning_team_id, losing_team_id, location, tournament_id) VALUES (%s, %s, %s, %s)"
+    shard, planned, params, first_id = router.plan_insert(query, (1, 2, "Lord's, London", 3), no_lookup, allocate)
+    assert shard == "cdb_s1"
+    assert first_id == 100
+    assert allocate.calls == [("matches", 1)]
+    assert planned == ("INSERT INTO `cdb_s1`.`matches` (match_id, winning_team_id, losing_team_id, location, "
+                       "tournament_id) VALUES (%s, %s, %s, %s, %s)")
+    assert params == (100, 1, 2, "Lord's, London", 3)
+
+
+def test_insert_with_expression_keeps_parameter_positions():
+    router = make_router()
+    query = ("INSERT INTO player_performance (player_id, runs_scored, match_id) "
+             "VALUES (%s, COALESCE(%s, 0), %s)")
+    shard, _, params, first_id = router.plan_insert(query, (7, None, 11), {11: 2}.get, Allocator())
+    assert shard == "cdb_s0"
+    assert params == (first_id, 7, None, 11)
+
+
+def test_executemany_insert_on_one_shard():
+    router = make_router()
+    allocate = Allocator()
+    tournaments = {10: 1, 11: 3}
+    query = "INSERT INTO player_performance (player_id, match_id, runs_scored) VALUES (%s, %s, %s)"
+    rows = [(1, 10, 50), (2, 11, 20), (3, 10, 0)]
+    shard, _, params, first_id = router.plan_insert(query, rows, tournaments.get, allocate)
+    assert shard == "cdb_s1"
+    assert allocate.calls == [("player_performance", 3)]
+    assert params == [(100, 1, 10, 50), (101, 2, 11, 20), (102, 3, 10, 0)]
+
+
+def test_insert_spanning_tournaments_on_two_shards_is_refused():
+    router = make_router()
+    allocate = Allocator()
+    query = "INSERT INTO matches (winning_team_id, losing_team_id, tournament_id) VALUES (%s, %s, %s)"
+    with pytest.raises(ShardingError):
+        router.plan_insert(query, [(1, 2, 1), (3, 4, 2)], no_lookup, allocate)
+    assert allocate.calls == []
+
+
+def test_insert_of_unknown_match_is_refused():
+    router = make_router()
+    query = "INSERT INTO award (player_id, match_id, award_name) VALUES (%s, %s, %s)"
+    with pytest.raises(ShardingError):
+        router.plan_insert(query, (1, 99, "MVP"), {}.get, Allocator())
+
+
+def test_insert_without_placement_column_is_refused():
+    router = make_router()
+    with pytest.raises(ShardingError):
+        router.plan_insert("INSERT INTO award (player_id) VALUES (%s)", (1,), no_lookup, Allocator())
+    with pytest.raises(ShardingError):
+        router.plan_insert("INSERT INTO award SELECT * FROM award_archive", None, no_lookup, Allocator())
+
+
+def test_explicit_key_is_not_reallocated():
+    router = make_router()
+    allocate = Allocator()
+    query = "INSERT INTO played_in (team_id, match_id) VALUES (%s, %s)"
+    _, planned, params, first_id = router.plan_insert(query, (4, 8), {8: 2}.get, allocate)
+    assert first_id is None and allocate.calls == []
+    assert planned == "INSERT INTO `cdb_s0`.`played_in` (team_id, match_id) VALUES (%s, %s)"
+    assert params == (4, 8)
+
+
+def test_plan_write_passes_shared_tables_and_calls_through():
+    router = make_router()
+    for query in ("UPDATE player SET role = %s WHERE player_id = %s", "CALL PromoteAllRoundersIn(%s, %s)"):
+        assert router.plan_write(query, (1, 2), no_lookup, Allocator()) == ([(query, (1, 2))], None)
+
+
+def test_plan_write_update_runs_on_every_shard():
+    router = make_router()
+    statements, first_id = router.plan_write("DELETE FROM award WHERE player_id = %s", (5,), no_lookup, Allocator())
+    assert first_id is None
+    assert statements == [("DELETE FROM `cdb_s0`.`award` WHERE player_id = %s", (5,)),
+                          ("DELETE FROM `cdb_s1`.`award` WHERE player_id = %s", (5,))]
+
+
+def test_relocation_moves_every_sharded_table():
+    router = make_router()
+    assert router.relocation(3, "cdb_s0", "cdb_s0") == []
+    statements = router.relocation(3, "cdb_s0", "cdb_s1")
+    assert statements[0] == ("SET @skip_promotion_trigger = 1", None)
+    assert statements[-1] == ("SET @skip_promotion_trigger = NULL", None)
+    moves = statements[1:-1]
+    assert len(moves) == 8
+    assert all(params == (3,) for _, params in moves)
+    inserts = [query for query, _ in moves[0::2]]
+    deletes = [query for query, _ in moves[1::2]]
+    assert inserts[0] == "INSERT INTO `cdb_s1`.`matches` SELECT * FROM `cdb_s0`.`matches` WHERE match_id = %s"
+    assert deletes[0] == "DELETE FROM `cdb_s0`.`matches` WHERE match_id = %s"
+    assert all("`cdb_s1`" in query.split("SELECT")[0] for query in inserts)
+
+
+# MERGING
+def test_merge_without_keys_concatenates():
+    shard_rows = [[{"id": 1}], [{"id": 2}, {"id": 3}]]
+    assert Merge().apply(shard_rows) == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+
+def test_merge_sums_maxes_mins_and_derive():
+    merge = Merge(keys=["team"], sums=["runs", "innings"], maxes=["best"], mins=["first"],
+                  derive={"average": lambda row: row["runs"] / row["innings"]})
+    shard_rows = [
+        [{"team": "A", "runs": 100, "innings": 4, "best": 60, "first": 2001},
+         {"team": "B", "runs": 30, "innings": 1, "best": None, "first": 2005}],
+        [{"team": "A", "runs": 50, "innings": 2, "best": 80, "first": None},
+         {"team": "C", "runs": 10, "innings": 5, "best": 9, "first": 2010}],
+        [{"team": "B", "runs": None, "innings": 2, "best": 40, "first": 2003}],
+    ]
+    merged = {row["team"]: row for row in merge.apply(shard_rows)}
+    assert merged["A"] == {"team": "A", "runs": 150, "innings": 6, "best": 80, "first": 2001, "average": 25.0}
+    assert merged["B"] == {"team": "B", "runs": 30, "innings": 3, "best": 40, "first": 2003, "average": 10.0}
+    assert merged["C"]["average"] == 2.0
+
+
+def test_merge_does_not_modify_shard_rows():
+    shard_rows = [[{"k": 1, "n": 1}], [{"k": 1, "n": 2}]]
+    Merge(keys=["k"], sums=["n"]).apply(shard_rows)
+    assert shard_rows == [[{"k": 1, "n": 1}], [{"k": 1, "n": 2}]]
+
+
+def test_merge_order_by_and_limit():
+    merge = Merge(keys=["name"], sums=["runs"], order_by=[("runs", True), ("name", False)], limit=3)
+    shard_rows = [
+        [{"name": "d", "runs": 5}, {"name": "b", "runs": 10}, {"name": "e", "runs": None}],
+        [{"name": "a", "runs": 10}, {"name": "c", "runs": 7}, {"name": "d", "runs": 4}],
+    ]
+    assert [row["name"] for row in merge.apply(shard_rows)] == ["a", "b", "d"]
+    assert [row["name"] for row in Merge(order_by=[("runs", True)]).apply(shard_rows)][-1] == "e"
+
+
+def test_merge_ascending_puts_nulls_last():
+    merge = Merge(order_by=[("date", False)])
+    rows = merge.apply([[{"date": None}, {"date": 3}], [{"date": 1}]])
+    assert [row["date"] for row in rows] == [1, 3, None]
@@ -0,0 +1,167 @@
+"""
+t-digest accuracy, edits and serialization (no database needed)
+"""
+
+import numpy as np
+import pytest
+
+from cricketdb.sketches import SketchSet, TDigest
+
+
+QUANTILES = [0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+
+
+def runs_sample(size=20000, seed=7):
+    # Skewed like innings scores: many low scores, a long tail of centuries
+    rng = np.random.default_rng(seed)
+    return np.floor(rng.exponential(scale=28.0, size=size))
+
+
+def digest_of(values, batches=10):
+    digest = TDigest()
+    for batch in np.array_split(values, batches):
+        digest.add(batch)
+    return digest
+
+
+def rank_error(values, estimate, q):
+    """Distance in quantile rank between the estimate and the exact q"""
+    return abs(np.mean(values <= estimate) - q)
+
+
+# ACCURACY
+@pytest.mark.parametrize("q", QUANTILES)
+def test_quantile_error_against_numpy(q):
+    values = runs_sample()
+    digest = digest_of(values)
+    estimate = digest.quantile(q)
+    assert rank_error(values, estimate, q) < 0.01
+    assert abs(estimate - np.quantile(values, q)) <= max(2.0, 0.05 * np.quantile(values, q))
+
+
+def test_continuous_values_error_against_numpy():
+    values = np.random.default_rng(3).normal(40.0, 12.0, size=50000)
+    digest = digest_of(values, batches=25)
+    for q in QUANTILES:
+        assert abs(digest.quantile(q) - np.quantile(values, q)) < 0.5
+
+
+def test_exact_count_sum_min_max_and_bounded_size():
+    values = runs_sample()
+    digest = digest_of(values)
+    assert len(digest) == len(values)
+    assert digest.mean == pytest.approx(values.mean())
+    assert (digest.min, digest.max) == (values.min(), values.max())
+    assert digest.quantile(0) == values.min() and digest.quantile(1) == values.max()
+    assert len(digest.means) <= digest.compression
+
+
+def test_nan_is_ignored_and_empty_digest_has_no_answer():
+    digest = TDigest()
+    assert digest.quantile(0.5) is None and digest.mean is None and digest.cdf(1) is None
+    digest.add([1.0, np.nan, 3.0])
+    assert len(digest) == 2 and digest.mean == 2.0
+
+
+def test_merge_matches_single_digest():
+    values = runs_sample()
+    left, right = digest_of(values[:7000]), digest_of(values[7000:])
+    left.merge(right)
+    assert len(left) == len(values)
+    assert left.total == pytest.approx(values.sum())
+    for q in QUANTILES:
+        assert rank_error(values, left.quantile(q), q) < 0.01
+
+
+# EDITS
+def test_remove_keeps_count_and_sum_exact():
+    values = runs_sample()
+    digest = digest_of(values)
+    removed = values[:500]
+    digest.remove(removed)
+    kept = values[500:]
+    assert len(digest) == len(kept)
+    assert digest.total == pytest.approx(kept.sum())
+    assert digest.mean == pytest.approx(kept.mean())
+    for q in QUANTILES:
+        assert rank_error(kept, digest.quantile(q), q) < 0.02
+
+
+def test_remove_everything_resets_digest():
+    digest = TDigest()
+    digest.add([4.0, 4.0, 9.0])
+    digest.remove([4.0, 4.0, 9.0])
+    assert len(digest) == 0 and digest.quantile(0.5) is None
+    digest.add([2.0])
+    assert (digest.min, digest.max) == (2.0, 2.0)
+
+
+# SERIALIZATION
+def test_to_bytes_round_trip():
+    digest = digest_of(runs_sample())
+    digest.remove([0.0, 150.0])
+    restored = TDigest.from_bytes(digest.to_bytes())
+    assert restored.compression == digest.compression
+    assert (restored.count, restored.total, restored.min, restored.max) == \
+        (digest.count, digest.total, digest.min, digest.max)
+    np.testing.assert_array_equal(restored.means, digest.means)
+    np.testing.assert_array_equal(restored.weights, digest.weights)
+    assert [restored.quantile(q) for q in QUANTILES] == [digest.quantile(q) for q in QUANTILES]
+    restored.add([1.0])
+    assert len(restored) == len(digest) + 1
+
+
+def test_from_bytes_rejects_other_blobs():
+    with pytest.raises(ValueError):
+        TDigest.from_bytes(b"XXXX" + TDigest().to_bytes()[4:])
+
+
+# SKETCH SETS
+def performances(ids, formats, tournaments, runs, wickets):
+    return {"performance_id": ids, "format": formats, "tournament_id": tournaments,
+            "runs_scored": runs, "wickets_taken": wickets}
+
+
+def test_sketch_set_groups_skips_seen_rows_and_stores_changes():
+    sketches = SketchSet()
+    first = performances([1, 2, 3], ["T20", "Test", "T20"], [1, None, 2], [10, 50, 30], [0, 2, 1])
+    sketches.add(first)
+    assert sketches.add(first) == set()
+    assert sketches.rows == 3 and sketches.high_water == 3
+    assert sketches.keys("format") == ["T20", "Test"]
+    assert sketches.keys("tournament") == ["1", "2"]
+    assert sketches.get("runs_scored", "format", "T20").mean == 20.0
+    assert len(sketches.get("runs_scored", "tournament", 9)) == 0
+
+    replace_all, rows = sketches.take_changes()
+    assert not replace_all and len(rows) == 2 * (1 + 2 + 2)
+    assert sketches.take_changes() == (False, [])
+
+    restored = SketchSet()
+    restored.load(rows)
+    assert (restored.rows, restored.high_water) == (3, 3)
+    assert restored.get("wickets_taken").total == 3.0
+
+
+def test_sketch_set_replace_moves_an_edited_row():
+    sketches = SketchSet()
+    sketches.add(performances([1, 2], ["T20", "T20"], [1, 1], [10, 20], [0, 0]))
+    sketches.take_changes()
+    sketches.replace(performances([2], ["T20"], [1], [20], [0]),
+                     performances([2], ["Test"], [1], [25], [1]))
+    assert sketches.get("runs_scored").total == 35.0
+    assert sketches.get("runs_scored", "format", "T20").total == 10.0
+    assert sketches.get("runs_scored", "format", "Test").total == 25.0
+    _, rows = sketches.take_changes()
+    assert {row[:2] for row in rows} == {("all", "all"), ("format", "T20"), ("format", "Test"), ("tournament", "1")}
+
+
+def test_sketch_set_rebuild_replaces_everything_and_keeps_failed_changes():
+    sketches = SketchSet()
+    sketches.add(performances([1], ["T20"], [1], [10], [0]))
+    sketches.rebuild(performances([1, 2], ["Test", "Test"], [2, 2], [5, 7], [1, 0]))
+    assert sketches.keys("format") == ["Test"]
+    replace_all, rows = sketches.take_changes()
+    assert replace_all and len(rows) == 6
+    sketches.keep_changes(replace_all, rows)
+    assert sketches.take_changes()[0]
@@ -0,0 +1,122 @@
+"""
+Login throttle and client address parsing (pure logic, no Streamlit)
+"""
+
+from cricketdb.throttle import LoginThrottle, LRUStore, forwarded_client
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_throttle(**settings):
+    clock = Clock()
+    defaults = dict(user_burst=3, user_per_minute=60.0, client_burst=5, client_per_minute=60.0,
+                    negative_ttl=30.0, max_entries=100)
+    defaults.update(settings)
+    return LoginThrottle(clock=clock, **defaults), clock
+
+
+def attempts(throttle, username, client, count):
+    return [throttle.check(username, client, (username, n))[0] for n in range(count)]
+
+
+def test_user_burst_then_refill():
+    throttle, clock = make_throttle()
+    assert attempts(throttle, "alice", "1.1.1.1", 4) == [True, True, True, False]
+    allowed, retry_after = throttle.check("alice", "1.1.1.1", "x")
+    assert not allowed and retry_after > 0
+    clock.now += 1.0
+    assert throttle.check("alice", "1.1.1.1", "y")[0]
+
+
+def test_client_burst_spans_usernames():
+    throttle, _ = make_throttle()
+    results = [throttle.check(f"user{n}", "1.1.1.1", n)[0] for n in range(6)]
+    assert results == [True] * 5 + [False]
+    # Another client is unaffected
+    assert throttle.check("user0", "2.2.2.2", "z")[0]
+
+
+def test_unknown_client_is_limited_per_user_only():
+    throttle, _ = make_throttle()
+    for n in range(10):
+        assert throttle.check(f"user{n}", None, n)[0]
+    assert attempts(throttle, "alice", None, 4)[-1] is False
+    assert len(throttle.client_buckets) == 0
+
+
+def test_negative_cache_rejects_repeated_failure():
+    throttle, clock = make_throttle(user_burst=10)
+    assert throttle.check("alice", "1.1.1.1", "bad")[0]
+    throttle.record_failure("bad")
+    allowed, retry_after = throttle.check("alice", "1.1.1.1", "bad")
+    assert not allowed and retry_after == 30.0
+    clock.now += 31
+    assert throttle.check("alice", "1.1.1.1", "bad")[0]
+
+
+def test_success_restores_user_allowance():
+    throttle, _ = make_throttle()
+    attempts(throttle, "alice", "1.1.1.1", 3)
+    throttle.record_success("alice")
+    assert throttle.check("alice", "1.1.1.1", "ok")[0]
+
+
+def test_client_flood_does_not_evict_user_buckets():
+    throttle, _ = make_throttle(max_entries=10, client_burst=1000)
+    attempts(throttle, "alice", "1.1.1.1", 3)
+    for n in range(50):
+        throttle.check("mallory", f"10.0.0.{n}", n)
+    assert throttle.check("alice", "1.1.1.1", "again")[0] is False
+
+
+def test_username_flood_evicts_refilled_buckets_first():
+    throttle, clock = make_throttle(max_entries=10, client_burst=1000, user_per_minute=1.0)
+    attempts(throttle, "alice", "1.1.1.1", 3)
+    for n in range(9):
+        throttle.check(f"random{n}", "6.6.6.6", n)
+    # One token each: the flood buckets are full again, alice's three are not
+    clock.now += 61
+    for n in range(9, 18):
+        throttle.check(f"random{n}", "6.6.6.6", n)
+    assert throttle.user_buckets.get("alice") is not None
+    assert throttle.user_buckets.get("random0") is None
+    assert throttle.check("alice", "1.1.1.1", "again")[0]
+    assert throttle.check("alice", "1.1.1.1", "again")[0] is False
+
+
+def test_new_bucket_survives_a_full_store():
+    throttle, _ = make_throttle(max_entries=2, client_burst=1000)
+    attempts(throttle, "a", "1.1.1.1", 3)
+    attempts(throttle, "b", "1.1.1.1", 3)
+    assert attempts(throttle, "mallory", "1.1.1.1", 4) == [True, True, True, False]
+
+
+def test_lru_store_evicts_idle_entries_first():
+    store = LRUStore(2, idle=lambda value: value == "idle")
+    store.put("a", "busy")
+    store.put("b", "idle")
+    store.put("c", "busy")
+    assert sorted(store.items) == ["a", "c"]
+    store.put("d", "busy")
+    # Nothing idle: plain LRU
+    assert sorted(store.items) == ["c", "d"]
+
+
+def test_forwarded_client_uses_trusted_hops():
+    headers = {"X-Forwarded-For": "6.6.6.6, 1.1.1.1, 10.0.0.2"}
+    # One proxy: the entry it appended is the real client; the rest is client-supplied
+    assert forwarded_client(headers, 1) == "10.0.0.2"
+    assert forwarded_client(headers, 2) == "1.1.1.1"
+    assert forwarded_client(headers, 5) == "6.6.6.6"
+
+
+def test_forwarded_client_fallbacks():
+    assert forwarded_client({"X-Real-Ip": "1.1.1.1"}, 1) == "1.1.1.1"
+    assert forwarded_client({"X-Forwarded-For": " , "}, 1) is None
+    assert forwarded_client({}, 1) is None
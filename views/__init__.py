@@ -0,0 +1,45 @@
+"""
+Cricket Database Management System - pages
+
+Each navigation entry lives in its own module and is imported only when
+the user first opens it, so the login page and lightweight pages never
+pay for pandas, NumPy, plotly or pyarrow.
+"""
+
+import importlib
+import time
+
+import streamlit as st
+
+from cricketdb import metrics, tracing
+
+
+# Navigation label -> (module, render function)
+PAGES = {
+    "📊 Dashboard": ("dashboard", "render"),
+    "📝 CRUD Operations": ("crud", "render"),
+    "🎯 Match Management": ("matches", "render"),
+    "⚙️ Updates": ("updates", "render"),
+    "🔍 Advanced Queries": ("queries", "render"),
+    "🔧 Procedures & Functions": ("procedures", "render"),
+    "📈 Analytics": ("analytics", "render"),
+    "🏆 Points Table": ("standings", "render"),
+    "⚡ Triggers Demo": ("triggers", "triggers_demo"),
+    "Awards CRUD": ("awards", "render"),
+    "Awards and Recognition": ("awards", "show_awards_and_recognition"),
+    "ℹ️ About": ("about", "render"),
+}
+
+
+def render(label):
+    """Import the page module for a navigation label, draw it and record its query count and timing"""
+    module_name, function_name = PAGES[label]
+    module = importlib.import_module(f"views.{module_name}")
+
+    st.session_state.query_count = 0
+    start = time.perf_counter()
+    with tracing.trace("page", page=label) as root:
+        getattr(module, function_name)()
+    metrics.PAGE_SECONDS.observe(time.perf_counter() - start, page=label)
+    st.session_state.setdefault('query_stats', {})[label] = st.session_state.query_count
+    st.session_state.last_trace = root
@@ -0,0 +1,42 @@
+"""
+About page
+"""
+
+import streamlit as st
+
+
+def render():
+    """About the application"""
+    st.header("ℹ️ About")
+    st.markdown("""
+    ### Cricket Database Management System
+
+    **Version:** 3.2 - Match Management & Player Performance Updates
+
+    **Features:**
+    - ✅ User Authentication
+    - ✅ CRUD Operations
+    - ✅ Create New Matches
+    - ✅ Add Player Performance to Matches
+    - ✅ Update Match Details
+    - ✅ Update Player Scores
+    - ✅ Advanced Queries
+    - ✅ Procedures & Functions
+    - ✅ Triggers
+    - ✅ Head-to-Head & Venue Analytics
+    - ✅ Team Ratings (Elo)
+    - ✅ Tournament Points Tables
+    - ✅ Offline Snapshot Analytics
+
+    **Technology Stack:**
+    - Python
+    - Streamlit
+    - MySQL
+    - Pandas
+    - NumPy
+    - Plotly
+
+    **Demo Users:**
+    - Admin: admin / admin123
+    - User: user / user123
+    """)
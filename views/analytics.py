@@ -0,0 +1,435 @@
+"""
+Analytics pages: head-to-head records, team ratings, the season explorer
+and career/team timelines
+"""
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from cricketdb import charts, versions
+from cricketdb.head_to_head import HeadToHead
+from db import execute_query, fetch_columns, query_count, session_frame
+from services import replay_ratings_from, refresh_calendar_rollup
+
+
+# ANALYTICS - HEAD TO HEAD
+@st.cache_resource(max_entries=1, ttl=600)
+def load_head_to_head(data_version):
+    """Load all matches once into the vectorized head-to-head engine (None if the load failed)"""
+    columns = fetch_columns(
+        """SELECT winning_team_id, losing_team_id, date_of_match, location, tournament_id
+           FROM matches"""
+    )
+    return None if columns is None else HeadToHead.from_columns(columns)
+
+
+def load_lookups():
+    """Team and tournament name -> id maps for the selectors"""
+    teams = execute_query("SELECT team_id, team_name FROM team ORDER BY team_name", fetch=True)
+    tournaments = execute_query("SELECT tournament_id, tournament_name FROM tournament ORDER BY tournament_name", fetch=True)
+    if teams is None or tournaments is None:
+        return None
+    team_options = {t['team_name']: t['team_id'] for t in teams}
+    tournament_options = {t['tournament_name']: t['tournament_id'] for t in tournaments}
+    return team_options, tournament_options
+
+
+def head_to_head_analytics():
+    """Head-to-head records with venue and tournament breakdowns"""
+    st.subheader("🤝 Head-to-Head & Venue Analytics")
+
+    engine = load_head_to_head(versions.version("matches"))
+    if engine is None:
+        # Already reported; don't keep the failure cached for the next run
+        load_head_to_head.clear()
+        return
+    if len(engine) == 0:
+        st.info("No matches available")
+        return
+
+    lookups = session_frame("h2h_lookups", load_lookups, tables=("team", "tournament"))
+    team_options, tournament_options = lookups or ({}, {})
+    team_names = {v: k for k, v in team_options.items()}
+
+    if not team_options:
+        st.error("No teams available")
+        return
+
+    head_to_head_view(engine, team_options, tournament_options)
+
+    st.markdown("---")
+    st.subheader("📋 Win/Loss Matrix")
+    st.caption("Rows beat columns: each cell counts wins of the row team over the column team")
+    team_ids, wins = engine.matrix()
+    labels = [team_names.get(int(t), f"Team {t}") for t in team_ids]
+    st.dataframe(pd.DataFrame(wins, index=labels, columns=labels), use_container_width=True)
+
+
+@st.fragment
+def head_to_head_view(engine, team_options, tournament_options):
+    """Selectors and record; changing them reruns only this fragment"""
+    queries_before = query_count()
+    tournament_names = {v: k for k, v in tournament_options.items()}
+
+    col1, col2 = st.columns(2)
+    with col1:
+        team_a = st.selectbox("Team", options=list(team_options.keys()), key="h2h_team_a")
+    with col2:
+        team_b = st.selectbox("Opponent", options=["All Opponents"] + list(team_options.keys()), key="h2h_team_b")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        venue = st.selectbox("Venue", options=["All Venues"] + list(engine.venues), key="h2h_venue")
+    with col2:
+        tournament = st.selectbox("Tournament", options=["All Tournaments"] + list(tournament_options.keys()),
+                                  key="h2h_tournament")
+
+    filters = {
+        "team_b": None if team_b == "All Opponents" else team_options[team_b],
+        "venue": None if venue == "All Venues" else venue,
+        "tournament_id": None if tournament == "All Tournaments" else tournament_options[tournament]
+    }
+
+    if filters["team_b"] == team_options[team_a]:
+        st.warning("Pick two different teams")
+        return
+
+    record = engine.record(team_options[team_a], **filters)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Played", record['played'])
+    with col2:
+        st.metric("Won", record['won'])
+    with col3:
+        st.metric("Lost", record['lost'])
+    with col4:
+        win_pct = 100 * record['won'] / record['played'] if record['played'] else 0
+        st.metric("Win %", f"{win_pct:.1f}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write("**By Venue**")
+        by_venue = engine.breakdown("venue", team_options[team_a], **filters)
+        st.dataframe(by_venue, use_container_width=True, hide_index=True)
+    with col2:
+        st.write("**By Tournament**")
+        by_tournament = engine.breakdown("tournament", team_options[team_a], **filters)
+        by_tournament.insert(0, "tournament", by_tournament.pop("tournament_id").map(tournament_names))
+        st.dataframe(by_tournament, use_container_width=True, hide_index=True)
+
+    st.caption(f"🗄️ Queries for this view: {query_count() - queries_before}")
+
+
+# ANALYTICS - TEAM RATINGS
+@st.cache_resource
+def get_figure_cache():
+    """Downsampled figure specs shared by every session (keys carry the data version)"""
+    return charts.FigureCache()
+
+
+RATING_HISTORY_QUERY = """SELECT h.date_of_match, h.match_id, t.team_name, h.rating_before, h.rating_after
+                          FROM team_rating_history h
+                          JOIN team t ON h.team_id = t.team_id
+                          ORDER BY h.date_of_match, h.match_id"""
+
+
+def build_ratings_figure():
+    """Rating history per team, LTTB-downsampled to the chart width (fetched only on a cache miss)"""
+    history = execute_query(RATING_HISTORY_QUERY, fetch=True)
+    if not history:
+        return None
+    df = pd.DataFrame(history)
+    traces, shown = [], 0
+    for team_name, team in df.groupby('team_name', sort=True):
+        ratings = team['rating_after'].astype(float).to_numpy()
+        keep = charts.downsample(team['date_of_match'].to_numpy(), ratings)
+        traces.append({"name": team_name, "x": team['date_of_match'].to_numpy()[keep], "y": ratings[keep]})
+        shown += len(keep)
+    return {"figure": charts.timeline_figure(traces, x_title="Match Date", y_title="Rating"),
+            "points": len(df), "shown": shown}
+
+
+def team_ratings():
+    """Current team ratings and rating history chart"""
+    st.subheader("📈 Team Ratings (Elo)")
+
+    has_history = execute_query("SELECT match_id FROM team_rating_history LIMIT 1", fetch=True)
+    if has_history is None:
+        return
+    if not has_history:
+        has_matches = execute_query("SELECT match_id FROM matches LIMIT 1", fetch=True)
+        if not has_matches:
+            st.info("No matches available")
+            return
+        # First view on a fresh database: build the history once
+        if not replay_ratings_from(None):
+            return
+        st.rerun()
+
+    ratings = execute_query(
+        """SELECT t.team_name, r.rating
+           FROM team_rating r
+           JOIN team t ON r.team_id = t.team_id
+           ORDER BY r.rating DESC""", fetch=True)
+
+    if ratings:
+        df = pd.DataFrame(ratings)
+        df['rating'] = df['rating'].astype(float)
+        st.dataframe(df, use_container_width=True, hide_index=True)
+
+    key = ("ratings", versions.version("team_rating_history", "team"), charts.VIEWPORT_POINTS)
+    chart = get_figure_cache().get_or_build(key, build_ratings_figure)
+    if chart:
+        st.plotly_chart(chart['figure'], use_container_width=True)
+        st.caption(f"Showing {chart['shown']:,} of {chart['points']:,} rating points")
+
+    if st.session_state.role == "admin":
+        if st.button("🔄 Rebuild Ratings", use_container_width=True):
+            if replay_ratings_from(None):
+                st.success("Ratings rebuilt from full match history")
+                st.rerun()
+
+
+# ANALYTICS - SEASON EXPLORER
+MONTHLY_ROLLUP_QUERY = """
+SELECT r.month_start, t.team_name, r.matches_played, r.wins, r.losses, r.runs, r.wickets,
+       SUM(r.wins) OVER team_months AS cumulative_wins,
+       SUM(r.runs) OVER team_months AS cumulative_runs,
+       ROUND(AVG(r.runs) OVER (PARTITION BY r.team_id ORDER BY r.month_start
+                               ROWS BETWEEN 2 PRECEDING AND CURRENT ROW), 1) AS runs_3_month_avg,
+       RANK() OVER (PARTITION BY r.month_start ORDER BY r.wins DESC, r.runs DESC) AS month_rank
+FROM calendar_rollup r
+JOIN team t ON r.team_id = t.team_id
+WHERE r.month_start BETWEEN %s AND %s
+WINDOW team_months AS (PARTITION BY r.team_id ORDER BY r.month_start)
+ORDER BY r.month_start, month_rank
+"""
+
+SEASON_ROLLUP_QUERY = """
+SELECT YEAR(r.month_start) AS season, t.team_name,
+       SUM(r.matches_played) AS matches_played, SUM(r.wins) AS wins, SUM(r.losses) AS losses,
+       SUM(r.runs) AS runs, SUM(r.wickets) AS wickets,
+       SUM(SUM(r.wins)) OVER (PARTITION BY r.team_id ORDER BY YEAR(r.month_start)) AS cumulative_wins,
+       SUM(SUM(r.runs)) OVER (PARTITION BY r.team_id ORDER BY YEAR(r.month_start)) AS cumulative_runs,
+       RANK() OVER (PARTITION BY YEAR(r.month_start) ORDER BY SUM(r.wins) DESC, SUM(r.runs) DESC) AS season_rank
+FROM calendar_rollup r
+JOIN team t ON r.team_id = t.team_id
+WHERE r.month_start BETWEEN %s AND %s
+GROUP BY YEAR(r.month_start), r.team_id, t.team_name
+ORDER BY season, season_rank
+"""
+
+
+def season_explorer():
+    """Per-month / per-season team aggregates for a date range, from the calendar rollup"""
+    st.subheader("📅 Season Explorer")
+
+    if not refresh_calendar_rollup():
+        return
+
+    # Index-only lookups on idx_date
+    bounds = execute_query("SELECT MIN(date_of_match) AS first, MAX(date_of_match) AS last FROM matches",
+                           fetch=True)
+    if not bounds or bounds[0]['first'] is None:
+        st.info("No matches available")
+        return
+    first, last = bounds[0]['first'], bounds[0]['last']
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        picked = st.date_input("Date Range", value=(first, last), min_value=first, max_value=last,
+                               key="season_range")
+    with col2:
+        granularity = st.radio("Group By", options=["Month", "Season"], horizontal=True, key="season_granularity")
+
+    if not isinstance(picked, tuple) or len(picked) != 2:
+        st.info("Pick a start and an end date")
+        return
+    start, end = picked
+    # The rollup is monthly: the range covers the whole months it touches
+    month_from = start.replace(day=1)
+
+    query = MONTHLY_ROLLUP_QUERY if granularity == "Month" else SEASON_ROLLUP_QUERY
+    rows = execute_query(query, (month_from, end), fetch=True)
+    if not rows:
+        st.info("No matches in this range")
+        return
+
+    df = pd.DataFrame(rows)
+    period = 'month_start' if granularity == "Month" else 'season'
+    numeric = [c for c in df.columns if c not in (period, 'team_name')]
+    df[numeric] = df[numeric].astype(float)
+
+    fig = px.line(df, x=period, y='cumulative_wins', color='team_name', markers=True,
+                  labels={period: granularity, 'cumulative_wins': 'Cumulative Wins', 'team_name': 'Team'})
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(df, use_container_width=True, hide_index=True)
+    st.caption(f"Whole months from {month_from} to {end}")
+
+    with st.expander("🗓️ Matches in range"):
+        matches = execute_query(
+            """SELECT m.match_id, m.date_of_match, t1.team_name AS winner, t2.team_name AS loser, m.location
+               FROM matches m
+               JOIN team t1 ON m.winning_team_id = t1.team_id
+               JOIN team t2 ON m.losing_team_id = t2.team_id
+               WHERE m.date_of_match BETWEEN %s AND %s
+               ORDER BY m.date_of_match DESC, m.match_id DESC
+               LIMIT 200""", (start, end), fetch=True)
+        if matches:
+            st.dataframe(pd.DataFrame(matches), use_container_width=True, hide_index=True)
+        else:
+            st.info("No matches in this range")
+
+
+# ANALYTICS - TIMELINES
+CAREER_QUERY = """
+SELECT m.date_of_match, pp.runs_scored, pp.wickets_taken
+FROM player_performance pp
+JOIN matches m ON pp.match_id = m.match_id
+WHERE pp.player_id = %s
+ORDER BY m.date_of_match, pp.performance_id
+"""
+
+CAREER_TABLES = ("player_performance", "matches")
+
+TEAM_RESULTS_QUERY = """
+SELECT date_of_match, winning_team_id, losing_team_id
+FROM matches
+ORDER BY date_of_match, match_id
+"""
+
+ROLLING_INNINGS = 10
+
+
+def load_player_names():
+    """Player name -> id for the career picker"""
+    players = execute_query("SELECT player_id, CONCAT(f_name, ' ', l_name) AS name FROM player ORDER BY name",
+                            fetch=True)
+    if players is None:
+        return None
+    return {p['name']: p['player_id'] for p in players}
+
+
+def build_career_figure(player_id):
+    """Runs per innings (min/max buckets keep the big scores) and a rolling average (LTTB)"""
+    columns = fetch_columns(CAREER_QUERY, (player_id,))
+    if not columns:
+        return None
+    dates = np.array(columns['date_of_match'], dtype='datetime64[D]')
+    runs = np.array(columns['runs_scored'], dtype=float)
+    wickets = np.array(columns['wickets_taken'], dtype=float)
+
+    summary = {"figure": None, "points": len(runs), "shown": 0,
+               "runs": int(runs.sum()), "wickets": int(wickets.sum())}
+    if not len(runs):
+        return summary
+
+    window = min(ROLLING_INNINGS, len(runs))
+    totals = np.cumsum(np.r_[0.0, runs])
+    rolling = (totals[window:] - totals[:-window]) / window
+    rolling_dates = dates[window - 1:]
+
+    keep_runs = charts.downsample(dates, runs, method="minmax")
+    keep_avg = charts.downsample(rolling_dates, rolling)
+    figure = charts.timeline_figure([
+        {"name": "Runs", "x": dates[keep_runs], "y": runs[keep_runs], "mode": "markers"},
+        {"name": f"{window}-innings average", "x": rolling_dates[keep_avg], "y": rolling[keep_avg]},
+    ], x_title="Match Date", y_title="Runs")
+    return {**summary, "figure": figure, "shown": len(keep_runs) + len(keep_avg)}
+
+
+def build_team_form_figure(team_ids, team_names):
+    """Cumulative wins minus losses per team over its matches (LTTB)"""
+    columns = fetch_columns(TEAM_RESULTS_QUERY)
+    if not columns:
+        return None
+    dates = np.array(columns['date_of_match'], dtype='datetime64[D]')
+    winners = np.array(columns['winning_team_id'], dtype=np.int64)
+    losers = np.array(columns['losing_team_id'], dtype=np.int64)
+
+    traces, points, shown = [], 0, 0
+    for team_id in team_ids:
+        played = (winners == team_id) | (losers == team_id)
+        if not played.any():
+            continue
+        net = np.cumsum(np.where(winners[played] == team_id, 1, -1))
+        keep = charts.downsample(dates[played], net)
+        traces.append({"name": team_names[team_id], "x": dates[played][keep], "y": net[keep]})
+        points += len(net)
+        shown += len(keep)
+    return {"figure": charts.timeline_figure(traces, x_title="Match Date", y_title="Wins − Losses"),
+            "points": points, "shown": shown}
+
+
+@st.fragment
+def timelines_view(player_options, team_options):
+    """Pickers rerun only this fragment; figures come from the shared cache when the data is unchanged"""
+    queries_before = query_count()
+    cache = get_figure_cache()
+    team_names = {v: k for k, v in team_options.items()}
+
+    st.write("**Player Career**")
+    player = st.selectbox("Player", options=list(player_options.keys()), key="timeline_player")
+    if player:
+        player_id = player_options[player]
+        key = ("career", player_id, versions.version(*CAREER_TABLES), charts.VIEWPORT_POINTS)
+        career = cache.get_or_build(key, lambda: build_career_figure(player_id))
+        if career and career['points']:
+            st.plotly_chart(career['figure'], use_container_width=True)
+            st.caption(f"{career['points']:,} innings, {career['runs']:,} runs, {career['wickets']:,} wickets "
+                       f"(showing {career['shown']:,} points)")
+        elif career is not None:
+            st.info("No performances recorded for this player")
+
+    st.markdown("---")
+    st.write("**Team Results**")
+    teams = st.multiselect("Teams", options=list(team_options.keys()),
+                           default=list(team_options.keys())[:4], key="timeline_teams")
+    if teams:
+        team_ids = tuple(sorted(team_options[t] for t in teams))
+        key = ("team_form", team_ids, versions.version("matches", "team"), charts.VIEWPORT_POINTS)
+        form = cache.get_or_build(key, lambda: build_team_form_figure(team_ids, team_names))
+        if form and form['points']:
+            st.plotly_chart(form['figure'], use_container_width=True)
+            st.caption(f"Showing {form['shown']:,} of {form['points']:,} results")
+        elif form is not None:
+            st.info("No matches for these teams")
+
+    st.caption(f"🗄️ Queries for this view: {query_count() - queries_before}")
+
+
+def timelines():
+    """Career and team-results timelines over the full history"""
+    st.subheader("📉 Timelines")
+
+    player_options = session_frame("timeline_players", load_player_names, tables=("player",)) or {}
+    lookups = session_frame("h2h_lookups", load_lookups, tables=("team", "tournament"))
+    team_options = lookups[0] if lookups else {}
+
+    if not player_options and not team_options:
+        st.info("No players or teams available")
+        return
+
+    timelines_view(player_options, team_options)
+
+
+def render():
+    """Analytics tabs"""
+    st.header("📈 Analytics")
+
+    analytics_tab = st.tabs(["🤝 Head-to-Head", "📈 Team Ratings", "📅 Seasons", "📉 Timelines"])
+
+    with analytics_tab[0]:
+        head_to_head_analytics()
+
+    with analytics_tab[1]:
+        team_ratings()
+
+    with analytics_tab[2]:
+        season_explorer()
+
+    with analytics_tab[3]:
+        timelines()
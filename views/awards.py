@@ -0,0 +1,159 @@
+"""
+Award pages
+"""
+
+from datetime import date
+
+import streamlit as st
+import pandas as pd
+
+from db import execute_query
+from services import award_list, award_timeline, award_counts, award_page
+
+
+AWARD_COLUMNS = ['award_id', 'award_name', 'player_name', 'match_id', 'date_of_match', 'award_date', 'description']
+RECOGNITION_COLUMNS = ['award_name', 'first_name', 'last_name', 'match_id', 'date_of_match', 'award_date',
+                       'description']
+
+
+def award_picker(label, key):
+    """
+    Select an award from one keyset page at a time (newest first) instead
+    of loading every award into the selectbox.  Returns the award row or None.
+    """
+    # Start of every page visited so far: None for the first, then (award_date, award_id)
+    pages = st.session_state.setdefault(f"{key}_pages", [None])
+    rows, more = award_page(pages[-1])
+    if rows is None:
+        return None
+    if not rows:
+        st.info("No awards found.")
+        return None
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("◀ Newer", disabled=len(pages) == 1, key=f"{key}_newer", use_container_width=True):
+            pages.pop()
+            st.rerun()
+    with col2:
+        st.caption(f"Page {len(pages)}")
+    with col3:
+        if st.button("Older ▶", disabled=not more, key=f"{key}_older", use_container_width=True):
+            pages.append((rows[-1]['award_date'], rows[-1]['award_id']))
+            st.rerun()
+
+    options = {f"{a['award_name']} (ID: {a['award_id']}, {a['award_date']})": a for a in rows}
+    selected = st.selectbox(label, options=list(options), key=f"{key}_select")
+    return options[selected]
+
+
+def create_award():
+    st.subheader("Add New Award")
+    with st.form(key="create_award_form"):
+        award_name = st.text_input("Award Name")
+        # Get player options from DB
+        players = execute_query("SELECT player_id, CONCAT(f_name, ' ', l_name) AS name FROM player ORDER BY name", fetch=True)
+        player_options = {f"{p['name']} (ID: {p['player_id']})": p['player_id'] for p in players} if players else {}
+
+        player_id = st.selectbox("Select Player", options=list(player_options.keys()))
+        player_id_val = player_options[player_id] if player_id else None
+
+        # Get match options from DB
+        matches = execute_query("SELECT match_id, date_of_match FROM matches ORDER BY date_of_match DESC", fetch=True)
+        match_options = {f"Match {m['match_id']} on {m['date_of_match']}": m['match_id'] for m in matches} if matches else {}
+
+        match_id = st.selectbox("Select Match", options=list(match_options.keys()))
+        match_id_val = match_options[match_id] if match_id else None
+
+        award_date = st.date_input("Award Date", value=date.today())
+        description = st.text_area("Description")
+        submitted = st.form_submit_button("Add Award")
+        if submitted:
+            insert_q = "INSERT INTO award (award_name, player_id, match_id, award_date, description) VALUES (%s, %s, %s, %s, %s)"
+            params = (award_name, player_id_val, match_id_val, award_date, description)
+            if execute_query(insert_q, params):
+                st.success("Award added successfully!")
+            else:
+                st.error("Failed to add award.")
+
+def read_awards():
+    st.subheader("View All Awards")
+    awards = award_list()
+    if awards:
+        df = pd.DataFrame(awards, columns=AWARD_COLUMNS)
+        st.dataframe(df, use_container_width=True, hide_index=True)
+        award_insights(df['award_date'].min(), df['award_date'].max())
+    else:
+        st.info("No awards found.")
+
+
+def award_insights(first, last):
+    """Monthly award timeline and per-player totals (both index-backed queries)"""
+    with st.expander("📅 Awards timeline"):
+        period = st.date_input("Period", value=(first, last), key="award_timeline_period")
+        if len(period) == 2:
+            timeline = award_timeline(*period)
+            if timeline:
+                st.bar_chart(pd.DataFrame(timeline).set_index('month_start')['awards'])
+            elif timeline is not None:
+                st.info("No awards in this period.")
+
+    with st.expander("🏅 Awards per player"):
+        counts = award_counts()
+        if counts:
+            st.dataframe(pd.DataFrame(counts), use_container_width=True, hide_index=True)
+
+
+def update_award():
+    st.subheader("Update Award")
+    award = award_picker("Select Award to Update", "update_award")
+    if award is None:
+        return
+    new_award_name = st.text_input("New Award Name", value=award['award_name'])
+    new_date = st.date_input("Award Date", value=award['award_date'])
+    new_desc = st.text_area("New Description", value=award['description'] or "")
+    if st.button("Update Award"):
+        update_q = "UPDATE award SET award_name=%s, award_date=%s, description=%s WHERE award_id=%s"
+        params = (new_award_name, new_date, new_desc, award['award_id'])
+        if execute_query(update_q, params):
+            st.success("Award updated successfully!")
+        else:
+            st.error("Failed to update award.")
+
+def delete_award():
+    st.subheader("Delete Award")
+    award = award_picker("Select Award to Delete", "delete_award")
+    if award is None:
+        return
+    if st.button("Confirm Delete"):
+        del_q = "DELETE FROM award WHERE award_id=%s"
+        if execute_query(del_q, (award['award_id'],)):
+            st.success("Award deleted successfully!")
+        else:
+            st.error("Failed to delete award.")
+
+
+def show_awards_and_recognition():
+    st.subheader("Awards and Recognition")
+    awards = award_list()
+    if awards:
+        df = pd.DataFrame(awards).rename(columns={'f_name': 'first_name', 'l_name': 'last_name'})
+        st.dataframe(df[RECOGNITION_COLUMNS], use_container_width=True, hide_index=True)
+    else:
+        st.info("No awards or recognition found.")
+
+
+def render():
+    """Award CRUD tabs (read-only for users)"""
+    st.header("Awards CRUD")
+    crudtab = st.tabs(["Create", "Read", "Update", "Delete"])
+    # Only admin sees all tabs; others see read only
+    if st.session_state["role"] == "admin":
+        with crudtab[0]: create_award()
+        with crudtab[1]: read_awards()
+        with crudtab[2]: update_award()
+        with crudtab[3]: delete_award()
+    else:
+        with crudtab[1]: read_awards()
+        for i in [0,2,3]:
+            with crudtab[i]: st.warning("Admin privileges required.")
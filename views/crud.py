@@ -0,0 +1,338 @@
+"""
+Player CRUD pages
+"""
+
+import streamlit as st
+import pandas as pd
+from datetime import date
+
+from cricketdb.dedup import PLAYERS_QUERY as DEDUP_QUERY, find_duplicates
+from cricketdb.frames import IndexedFrame
+from db import execute_query, execute_insert, execute_prepared, query_count, session_frame
+from services import merge_players, save_performance_sketches
+
+
+# CRUD OPERATIONS - CREATE
+def create_player():
+    """Create new player"""
+    st.subheader("➕ Add New Player")
+
+    with st.form(key="create_player_form"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            f_name = st.text_input("First Name")
+            l_name = st.text_input("Last Name")
+            dob = st.date_input("Date of Birth", min_value=date(1950, 1, 1), max_value=date.today())
+
+        with col2:
+            teams = execute_query("SELECT team_id, team_name FROM team ORDER BY team_name", fetch=True)
+            team_options = {t['team_name']: t['team_id'] for t in teams} if teams else {}
+
+            if not team_options:
+                st.error("No teams available")
+                return
+
+            selected_team = st.selectbox("Team", options=list(team_options.keys()))
+
+            roles = execute_query("SELECT role_id, role_name FROM role ORDER BY role_name", fetch=True)
+            role_options = {r['role_name']: r['role_id'] for r in roles} if roles else {}
+
+            if not role_options:
+                st.error("No roles available")
+                return
+
+            selected_role = st.selectbox("Role", options=list(role_options.keys()))
+
+        submitted = st.form_submit_button("✅ Add Player", use_container_width=True)
+
+        if submitted:
+            if not f_name or not l_name:
+                st.error("Please fill all fields")
+            else:
+                query = """INSERT INTO player (f_name, l_name, dob, team_id, role_id)
+                          VALUES (%s, %s, %s, %s, %s)"""
+                params = (f_name, l_name, dob, team_options[selected_team], role_options[selected_role])
+
+                player_id = execute_insert(query, params)
+                if player_id:
+                    st.success(f"Player {f_name} {l_name} added successfully! (ID: {player_id})")
+                else:
+                    st.error("Failed to add player")
+
+
+# CRUD OPERATIONS - READ
+PLAYERS_QUERY = """
+SELECT p.player_id, p.f_name, p.l_name,
+       p.dob, p.age, t.team_name, r.role_name
+FROM player p
+JOIN team t ON p.team_id = t.team_id
+JOIN role r ON p.role_id = r.role_id
+ORDER BY p.player_id
+"""
+
+PLAYER_COLUMNS = ['player_id', 'f_name', 'l_name', 'dob', 'age', 'team_name', 'role_name']
+
+PLAYER_SORTS = {
+    "Player ID": ('player_id', True),
+    "First Name": ('f_name', True),
+    "Age": ('age', False),
+    "Team": ('team_name', True),
+}
+
+
+def load_players():
+    """Teams, roles and the indexed player frame for the View Players tab"""
+    teams = execute_query("SELECT DISTINCT team_name FROM team ORDER BY team_name", fetch=True)
+    roles = execute_query("SELECT DISTINCT role_name FROM role ORDER BY role_name", fetch=True)
+    players = execute_query(PLAYERS_QUERY, fetch=True)
+    if teams is None or roles is None or players is None:
+        return None
+
+    team_list = [t['team_name'] for t in teams]
+    role_list = [r['role_name'] for r in roles]
+    frame = IndexedFrame(pd.DataFrame(players, columns=PLAYER_COLUMNS),
+                         keys=['team_name', 'role_name'], sorts=PLAYER_SORTS)
+    return team_list, role_list, frame
+
+
+@st.fragment
+def players_view(team_list, role_list, players):
+    """Filters and sorting rerun only this fragment, against the cached frame"""
+    queries_before = query_count()
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        selected_teams = st.multiselect("Filter by Team", options=team_list, key="filter_team")
+
+    with col2:
+        selected_roles = st.multiselect("Filter by Role", options=role_list, key="filter_role")
+
+    with col3:
+        sort_by = st.selectbox("Sort By", options=list(PLAYER_SORTS))
+
+    if players.empty:
+        st.info("No players found")
+        return
+
+    df = players.select({'team_name': selected_teams, 'role_name': selected_roles}, sort=sort_by)
+
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Players", len(df))
+    with col2:
+        st.metric("Teams", df['team_name'].nunique())
+    with col3:
+        st.metric("Roles", df['role_name'].nunique())
+    with col4:
+        st.metric("Avg Age", int(df['age'].mean()) if len(df) > 0 else 0)
+
+    st.caption(f"🗄️ Queries for this view: {query_count() - queries_before}")
+
+
+def read_players():
+    """Display all players with filters and sorting"""
+    st.subheader("👥 View Players")
+
+    loaded = session_frame("players", load_players, tables=("player", "team", "role"))
+    if loaded is None:
+        st.info("No players found")
+        return
+
+    players_view(*loaded)
+
+
+# CRUD OPERATIONS - UPDATE
+def update_player():
+    """Update player information"""
+    st.subheader("✏️ Update Player")
+
+    players = execute_query(
+        "SELECT player_id, CONCAT(f_name, ' ', l_name) as name FROM player ORDER BY player_id",
+        fetch=True
+    )
+
+    if not players:
+        st.info("No players available")
+        return
+
+    player_options = {f"{p['name']} (ID: {p['player_id']})" : p['player_id'] for p in players}
+    selected = st.selectbox("Select Player", options=list(player_options.keys()))
+    player_id = player_options[selected]
+
+    current_data = execute_prepared("player_by_id", (player_id,))
+
+    if not current_data:
+        st.error("Player not found")
+        return
+
+    current = current_data[0]
+
+    with st.form(key="update_player_form"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            f_name = st.text_input("First Name", value=current['f_name'])
+            l_name = st.text_input("Last Name", value=current['l_name'])
+
+        with col2:
+            teams = execute_query("SELECT team_id, team_name FROM team ORDER BY team_name", fetch=True)
+            team_options = {t['team_name']: t['team_id'] for t in teams} if teams else {}
+
+            if current['team_id'] in [v for v in team_options.values()]:
+                current_team = [k for k, v in team_options.items() if v == current['team_id']][0]
+                selected_team = st.selectbox("Team", options=list(team_options.keys()),
+                                            index=list(team_options.keys()).index(current_team))
+            else:
+                selected_team = st.selectbox("Team", options=list(team_options.keys()))
+
+            roles = execute_query("SELECT role_id, role_name FROM role ORDER BY role_name", fetch=True)
+            role_options = {r['role_name']: r['role_id'] for r in roles} if roles else {}
+
+            if current['role_id'] in [v for v in role_options.values()]:
+                current_role = [k for k, v in role_options.items() if v == current['role_id']][0]
+                selected_role = st.selectbox("Role", options=list(role_options.keys()),
+                                            index=list(role_options.keys()).index(current_role))
+            else:
+                selected_role = st.selectbox("Role", options=list(role_options.keys()))
+
+        submitted = st.form_submit_button("💾 Update Player", use_container_width=True)
+
+        if submitted:
+            query = """UPDATE player 
+                      SET f_name = %s, l_name = %s, team_id = %s, role_id = %s 
+                      WHERE player_id = %s"""
+            params = (f_name, l_name, team_options[selected_team], 
+                     role_options[selected_role], player_id)
+
+            if execute_query(query, params):
+                st.success("Player updated successfully!")
+            else:
+                st.error("Failed to update player")
+
+
+# CRUD OPERATIONS - DELETE
+def delete_player():
+    """Delete player"""
+    st.subheader("🗑️ Delete Player")
+
+    players = execute_query(
+        "SELECT player_id, CONCAT(f_name, ' ', l_name) as name FROM player ORDER BY player_id",
+        fetch=True
+    )
+
+    if not players:
+        st.info("No players available")
+        return
+
+    player_options = {f"{p['name']} (ID: {p['player_id']})" : p['player_id'] for p in players}
+    selected = st.selectbox("Select Player to Delete", options=list(player_options.keys()))
+    player_id = player_options[selected]
+
+    st.warning(f"⚠️ WARNING: Deleting {selected}")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        if st.button("❌ Confirm Delete", use_container_width=True):
+            try:
+                if execute_query("DELETE FROM player_performance WHERE player_id = %s", (player_id,)):
+                    save_performance_sketches()
+                execute_query("DELETE FROM award WHERE player_id = %s", (player_id,))
+
+                if execute_query("DELETE FROM player WHERE player_id = %s", (player_id,)):
+                    st.success("Player deleted successfully!")
+                    st.rerun()
+                else:
+                    st.error("Failed to delete player")
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
+
+    with col2:
+        if st.button("↩️ Cancel", use_container_width=True):
+            st.info("Delete cancelled")
+
+
+# DUPLICATES
+def load_duplicates(threshold):
+    """Player names by id and the likely duplicate pairs at `threshold`"""
+    players = execute_query(DEDUP_QUERY, fetch=True)
+    if players is None:
+        return None
+    names = {p['player_id']: f"{p['f_name']} {p['l_name']}" for p in players}
+    return names, find_duplicates(players, threshold)
+
+
+def merge_duplicates():
+    """Review likely duplicate players and merge a pair"""
+    st.subheader("🧬 Duplicate Players")
+
+    threshold = st.slider("Match threshold", min_value=0.6, max_value=1.0, value=0.8, step=0.05,
+                          key="dedup_threshold")
+    loaded = session_frame("duplicates", load_duplicates, threshold, tables=("player",))
+    if loaded is None:
+        return
+    names, pairs = loaded
+    if not pairs:
+        st.success("No likely duplicates found")
+        return
+
+    df = pd.DataFrame(pairs)
+    df.insert(1, "keep_name", df['keep_id'].map(names))
+    df.insert(3, "duplicate_name", df['duplicate_id'].map(names))
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+    pair_options = {f"{names[p['keep_id']]} (ID: {p['keep_id']}) ↔ "
+                    f"{names[p['duplicate_id']]} (ID: {p['duplicate_id']})": p for p in pairs}
+    pair = pair_options[st.selectbox("Pair to merge", options=list(pair_options), key="dedup_pair")]
+    keep_id = st.radio("Record to keep", options=[pair['keep_id'], pair['duplicate_id']],
+                       format_func=lambda player_id: f"{names[player_id]} (ID: {player_id})",
+                       horizontal=True, key="dedup_keep")
+    duplicate_id = pair['duplicate_id'] if keep_id == pair['keep_id'] else pair['keep_id']
+
+    st.warning(f"⚠️ Performances and awards of ID {duplicate_id} move to ID {keep_id}, "
+               f"then ID {duplicate_id} is deleted")
+    if st.button("🔗 Merge Players", use_container_width=True, key="dedup_merge"):
+        moved = merge_players(keep_id, duplicate_id)
+        if moved is None:
+            st.error("Failed to merge players")
+        else:
+            st.success(f"Players merged: {moved[0]} performances and {moved[1]} awards moved")
+            st.rerun()
+
+
+def render():
+    """Player CRUD tabs"""
+    st.header("📝 CRUD Operations")
+
+    crud_tab = st.tabs(["✅ Create", "👁️ Read", "✏️ Update", "🗑️ Delete", "🧬 Duplicates"])
+
+    with crud_tab[0]:
+        if st.session_state.role == "admin":
+            create_player()
+        else:
+            st.warning("⛔ Admin privileges required")
+
+    with crud_tab[1]:
+        read_players()
+
+    with crud_tab[2]:
+        if st.session_state.role == "admin":
+            update_player()
+        else:
+            st.warning("⛔ Admin privileges required")
+
+    with crud_tab[3]:
+        if st.session_state.role == "admin":
+            delete_player()
+        else:
+            st.warning("⛔ Admin privileges required")
+
+    with crud_tab[4]:
+        if st.session_state.role == "admin":
+            merge_duplicates()
+        else:
+            st.warning("⛔ Admin privileges required")
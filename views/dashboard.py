@@ -0,0 +1,57 @@
+"""
+Dashboard page
+"""
+
+import streamlit as st
+import pandas as pd
+
+from cricketdb.sharding import Merge
+from db import execute_query
+
+
+def render():
+    """Dashboard with counts and recent matches"""
+    st.header("📊 Dashboard")
+
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        player_count = execute_query("SELECT COUNT(*) as count FROM player", fetch=True)
+        count = player_count[0]['count'] if player_count else 0
+        st.metric("Players", count)
+
+    with col2:
+        team_count = execute_query("SELECT COUNT(*) as count FROM team", fetch=True)
+        count = team_count[0]['count'] if team_count else 0
+        st.metric("Teams", count)
+
+    with col3:
+        match_count = execute_query("SELECT COUNT(*) as count FROM matches", fetch=True,
+                                    merge=Merge(sums=("count",)))
+        count = match_count[0]['count'] if match_count else 0
+        st.metric("Matches", count)
+
+    with col4:
+        tourn_count = execute_query("SELECT COUNT(*) as count FROM tournament", fetch=True)
+        count = tourn_count[0]['count'] if tourn_count else 0
+        st.metric("Tournaments", count)
+
+    st.markdown("---")
+
+    st.subheader("📋 Recent Matches")
+    recent = execute_query("""
+        SELECT m.match_id, t1.team_name as winner, t2.team_name as loser,
+               m.date_of_match, m.location, tour.tournament_name
+        FROM matches m
+        JOIN team t1 ON m.winning_team_id = t1.team_id
+        JOIN team t2 ON m.losing_team_id = t2.team_id
+        JOIN tournament tour ON m.tournament_id = tour.tournament_id
+        ORDER BY m.date_of_match DESC
+        LIMIT 5
+    """, fetch=True, merge=Merge(order_by=[("date_of_match", True)], limit=5))
+
+    if recent:
+        df = pd.DataFrame(recent)
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    else:
+        st.info("No matches found")
@@ -0,0 +1,195 @@
+"""
+Match management pages
+"""
+
+import streamlit as st
+import pandas as pd
+
+from db import execute_query, execute_prepared
+from services import insert_match, rate_new_match, load_performances
+
+
+# CREATE NEW MATCH
+def create_match():
+    """Create new match and add player performances"""
+    st.subheader("➕ Create New Match")
+    
+    with st.form(key="create_match_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            teams = execute_query("SELECT team_id, team_name FROM team ORDER BY team_name", fetch=True)
+            team_options = {t['team_name']: t['team_id'] for t in teams} if teams else {}
+            
+            if not team_options:
+                st.error("No teams available")
+                return
+            
+            winning_team = st.selectbox("Winning Team", list(team_options.keys()), key="new_win_team")
+            losing_team = st.selectbox("Losing Team", list(team_options.keys()), key="new_lose_team")
+        
+        with col2:
+            date_of_match = st.date_input("Match Date", key="new_match_date")
+            location = st.text_input("Match Location", key="new_match_location")
+            
+            tournaments = execute_query("SELECT tournament_id, tournament_name FROM tournament ORDER BY tournament_name", fetch=True)
+            tournament_options = {t['tournament_name']: t['tournament_id'] for t in tournaments} if tournaments else {}
+            
+            if not tournament_options:
+                st.error("No tournaments available")
+                return
+            
+            tournament = st.selectbox("Tournament", list(tournament_options.keys()), key="new_tournament")
+        
+        submitted = st.form_submit_button("✅ Create Match", use_container_width=True)
+        
+        if submitted:
+            if winning_team == losing_team:
+                st.error("Winning and Losing teams cannot be the same!")
+            else:
+                match_id = insert_match(team_options[winning_team], team_options[losing_team],
+                                        date_of_match, location, tournament_options[tournament])
+                if match_id:
+                    rated = rate_new_match(match_id, team_options[winning_team], team_options[losing_team],
+                                           date_of_match)
+                    st.success(f"Match {match_id} created successfully!")
+                    st.session_state.created_match_id = match_id
+                    if not rated:
+                        # The match is saved; stay on this run so the warning stays visible
+                        st.warning("Team ratings were not updated - "
+                                   "use 🔄 Rebuild Ratings under Analytics → Team Ratings")
+                        return
+                    st.rerun()
+                else:
+                    st.error("Failed to create match")
+
+
+# ADD PLAYER PERFORMANCE FOR MATCH
+def add_player_performance_for_match():
+    """Add both teams' performances for a match from one editable scorecard"""
+    st.subheader("📊 Add Player Performance to Match")
+    
+    matches = execute_query(
+        """SELECT m.match_id, CONCAT('Match ', m.match_id, ': ', t1.team_name, ' vs ', t2.team_name, ' on ', m.date_of_match) as name
+           FROM matches m
+           JOIN team t1 ON m.winning_team_id = t1.team_id
+           JOIN team t2 ON m.losing_team_id = t2.team_id
+           ORDER BY m.date_of_match DESC""", fetch=True)
+    
+    if not matches:
+        st.info("No matches available. Create a match first!")
+        return
+    
+    match_options = {m['name']: m['match_id'] for m in matches}
+    selected_match = st.selectbox("Select Match", options=list(match_options.keys()))
+    match_id = match_options[selected_match]
+    
+    match_data = execute_prepared("match_details_by_id", (match_id,))
+    
+    if not match_data:
+        st.error("Match not found")
+        return
+    
+    match_info = match_data[0]
+    
+    st.info(f"**Match Details:** Winner: {match_info['winning_team']} - Loser: {match_info['losing_team']} - Date: {match_info['date_of_match']} - Location: {match_info['location']}")
+    
+    # Scorecard: every player of both teams without a performance in this match yet
+    players = execute_query(
+        """SELECT p.player_id, CONCAT(p.f_name, ' ', p.l_name) as player_name, t.team_name
+           FROM player p
+           JOIN team t ON p.team_id = t.team_id
+           WHERE p.team_id IN (%s, %s)
+             AND p.player_id NOT IN (SELECT player_id FROM player_performance WHERE match_id = %s)
+           ORDER BY t.team_name, player_name""",
+        (match_info['winning_team_id'], match_info['losing_team_id'], match_id), fetch=True)
+
+    if not players:
+        st.info("Every player of both teams already has a performance in this match")
+    else:
+        format_options = ["One Day", "Test", "T20"]
+        default_format = st.selectbox("Match Format", options=format_options, key="scorecard_format")
+
+        scorecard = pd.DataFrame(players).set_index('player_id')
+        scorecard.insert(0, 'played', False)
+        scorecard['runs_scored'] = 0
+        scorecard['wickets_taken'] = 0
+        scorecard['format'] = default_format
+        scorecard['avg'] = 0.0
+
+        with st.form(key="scorecard_form"):
+            st.caption("Tick the players who played and fill in their figures, then save the whole scorecard at once.")
+            edited = st.data_editor(
+                scorecard,
+                hide_index=True,
+                use_container_width=True,
+                disabled=['player_name', 'team_name'],
+                column_config={
+                    'played': st.column_config.CheckboxColumn("Played"),
+                    'player_name': "Player",
+                    'team_name': "Team",
+                    'runs_scored': st.column_config.NumberColumn("Runs", min_value=0, step=1),
+                    'wickets_taken': st.column_config.NumberColumn("Wickets", min_value=0, max_value=20, step=1),
+                    'format': st.column_config.SelectboxColumn("Format", options=format_options, required=True),
+                    'avg': st.column_config.NumberColumn("Average", min_value=0.0, step=0.1, format="%.2f")
+                },
+                key=f"scorecard_{match_id}"
+            )
+
+            submitted = st.form_submit_button("💾 Save Scorecard", use_container_width=True)
+
+        if submitted:
+            rows = edited[edited['played']].fillna({'runs_scored': 0, 'wickets_taken': 0, 'avg': 0.0})
+            if rows.empty:
+                st.warning("Tick at least one player")
+            else:
+                # performance_id is AUTO_INCREMENT: one multi-row INSERT, one contiguous ID block,
+                # then one set-based promotion pass instead of a trigger UPDATE per row
+                params = [(int(player_id), match_id, int(row['runs_scored']), int(row['wickets_taken']),
+                           row['format'], float(row['avg']))
+                          for player_id, row in rows.iterrows()]
+
+                loaded = load_performances(params)
+                if loaded:
+                    new_ids, promoted = loaded
+                    st.success(f"Saved {len(new_ids)} performance records (IDs {new_ids[0]}-{new_ids[-1]}), "
+                               f"{promoted} player(s) promoted to All-Rounder")
+                    st.rerun()
+                else:
+                    st.error("Failed to save scorecard")
+
+    # Show existing performances for this match
+    st.markdown("---")
+    st.subheader("Existing Performances in this Match")
+    
+    existing_perfs = execute_query(
+        """SELECT pp.performance_id, p.f_name, p.l_name, pp.runs_scored, pp.wickets_taken, pp.format, pp.avg
+           FROM player_performance pp
+           JOIN player p ON pp.player_id = p.player_id
+           WHERE pp.match_id = %s
+           ORDER BY pp.performance_id""", (match_id,), fetch=True)
+    
+    if existing_perfs:
+        df = pd.DataFrame(existing_perfs)
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    else:
+        st.info("No performances added yet for this match")
+
+
+def render():
+    """Match management tabs"""
+    st.header("🎯 Match Management")
+
+    match_tab = st.tabs(["➕ Create Match", "📊 Add Player Performance"])
+
+    with match_tab[0]:
+        if st.session_state.role == "admin":
+            create_match()
+        else:
+            st.warning("⛔ Admin privileges required")
+
+    with match_tab[1]:
+        if st.session_state.role == "admin":
+            add_player_performance_for_match()
+        else:
+            st.warning("⛔ Admin privileges required")
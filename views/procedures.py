@@ -0,0 +1,145 @@
+"""
+Stored procedure and function pages
+"""
+
+import streamlit as st
+import pandas as pd
+
+from db import execute_query
+from services import get_procedure_runner, refresh_form_index, run_procedure_batch
+
+
+# PROCEDURES & FUNCTIONS
+def call_procedure():
+    """Call stored procedure for one or many teams in a single batch"""
+    st.subheader("🔧 Stored Procedure: Get Players by Team")
+
+    teams = execute_query("SELECT team_name FROM team ORDER BY team_name", fetch=True)
+    team_list = [t['team_name'] for t in teams] if teams else []
+
+    if not team_list:
+        st.error("No teams available")
+        return
+
+    mode = st.radio("Run For", ["Selected Teams", "All Teams in a Tournament"], horizontal=True,
+                    key="proc_mode")
+
+    if mode == "Selected Teams":
+        selected_teams = st.multiselect("Select Teams", options=team_list, default=team_list[:1],
+                                        key="proc_teams")
+    else:
+        tournaments = execute_query("SELECT tournament_id, tournament_name FROM tournament ORDER BY tournament_name",
+                                    fetch=True)
+        tournament_options = {t['tournament_name']: t['tournament_id'] for t in tournaments} if tournaments else {}
+        if not tournament_options:
+            st.error("No tournaments available")
+            return
+
+        tournament = st.selectbox("Select Tournament", options=list(tournament_options.keys()), key="proc_tournament")
+        tournament_teams = execute_query(
+            """SELECT DISTINCT t.team_name
+               FROM played_in pi
+               JOIN matches m ON pi.match_id = m.match_id
+               JOIN team t ON pi.team_id = t.team_id
+               WHERE m.tournament_id = %s
+               ORDER BY t.team_name""",
+            (tournament_options[tournament],),
+            fetch=True,
+            tournament=tournament_options[tournament]
+        )
+        selected_teams = [t['team_name'] for t in tournament_teams] if tournament_teams else []
+        st.caption(f"{len(selected_teams)} teams: {', '.join(selected_teams) or 'none'}")
+
+    if st.button("▶️ Execute Procedure", use_container_width=True):
+        if not selected_teams:
+            st.warning("Select at least one team")
+            return
+
+        results = run_procedure_batch('GetPlayersByTeam', [(team,) for team in selected_teams])
+        if results is None:
+            return
+
+        runner = get_procedure_runner()
+        st.caption(f"Batch of {len(selected_teams)} calls - cache hits so far: {runner.hits}, "
+                   f"procedure calls: {runner.misses}")
+
+        sheets = []
+        for team, result_sets in zip(selected_teams, results):
+            players = result_sets[0] if result_sets else []
+            with st.expander(f"{team} ({len(players)} players)", expanded=len(selected_teams) == 1):
+                if players:
+                    df = pd.DataFrame(players)
+                    st.dataframe(df, use_container_width=True, hide_index=True)
+                    sheets.append(df.assign(team_name=team))
+                else:
+                    st.info("No players found for this team")
+
+        if sheets:
+            st.download_button("⬇️ Download Squad Sheets (CSV)",
+                               pd.concat(sheets, ignore_index=True).to_csv(index=False),
+                               file_name="squad_sheets.csv", mime="text/csv", use_container_width=True)
+
+
+def call_function():
+    """Call function"""
+    st.subheader("⚡ Function: Get Player Batting Average")
+
+    players = execute_query(
+        "SELECT player_id, CONCAT(f_name, ' ', l_name) as name FROM player ORDER BY f_name",
+        fetch=True
+    )
+
+    if not players:
+        st.info("No players available")
+        return
+
+    player_options = {f"{p['name']} (ID: {p['player_id']})" : p['player_id'] for p in players}
+    selected = st.selectbox("Select Player", options=list(player_options.keys()))
+    player_id = player_options[selected]
+
+    if st.button("📊 Calculate Average", use_container_width=True):
+        result = execute_query(
+            "SELECT GetPlayerBattingAvg(%s) as batting_avg",
+            (player_id,),
+            fetch=True
+        )
+
+        if result and result[0]:
+            avg = result[0]['batting_avg']
+            if hasattr(avg, '__float__'):
+                avg = float(avg)
+            st.metric("Batting Average", f"{avg:.2f}")
+
+            form = refresh_form_index()
+            history = form.player_history(player_id)
+
+            if len(history):
+                st.subheader("Current Form")
+                latest = form.latest(player_id)
+                form_cols = st.columns(len(latest))
+                for col, (_, row) in zip(form_cols, latest.iterrows()):
+                    with col:
+                        st.metric(f"{row['format']} runs (EWMA)", f"{row['runs_scored_ewma']:.1f}")
+                        st.metric(f"{row['format']} wickets (EWMA)", f"{row['wickets_taken_ewma']:.2f}")
+
+                st.subheader("Performance History")
+                st.caption(f"Rolling mean over the last {form.window} matches per format; "
+                           f"EWMA with a half-life of {form.halflife:g} matches")
+                st.dataframe(
+                    history[['match_id', 'date_of_match', 'format', 'runs_scored', 'runs_scored_rolling',
+                             'runs_scored_ewma', 'wickets_taken', 'wickets_taken_rolling', 'wickets_taken_ewma']],
+                    use_container_width=True, hide_index=True
+                )
+
+
+def render():
+    """Procedure and function tabs"""
+    st.header("🔧 Procedures & Functions")
+
+    pf_tab = st.tabs(["📋 Stored Procedure", "⚙️ Function"])
+
+    with pf_tab[0]:
+        call_procedure()
+
+    with pf_tab[1]:
+        call_function()
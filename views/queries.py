@@ -0,0 +1,369 @@
+"""
+Advanced query pages (online against MySQL, or offline from snapshots)
+"""
+
+import os
+
+import streamlit as st
+import pandas as pd
+from mysql.connector import Error
+
+from cricketdb import versions
+from cricketdb.frames import IndexedFrame
+from cricketdb.sharding import Merge
+from db import execute_query, execute_report, init_connection, query_count, session_frame
+from services import refresh_performance_sketches
+
+
+# ADVANCED QUERIES
+NESTED_CUTS = {
+    "Above Average": None,
+    "Above Median": 0.5,
+    "Top 25%": 0.75,
+    "Top 10%": 0.9,
+}
+
+
+def nested_query():
+    """Nested query - Players above average (thresholds from the runs sketches)"""
+    st.subheader("🔍 Nested Query: Players Above Average")
+
+    sketches = refresh_performance_sketches()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        cut = st.selectbox("Threshold", options=list(NESTED_CUTS), key="nested_cut")
+    with col2:
+        scope = st.selectbox("Format", options=["All Formats"] + sketches.keys("format"), key="nested_format")
+
+    digest = sketches.get("runs_scored") if scope == "All Formats" else \
+        sketches.get("runs_scored", "format", scope)
+    if not len(digest):
+        st.warning("No results found")
+        return
+
+    quantile = NESTED_CUTS[cut]
+    threshold = digest.mean if quantile is None else digest.quantile(quantile)
+
+    # The threshold comes from the sketch, so MySQL no longer re-scans for AVG()
+    query = """
+    SELECT p.player_id, CONCAT(p.f_name, ' ', p.l_name) as player_name, 
+           t.team_name, pp.runs_scored, pp.format
+    FROM player p
+    JOIN team t ON p.team_id = t.team_id
+    JOIN player_performance pp ON p.player_id = pp.player_id
+    WHERE pp.runs_scored > %s
+    """
+    params = [threshold]
+    if scope != "All Formats":
+        query += " AND pp.format = %s"
+        params.append(scope)
+    query += " ORDER BY pp.runs_scored DESC"
+
+    results = execute_query(query, tuple(params), fetch=True, merge=Merge(order_by=[("runs_scored", True)]))
+
+    if results:
+        df = pd.DataFrame(results)
+        st.dataframe(df, use_container_width=True, hide_index=True)
+    else:
+        st.warning("No results found")
+
+    st.info(f"Average runs scored: {digest.mean:.2f} · median {digest.quantile(0.5):.1f} · "
+            f"top 10% from {digest.quantile(0.9):.1f} ({len(digest)} performances)")
+
+    with st.expander("📐 Runs and wickets distribution by format and tournament"):
+        st.dataframe(distribution_summary(sketches), use_container_width=True, hide_index=True)
+
+
+def load_tournament_names():
+    """Tournament id (as sketch key) -> name"""
+    tournaments = execute_query("SELECT tournament_id, tournament_name FROM tournament", fetch=True)
+    return None if tournaments is None else {str(t['tournament_id']): t['tournament_name'] for t in tournaments}
+
+
+def distribution_summary(sketches):
+    """Mean and percentile cuts for every sketch"""
+    tournament_names = session_frame("tournament_names", load_tournament_names, tables=("tournament",)) or {}
+    labels = {"all": lambda key: "Overall",
+              "format": lambda key: key,
+              "tournament": lambda key: tournament_names.get(key, f"Tournament {key}")}
+    rows = []
+    groups = [("all", "all")] + [("format", key) for key in sketches.keys("format")] + \
+             [("tournament", key) for key in sketches.keys("tournament")]
+    for dimension, key in groups:
+        for metric in ("runs_scored", "wickets_taken"):
+            digest = sketches.get(metric, dimension, key)
+            if not len(digest):
+                continue
+            rows.append({
+                'group': labels[dimension](key),
+                'metric': metric,
+                'performances': len(digest),
+                'mean': round(digest.mean, 2),
+                'median': round(digest.quantile(0.5), 2),
+                'p75': round(digest.quantile(0.75), 2),
+                'p90': round(digest.quantile(0.9), 2),
+                'max': digest.max
+            })
+    return pd.DataFrame(rows)
+
+
+JOIN_QUERY = """
+SELECT 
+    CONCAT(p.f_name, ' ', p.l_name) as player_name,
+    t.team_name,
+    r.role_name,
+    pp.runs_scored,
+    pp.wickets_taken,
+    pp.format,
+    m.date_of_match,
+    m.location
+FROM player p
+INNER JOIN team t ON p.team_id = t.team_id
+INNER JOIN role r ON p.role_id = r.role_id
+INNER JOIN player_performance pp ON p.player_id = pp.player_id
+INNER JOIN matches m ON pp.match_id = m.match_id
+ORDER BY pp.runs_scored DESC, pp.wickets_taken DESC
+"""
+
+JOIN_TABLES = ("player", "team", "role", "player_performance", "matches")
+
+JOIN_MERGE = Merge(order_by=[("runs_scored", True), ("wickets_taken", True)])
+
+JOIN_COLUMNS = ['player_name', 'team_name', 'role_name', 'runs_scored',
+                'wickets_taken', 'format', 'date_of_match', 'location']
+
+
+def load_join_results():
+    """Run the join once per data version into an indexed frame (already in query order)"""
+    results = execute_query(JOIN_QUERY, fetch=True, merge=JOIN_MERGE)
+    if results is None:
+        return None
+    return IndexedFrame(pd.DataFrame(results, columns=JOIN_COLUMNS),
+                        keys=['team_name', 'format'], sorts={})
+
+
+@st.fragment
+def join_results_view(results):
+    """Team/format filters rerun only this fragment"""
+    queries_before = query_count()
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        selected_team = st.multiselect("Filter by Team", options=results.options('team_name'))
+    with col2:
+        selected_format = st.multiselect("Filter by Format", options=results.options('format'))
+
+    filtered_df = results.select({'team_name': selected_team, 'format': selected_format})
+
+    st.dataframe(filtered_df, use_container_width=True, hide_index=True)
+    st.caption(f"🗄️ Queries for this view: {query_count() - queries_before}")
+
+
+def join_query():
+    """Join query - Player performance"""
+    st.subheader("🔗 Join Query: Player Performance Details")
+
+    results = session_frame("join_query", load_join_results, tables=JOIN_TABLES)
+
+    if results is not None and not results.empty:
+        join_results_view(results)
+    else:
+        st.warning("No results found")
+
+
+AGGREGATE_QUERY = """
+SELECT 
+    t.team_name,
+    COUNT(DISTINCT p.player_id) as total_players,
+    SUM(CASE WHEN m.winning_team_id = t.team_id THEN 1 ELSE 0 END) as matches_won,
+    SUM(CASE WHEN m.losing_team_id = t.team_id THEN 1 ELSE 0 END) as matches_lost,
+    COALESCE(SUM(pp.runs_scored), 0) as total_runs,
+    COALESCE(SUM(pp.wickets_taken), 0) as total_wickets,
+    COALESCE(AVG(pp.runs_scored), 0) as avg_runs_per_match,
+    COUNT(pp.performance_id) as innings
+FROM team t
+LEFT JOIN player p ON t.team_id = p.team_id
+LEFT JOIN player_performance pp ON p.player_id = pp.player_id
+LEFT JOIN matches m ON pp.match_id = m.match_id
+GROUP BY t.team_id, t.team_name
+ORDER BY matches_won DESC
+"""
+
+AGGREGATE_TABLES = ("team", "player", "player_performance", "matches")
+
+# Per-shard team statistics -> overall: every shard sees all of a team's
+# players, so the player count is the same everywhere (max); the average
+# is rebuilt from the summed runs and innings
+AGGREGATE_MERGE = Merge(
+    keys=("team_name",),
+    sums=("matches_won", "matches_lost", "total_runs", "total_wickets", "innings"),
+    maxes=("total_players",),
+    derive={"avg_runs_per_match": lambda row: row["total_runs"] / row["innings"] if row["innings"] else 0},
+    order_by=[("matches_won", True)]
+)
+
+
+def aggregate_query():
+    """Aggregate query - Team statistics (cancellable report)"""
+    st.subheader("📊 Aggregate Query: Team Statistics")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        run = st.button("▶️ Run Report", use_container_width=True, key="aggregate_run")
+    with col2:
+        # Clicking this while the report runs reruns the page, which kills the query
+        cancel = st.button("⏹️ Cancel", use_container_width=True, key="aggregate_cancel")
+
+    current = versions.version(*AGGREGATE_TABLES)
+    report = st.session_state.get('aggregate_report')
+
+    if cancel:
+        st.session_state.aggregate_report = {'version': current, 'rows': None, 'cancelled': True}
+        st.info("Report cancelled. Press Run Report to start it again.")
+        return
+
+    # Runs by itself on first view and after writes, unless the user cancelled it
+    if run or report is None or (report['version'] != current and not report['cancelled']):
+        rows = execute_report(AGGREGATE_QUERY, merge=AGGREGATE_MERGE)
+        report = {'version': current, 'rows': rows, 'cancelled': False}
+        st.session_state.aggregate_report = report
+
+    results = report['rows']
+    if results is None:
+        st.info("No report yet. Press Run Report to try again.")
+        return
+
+    if results:
+        df = pd.DataFrame(results)
+
+        for col in df.columns:
+            if df[col].dtype == 'object':
+                try:
+                    df[col] = pd.to_numeric(df[col])
+                except:
+                    pass
+
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric("Teams", len(df))
+        with col2:
+            st.metric("Total Players", int(df['total_players'].sum()))
+        with col3:
+            st.metric("Total Wins", int(df['matches_won'].sum()))
+        with col4:
+            st.metric("Total Runs", int(df['total_runs'].sum()))
+
+        st.dataframe(df, use_container_width=True, hide_index=True)
+
+        chart_data = df[['team_name', 'matches_won', 'matches_lost']].set_index('team_name')
+        st.bar_chart(chart_data)
+    else:
+        st.warning("No results found")
+
+
+# OFFLINE ANALYTICS (SNAPSHOTS)
+def snapshot_dir():
+    """Snapshot directory from secrets ([snapshots] path), default ./snapshots"""
+    return st.secrets.get("snapshots", {}).get("path", "snapshots")
+
+
+@st.cache_resource(max_entries=1)
+def load_snapshot_store(path, manifest_mtime):
+    """Memory-map a snapshot directory (reloaded when a new export lands)"""
+    from cricketdb.snapshots import SnapshotStore
+    return SnapshotStore(path)
+
+
+def offline_queries():
+    """Advanced queries answered from memory-mapped snapshots instead of MySQL"""
+    # pyarrow is only needed once offline mode is switched on
+    import pyarrow as pa
+    from cricketdb.snapshots import export_snapshots, MANIFEST
+
+    path = snapshot_dir()
+    manifest_path = os.path.join(path, MANIFEST)
+
+    if st.session_state.role == "admin":
+        if st.button("📤 Export New Snapshot", use_container_width=True):
+            conn = init_connection()
+            if conn:
+                try:
+                    with st.spinner("Exporting tables..."):
+                        manifest = export_snapshots(conn, path)
+                    st.success(f"Exported {sum(manifest['tables'].values())} rows to {path}")
+                except (Error, OSError, pa.ArrowException) as e:
+                    st.error(f"Export Error: {str(e)}")
+                finally:
+                    if conn.is_connected():
+                        conn.close()
+
+    if not os.path.exists(manifest_path):
+        st.info(f"No snapshot found in '{path}'. Run: python -m cricketdb.snapshots export --out {path}")
+        return
+
+    store = load_snapshot_store(path, os.path.getmtime(manifest_path))
+    st.caption(f"🗂️ Offline mode - snapshot exported at {store.manifest['exported_at']}"
+               f" (compression: {store.manifest['compression'] or 'none, memory-mapped'})")
+
+    query_tab = st.tabs(["🎯 Nested Query", "🔗 Join Query", "📊 Aggregate Query"])
+
+    with query_tab[0]:
+        st.subheader("🔍 Nested Query: Players Above Average")
+        results, avg_runs = store.nested_query()
+        if results.num_rows:
+            st.dataframe(results.to_pandas(), use_container_width=True, hide_index=True)
+            st.info(f"Average runs scored: {avg_runs:.2f}")
+        else:
+            st.warning("No results found")
+
+    with query_tab[1]:
+        st.subheader("🔗 Join Query: Player Performance Details")
+        df = store.join_query().to_pandas()
+        if len(df) > 0:
+            col1, col2 = st.columns(2)
+            with col1:
+                selected_team = st.multiselect("Filter by Team", options=sorted(df['team_name'].unique()),
+                                               key="offline_join_team")
+            with col2:
+                selected_format = st.multiselect("Filter by Format", options=sorted(df['format'].unique()),
+                                                 key="offline_join_format")
+            if selected_team:
+                df = df[df['team_name'].isin(selected_team)]
+            if selected_format:
+                df = df[df['format'].isin(selected_format)]
+            st.dataframe(df, use_container_width=True, hide_index=True)
+        else:
+            st.warning("No results found")
+
+    with query_tab[2]:
+        st.subheader("📊 Aggregate Query: Team Statistics")
+        df = store.aggregate_query().to_pandas()
+        if len(df) > 0:
+            st.dataframe(df, use_container_width=True, hide_index=True)
+            st.bar_chart(df[['team_name', 'matches_won', 'matches_lost']].set_index('team_name'))
+        else:
+            st.warning("No results found")
+
+
+def render():
+    """Advanced query tabs with the offline toggle"""
+    st.header("🔍 Advanced Queries")
+
+    offline = st.toggle("🗂️ Offline mode (read snapshots, no load on MySQL)", key="offline_mode")
+
+    if offline:
+        offline_queries()
+    else:
+        query_tab = st.tabs(["🎯 Nested Query", "🔗 Join Query", "📊 Aggregate Query"])
+
+        with query_tab[0]:
+            nested_query()
+
+        with query_tab[1]:
+            join_query()
+
+        with query_tab[2]:
+            aggregate_query()
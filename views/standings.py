@@ -0,0 +1,62 @@
+"""
+Tournament points table page
+"""
+
+import streamlit as st
+import pandas as pd
+
+from db import execute_query, session_frame
+from services import WIN_POINTS, rebuild_standings
+
+
+STANDINGS_QUERY = """SELECT t.team_name, s.played, s.won, s.lost, s.points, s.net_run_rate
+                     FROM tournament_standings s
+                     JOIN team t ON s.team_id = t.team_id
+                     WHERE s.tournament_id = %s AND s.played > 0
+                     ORDER BY s.points DESC, s.net_run_rate DESC, s.won DESC, t.team_name"""
+
+
+def load_tournaments():
+    """Tournament name -> id, most recent first"""
+    tournaments = execute_query(
+        "SELECT tournament_id, tournament_name FROM tournament ORDER BY year DESC, tournament_name", fetch=True)
+    return None if tournaments is None else {t['tournament_name']: t['tournament_id'] for t in tournaments}
+
+
+def load_standings(tournament_id):
+    """One tournament's table, straight from the materialized standings (primary-key range)"""
+    return execute_query(STANDINGS_QUERY, (tournament_id,), fetch=True, tournament=tournament_id)
+
+
+def render():
+    """Points table of a tournament"""
+    st.header("🏆 Points Table")
+
+    tournament_options = session_frame("standings_tournaments", load_tournaments, tables=("tournament",))
+    if not tournament_options:
+        st.info("No tournaments found")
+        return
+
+    tournament = st.selectbox("Tournament", list(tournament_options), key="standings_tournament")
+    rows = session_frame("standings", load_standings, tournament_options[tournament],
+                         tables=("tournament_standings", "team"))
+
+    if rows:
+        df = pd.DataFrame(rows)
+        df.insert(0, "position", range(1, len(df) + 1))
+        st.dataframe(df, use_container_width=True, hide_index=True,
+                     column_config={"net_run_rate": st.column_config.NumberColumn("NRR", format="%.3f")})
+        st.caption(f"{WIN_POINTS} points per win. Net run rate appears once innings scores are recorded.")
+    elif rows is not None:
+        st.info("No matches recorded for this tournament yet")
+
+    if st.session_state.role == "admin":
+        with st.expander("🔧 Maintenance"):
+            st.caption("The table is updated as matches are created and edited. "
+                       "Rebuild it only after changing matches outside the app.")
+            if st.button("🔄 Rebuild all points tables from matches", key="standings_rebuild"):
+                if rebuild_standings():
+                    st.success("Points tables rebuilt")
+                    st.rerun()
+                else:
+                    st.error("Failed to rebuild points tables")
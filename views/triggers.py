@@ -0,0 +1,112 @@
+"""
+Trigger demonstration page
+"""
+
+import streamlit as st
+
+
+# TRIGGERS DEMO
+def triggers_demo():
+    """Show trigger demonstrations"""
+    st.subheader("⚡ Trigger Demonstrations")
+
+    tab1, tab2, tab3 = st.tabs(["Trigger 1: Age Calculator", "Trigger 2: Role Promoter",
+                                "Batch Promotion Procedure"])
+
+    with tab1:
+        st.subheader("Auto-calculate Age from DOB")
+        st.markdown("""
+        **When it fires:** BEFORE INSERT on player table
+
+        **What it does:** Automatically calculates age from date of birth
+        """)
+        st.code("""
+DELIMITER //
+CREATE TRIGGER trg_set_age
+BEFORE INSERT ON player
+FOR EACH ROW
+BEGIN
+    SET NEW.age = TIMESTAMPDIFF(YEAR, NEW.dob, CURDATE());
+END;
+//
+DELIMITER ;
+        """, language="sql")
+
+    with tab2:
+        st.subheader("Promote to All-Rounder")
+        st.markdown("""
+        **When it fires:** AFTER INSERT on player_performance table
+
+        **Condition:** Runs >= 50 AND Wickets >= 3
+
+        **Action:** Updates player role to All-Rounder
+        """)
+        st.code("""
+DELIMITER //
+CREATE TRIGGER trg_promote_to_allrounder
+AFTER INSERT ON player_performance
+FOR EACH ROW
+BEGIN
+  IF @skip_promotion_trigger IS NULL AND NEW.runs_scored >= 50 AND NEW.wickets_taken >= 3 THEN
+    UPDATE player
+    SET role_id = 3
+    WHERE player_id = NEW.player_id AND role_id <> 3;
+  END IF;
+END;
+//
+DELIMITER ;
+        """, language="sql")
+        st.caption("Batch loads set @skip_promotion_trigger and use the set-based procedure instead.")
+
+    with tab3:
+        st.subheader("Set-Based All-Rounder Promotion")
+        st.markdown("""
+        **When it runs:** after every scorecard save (same transaction), and every 10 minutes
+        from the `ev_promote_all_rounders` event
+
+        **What it does:** promotes, in one UPDATE, every player with a qualifying performance in
+        an id range: a scorecard save passes exactly the ids it inserted, the event everything
+        inserted since the high-water mark stored in `promotion_state`
+        """)
+        st.code("""
+DELIMITER //
+CREATE PROCEDURE PromoteAllRoundersIn(IN first_id INT, IN last_id INT)
+BEGIN
+  UPDATE player p
+  JOIN (
+    SELECT DISTINCT player_id
+    FROM player_performance
+    WHERE performance_id BETWEEN first_id AND last_id
+      AND runs_scored >= 50 AND wickets_taken >= 3
+  ) q ON p.player_id = q.player_id
+  SET p.role_id = 3
+  WHERE p.role_id <> 3;
+END;
+//
+
+CREATE PROCEDURE PromoteAllRounders()
+BEGIN
+  DECLARE from_id INT;
+  DECLARE to_id INT;
+
+  SELECT last_performance_id INTO from_id
+  FROM promotion_state WHERE id = 1 FOR UPDATE;
+
+  SELECT COALESCE(MAX(performance_id), from_id) INTO to_id
+  FROM player_performance;
+
+  UPDATE promotion_state SET last_performance_id = to_id WHERE id = 1;
+
+  CALL PromoteAllRoundersIn(from_id + 1, to_id);
+END;
+//
+DELIMITER ;
+        """, language="sql")
+
+        if st.session_state.role == "admin":
+            if st.button("▶️ Run Promotion Now"):
+                # services pulls in pandas; keep this page light until it is needed
+                from services import promote_all_rounders
+                promoted = promote_all_rounders()
+                if promoted is not None:
+                    st.success(f"{promoted} player(s) promoted to All-Rounder")
@@ -0,0 +1,294 @@
+"""
+Match and performance update pages
+"""
+
+import streamlit as st
+import pandas as pd
+
+from cricketdb import versions
+from db import execute_query, execute_prepared, execute_transaction, match_relocation, session_frame
+from services import replay_ratings_from, save_performance_sketches, standings_change, update_performances
+
+
+# UPDATE MATCH DETAILS
+def update_match():
+    """Update match details"""
+    st.subheader("✏️ Update Match Details")
+
+    matches = execute_query(
+        """SELECT m.match_id, CONCAT('Match ', m.match_id, ': ', t1.team_name, ' vs ', t2.team_name, ' on ', m.date_of_match) as name 
+           FROM matches m
+           JOIN team t1 ON m.winning_team_id = t1.team_id
+           JOIN team t2 ON m.losing_team_id = t2.team_id
+           ORDER BY m.date_of_match DESC""", fetch=True)
+
+    if not matches:
+        st.info("No matches available")
+        return
+
+    match_options = {m['name']: m['match_id'] for m in matches}
+    selected = st.selectbox("Select Match", options=list(match_options.keys()), key="match_select")
+    match_id = match_options[selected]
+
+    current_data = execute_prepared("match_by_id", (match_id,))
+
+    if not current_data:
+        st.error("Match not found")
+        return
+
+    current = current_data[0]
+
+    teams = execute_query("SELECT team_id, team_name FROM team ORDER BY team_name", fetch=True)
+    team_options = {t['team_name']: t['team_id'] for t in teams} if teams else {}
+
+    tournaments = execute_query("SELECT tournament_id, tournament_name FROM tournament ORDER BY tournament_name", fetch=True)
+    tournament_options = {t['tournament_name']: t['tournament_id'] for t in tournaments} if tournaments else {}
+
+    with st.form(key="update_match_form"):
+        col1, col2 = st.columns(2)
+
+        with col1:
+            winning_team_name = [k for k, v in team_options.items() if v == current['winning_team_id']][0]
+            winning_team = st.selectbox("Winning Team", list(team_options.keys()), 
+                                       index=list(team_options.keys()).index(winning_team_name), key="win_team")
+            
+            losing_team_name = [k for k, v in team_options.items() if v == current['losing_team_id']][0]
+            losing_team = st.selectbox("Losing Team", list(team_options.keys()),
+                                      index=list(team_options.keys()).index(losing_team_name), key="lose_team")
+
+        with col2:
+            date_of_match = st.date_input("Match Date", value=current['date_of_match'], key="match_date")
+            location = st.text_input("Location", value=current['location'], key="match_location")
+
+        tournament_name = [k for k, v in tournament_options.items() if v == current['tournament_id']][0]
+        tournament = st.selectbox("Tournament", list(tournament_options.keys()),
+                                 index=list(tournament_options.keys()).index(tournament_name), key="tournament")
+
+        submitted = st.form_submit_button("💾 Update Match", use_container_width=True)
+
+        if submitted:
+            query = """UPDATE matches SET winning_team_id = %s, losing_team_id = %s, date_of_match = %s,
+                       location = %s, tournament_id = %s WHERE match_id = %s"""
+            params = (team_options[winning_team], team_options[losing_team], date_of_match, 
+                     location, tournament_options[tournament], match_id)
+            # With sharding, a new tournament may live on another shard: move the rows in the same
+            # transaction, and take the old result out of the points table as the new one goes in
+            statements = match_relocation(match_id, current['tournament_id'], tournament_options[tournament]) + \
+                [(query, params)] + \
+                standings_change((current['tournament_id'], current['winning_team_id'], current['losing_team_id']),
+                                 (tournament_options[tournament], team_options[winning_team],
+                                  team_options[losing_team]))
+            if execute_transaction(statements):
+                if (team_options[winning_team], team_options[losing_team], date_of_match) != \
+                        (current['winning_team_id'], current['losing_team_id'], current['date_of_match']):
+                    if not replay_ratings_from(min(date_of_match, current['date_of_match'])):
+                        st.warning("Team ratings were not updated - "
+                                   "use 🔄 Rebuild Ratings under Analytics → Team Ratings")
+                if tournament_options[tournament] != current['tournament_id']:
+                    # The match's performances count towards another tournament's sketches now
+                    save_performance_sketches()
+                st.success("Match updated successfully!")
+            else:
+                st.error("Failed to update match")
+
+
+# UPDATE PLAYER PERFORMANCE (WITH TEAM FILTERING & SORTING)
+PERFORMANCE_GRID_QUERY = """
+    SELECT pp.performance_id, pp.player_id, CONCAT(p.f_name, ' ', p.l_name) as player_name, t.team_name,
+           pp.match_id, m.date_of_match, pp.runs_scored, pp.wickets_taken, pp.format, pp.avg
+    FROM player_performance pp
+    JOIN player p ON pp.player_id = p.player_id
+    JOIN team t ON p.team_id = t.team_id
+    JOIN matches m ON pp.match_id = m.match_id
+"""
+# Hot lookups, run as prepared statements
+TEAM_PERFORMANCES_QUERY = PERFORMANCE_GRID_QUERY + " WHERE t.team_name = %s ORDER BY m.date_of_match DESC"
+PERFORMANCE_BY_ID_QUERY = PERFORMANCE_GRID_QUERY + " WHERE pp.performance_id = %s"
+# Refreshing more saved rows than this uses one IN (...) text query instead
+PREPARED_REFRESH_MAX = 8
+PERFORMANCE_GRID_TABLES = ("player_performance", "player", "team", "matches")
+EDITABLE_COLUMNS = ['runs_scored', 'wickets_taken', 'format', 'avg']
+
+
+def performance_frame(rows):
+    """Performance rows as a frame indexed by performance_id"""
+    df = pd.DataFrame(rows).set_index('performance_id')
+    df['avg'] = df['avg'].astype(float)
+    return df
+
+
+def load_performance_grid(selected_team):
+    """
+    Session-cached performance frame for the team filter.
+
+    Reloaded only when the filter changes or another write touched the
+    underlying tables; this page's own saves patch the frame in place.
+    """
+    current = versions.version(*PERFORMANCE_GRID_TABLES)
+    cached = st.session_state.get('perf_grid')
+    if cached and cached['team'] == selected_team and cached['version'] == current:
+        return cached['df']
+
+    if selected_team == "All Teams":
+        rows = execute_query(PERFORMANCE_GRID_QUERY + " ORDER BY m.date_of_match DESC", fetch=True)
+    else:
+        rows = execute_prepared("performances_by_team", (selected_team,), TEAM_PERFORMANCES_QUERY)
+
+    df = performance_frame(rows) if rows else None
+    st.session_state.perf_grid = {'team': selected_team, 'version': current, 'df': df}
+    return df
+
+
+def save_performance_changes(original, edited):
+    """
+    Write only the edited rows with one batched UPDATE, then refresh just
+    those rows in the cached frame.  Returns the cell-level changes.
+    """
+    edited = edited[EDITABLE_COLUMNS].fillna(original[EDITABLE_COLUMNS])
+    before = original.loc[edited.index, EDITABLE_COLUMNS]
+    changed_cells = edited.ne(before)
+    changed_ids = changed_cells.index[changed_cells.any(axis=1)]
+
+    if len(changed_ids) == 0:
+        return None
+
+    params = [(int(row['runs_scored']), int(row['wickets_taken']), row['format'], float(row['avg']), int(pid))
+              for pid, row in edited.loc[changed_ids].iterrows()]
+
+    if not update_performances(params):
+        return False
+
+    if len(changed_ids) <= PREPARED_REFRESH_MAX:
+        refreshed = []
+        for pid in changed_ids:
+            refreshed += execute_prepared("performance_by_id", (int(pid),), PERFORMANCE_BY_ID_QUERY) or []
+    else:
+        placeholders = ", ".join(["%s"] * len(changed_ids))
+        refreshed = execute_query(PERFORMANCE_GRID_QUERY + f" WHERE pp.performance_id IN ({placeholders})",
+                                  tuple(int(pid) for pid in changed_ids), fetch=True)
+    # Patch the cached frame only if this save is the one write since it was
+    # loaded and every saved row came back; otherwise reload it next run
+    cached = st.session_state.perf_grid
+    expected = versions.advanced(cached['version'], PERFORMANCE_GRID_TABLES, "player_performance")
+    fresh = performance_frame(refreshed) if refreshed else None
+    if fresh is not None and set(fresh.index) >= set(changed_ids) and \
+            versions.version(*PERFORMANCE_GRID_TABLES) == expected:
+        cached['df'].loc[fresh.index, fresh.columns] = fresh
+        cached['version'] = expected
+    else:
+        del st.session_state.perf_grid
+
+    changes = changed_cells.loc[changed_ids].stack()
+    changes = changes[changes].index
+    return pd.DataFrame({
+        'performance_id': [pid for pid, _ in changes],
+        'field': [col for _, col in changes],
+        'old': [before.at[pid, col] for pid, col in changes],
+        'new': [edited.at[pid, col] for pid, col in changes]
+    }).astype({'old': str, 'new': str})
+
+
+def load_team_names():
+    """Team names for the performance filter"""
+    teams = execute_query("SELECT DISTINCT team_id, team_name FROM team ORDER BY team_name", fetch=True)
+    return None if teams is None else [t['team_name'] for t in teams]
+
+
+def update_player_performance():
+    """Bulk-edit player performances; only changed rows are written"""
+    st.subheader("✏️ Update Player Performance & Scores")
+
+    # Get all teams for filtering (re-queried only after the team table changes)
+    team_list = session_frame("perf_team_list", load_team_names, tables=("team",)) or []
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        selected_team = st.selectbox("Filter by Team", options=["All Teams"] + team_list, key="perf_team_filter")
+
+    with col2:
+        sort_by = st.selectbox("Sort By", options=["Player Name", "Runs Scored", "Wickets Taken"], key="perf_sort")
+
+    df = load_performance_grid(selected_team)
+
+    if df is None or df.empty:
+        st.info("No player performances available for selected team")
+        return
+
+    # Apply sorting
+    if sort_by == "Player Name":
+        view = df.sort_values('player_name')
+    elif sort_by == "Runs Scored":
+        view = df.sort_values('runs_scored', ascending=False)
+    else:
+        view = df.sort_values('wickets_taken', ascending=False)
+
+    st.markdown("---")
+    st.subheader(f"📊 Performances ({len(df)} records)")
+    st.caption("Edit runs, wickets, format or average directly in the grid; only changed rows are saved.")
+
+    generation = st.session_state.get('perf_grid_generation', 0)
+
+    with st.form(key="update_performance_form"):
+        edited = st.data_editor(
+            view,
+            use_container_width=True,
+            disabled=['player_id', 'player_name', 'team_name', 'match_id', 'date_of_match'],
+            column_config={
+                'player_id': "Player ID",
+                'player_name': "Player",
+                'team_name': "Team",
+                'match_id': "Match",
+                'date_of_match': "Date",
+                'runs_scored': st.column_config.NumberColumn("Runs", min_value=0, step=1),
+                'wickets_taken': st.column_config.NumberColumn("Wickets", min_value=0, max_value=20, step=1),
+                'format': st.column_config.SelectboxColumn("Format", options=["One Day", "Test", "T20"],
+                                                           required=True),
+                'avg': st.column_config.NumberColumn("Average", min_value=0.0, step=0.1, format="%.2f")
+            },
+            key=f"perf_editor_{generation}"
+        )
+
+        submitted = st.form_submit_button("💾 Save Changes", use_container_width=True)
+
+    if submitted:
+        changes = save_performance_changes(df, edited)
+        if changes is None:
+            st.info("No changes to save")
+        elif changes is False:
+            st.error("❌ Failed to update performances")
+        else:
+            st.session_state.perf_grid_generation = generation + 1
+            st.success(f"✅ Updated {changes['performance_id'].nunique()} performance records")
+            st.dataframe(changes, use_container_width=True, hide_index=True)
+
+    # Show statistics (computed from the cached frame, no extra query)
+    st.markdown("---")
+    st.subheader("📈 Team Statistics")
+
+    stats_df = df.groupby('team_name', as_index=False).agg(
+        total_players=('player_id', 'nunique'),
+        total_runs=('runs_scored', 'sum'),
+        total_wickets=('wickets_taken', 'sum'),
+        avg_runs=('runs_scored', 'mean')
+    )
+    st.dataframe(stats_df, use_container_width=True, hide_index=True)
+
+
+def render():
+    """Update tabs"""
+    st.header("⚙️ Updates")
+
+    update_tab = st.tabs(["🔄 Update Match Details", "🔄 Update Player Performance & Scores"])
+
+    with update_tab[0]:
+        if st.session_state.role == "admin":
+            update_match()
+        else:
+            st.warning("⛔ Admin privileges required")
+
+    with update_tab[1]:
+        if st.session_state.role == "admin":
+            update_player_performance()
+        else:
+            st.warning("⛔ Admin privileges required")